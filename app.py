@@ -1,3 +1,4 @@
+import time
 import streamlit as st
 import pandas as pd
 from datetime import datetime
@@ -8,6 +9,8 @@ from modules.sensors import SensorSimulator
 from modules.devices import DeviceManager
 from modules.agent import SHIADecisionAgent
 from modules.policy_manager import PolicyManager
+from modules.log_store import LogStore
+from modules.instrumentation import Instrumentation
 
 
 # ---------------- UI LABELS ---------------- #
@@ -19,6 +22,10 @@ DEVICE_LABELS = {
     "none": "No Device"
 }
 
+# Log retention (rows kept in memory) and rows shown per page
+LOG_RETENTION = 5000
+LOG_PAGE_SIZE = 100
+
 load_dotenv()
 
 st.set_page_config(
@@ -33,7 +40,7 @@ if "initialized" not in st.session_state:
     st.session_state.devices = DeviceManager()
     st.session_state.agent = SHIADecisionAgent()
     st.session_state.policy = PolicyManager()
-    st.session_state.logs = []
+    st.session_state.logs = LogStore(capacity=LOG_RETENTION)
     st.session_state.last_decision = None
 
     # Manual locks (AI cannot control locked devices)
@@ -44,12 +51,16 @@ if "initialized" not in st.session_state:
         "smart_lock": False,
     }
 
+    # Per-stage timing (off by default; toggled from the sidebar)
+    st.session_state.instrumentation = Instrumentation(enabled=False)
+
     st.session_state.initialized = True
 
 sensors = st.session_state.sensors
 devices = st.session_state.devices
 agent = st.session_state.agent
 policy = st.session_state.policy
+inst = st.session_state.instrumentation
 
 # ---------------- HEADER ---------------- #
 st.title("🏠 SHIA – Smart Household Intelligent Agent")
@@ -61,6 +72,7 @@ with st.sidebar:
     st.header("🎮 Control Panel")
 
     run_step = st.button("▶ Run One Simulation Step", type="primary")
+    inst.enabled = st.checkbox("⏱ Stage timing", value=inst.enabled)
 
     st.markdown("---")
     st.subheader("🛠 Manual Device Control")
@@ -90,7 +102,7 @@ with st.sidebar:
             success, msg = devices.update_device(dev_id, on_action)
             st.session_state.manual_locks[dev_id] = True
 
-            st.session_state.logs.insert(0, {
+            st.session_state.logs.append({
                 "time": datetime.now().strftime("%H:%M:%S"),
                 "temperature": sensors.data["temperature"],
                 "humidity": sensors.data["humidity"],
@@ -110,7 +122,7 @@ with st.sidebar:
             success, msg = devices.update_device(dev_id, off_action)
             st.session_state.manual_locks[dev_id] = True
 
-            st.session_state.logs.insert(0, {
+            st.session_state.logs.append({
                 "time": datetime.now().strftime("%H:%M:%S"),
                 "temperature": sensors.data["temperature"],
                 "humidity": sensors.data["humidity"],
@@ -128,7 +140,7 @@ with st.sidebar:
         # Release to AI
         if c3.button("Release to AI", key=f"{dev_id}_release"):
             st.session_state.manual_locks[dev_id] = False
-            st.session_state.logs.insert(0, {
+            st.session_state.logs.append({
                 "time": datetime.now().strftime("%H:%M:%S"),
                 "temperature": sensors.data["temperature"],
                 "humidity": sensors.data["humidity"],
@@ -149,44 +161,55 @@ with st.sidebar:
 
 # ---------------- AI STEP ---------------- #
 if run_step:
-    sensor_data = sensors.update()
-    sensor_data["manual_locks"] = dict(st.session_state.manual_locks)
-
-    decision = agent.decide(sensor_data)
-    is_valid, policy_msg = policy.validate_action(
-        decision, sensor_data, devices.get_status()
-    )
-
-    if is_valid:
-        dev_id = decision["device_id"]
-        action = decision["action"]
-        if dev_id != "none":
-            success, device_msg = devices.update_device(dev_id, action)
-        else:
-            device_msg = "No device action required (IDLE)."
-    else:
-        device_msg = f"ACTION BLOCKED: {policy_msg}"
-
-    reflection = agent.reflect(decision, sensor_data)
-
-    st.session_state.logs.insert(0, {
-        "time": sensor_data["time"].strftime("%H:%M:%S"),
-        "temperature": sensor_data["temperature"],
-        "humidity": sensor_data["humidity"],
-        "light_level": sensor_data["light_level"],
-        "occupancy": sensor_data["occupancy"],
-        "action": (
-            f"{DEVICE_LABELS.get(decision['device_id'])} → "
-            f"{decision['action']}"
-        ),
-        "policy": policy_msg,
-        "device_msg": device_msg,
-        "reflection": reflection
-    })
+    with inst.step():
+        with inst.stage("perception"):
+            sensor_data = sensors.update()
+            sensor_data["manual_locks"] = dict(st.session_state.manual_locks)
+
+        with inst.stage("decision"):
+            decision = agent.decide(sensor_data)
+
+        with inst.stage("policy"):
+            is_valid, policy_msg = policy.validate_action(
+                decision, sensor_data, devices.get_status(),
+                active_power=devices.get_energy_usage(),
+            )
+
+        with inst.stage("actuation"):
+            if is_valid:
+                dev_id = decision["device_id"]
+                action = decision["action"]
+                if dev_id != "none":
+                    success, device_msg = devices.update_device(dev_id, action)
+                else:
+                    device_msg = "No device action required (IDLE)."
+            else:
+                device_msg = f"ACTION BLOCKED: {policy_msg}"
+
+        with inst.stage("reflection"):
+            reflection = agent.reflect(decision, sensor_data)
+
+        with inst.stage("logging"):
+            st.session_state.logs.append({
+                "time": sensor_data["time"].strftime("%H:%M:%S"),
+                "temperature": sensor_data["temperature"],
+                "humidity": sensor_data["humidity"],
+                "light_level": sensor_data["light_level"],
+                "occupancy": sensor_data["occupancy"],
+                "action": (
+                    f"{DEVICE_LABELS.get(decision['device_id'])} → "
+                    f"{decision['action']}"
+                ),
+                "policy": policy_msg,
+                "device_msg": device_msg,
+                "reflection": reflection,
+            })
 
     st.session_state.last_decision = decision
 
 # ---------------- DASHBOARD ---------------- #
+render_start = time.perf_counter_ns()
+
 st.subheader("📡 Sensor Data")
 sensor = sensors.data
 
@@ -237,16 +260,40 @@ if st.session_state.last_decision:
         st.write(f"**Reason:** {last['reason']}")
 
     with right:
-        if st.session_state.logs:
-            st.success(f"**Policy Result:** {st.session_state.logs[0]['policy']}")
-            st.write(f"**Reflection:** {st.session_state.logs[0]['reflection']}")
+        latest_log = st.session_state.logs.latest()
+        if latest_log:
+            st.success(f"**Policy Result:** {latest_log['policy']}")
+            st.write(f"**Reflection:** {latest_log['reflection']}")
 else:
     st.warning("No decision has been made yet. Click **Run One Simulation Step**.")
 
 st.divider()
 
 st.subheader("📜 System Logs")
-if st.session_state.logs:
-    st.dataframe(pd.DataFrame(st.session_state.logs), use_container_width=True)
+logs = st.session_state.logs
+if len(logs):
+    n_pages = (len(logs) - 1) // LOG_PAGE_SIZE + 1
+    log_page = st.number_input(
+        "Page (newest first)", min_value=1, max_value=n_pages, value=1
+    )
+    st.dataframe(logs.page(log_page - 1, LOG_PAGE_SIZE), use_container_width=True)
+    st.caption(f"{len(logs)} entries kept (retention limit: {logs.capacity}).")
 else:
     st.info("No logs available yet.")
+
+inst.record("rendering", time.perf_counter_ns() - render_start)
+
+if inst.enabled:
+    st.divider()
+    st.subheader("⏱ Stage Timing")
+    timing = inst.snapshot()
+    if timing:
+        st.dataframe(
+            pd.DataFrame.from_dict(timing, orient="index").sort_values(
+                "total_ms", ascending=False
+            ),
+            use_container_width=True,
+        )
+        st.caption("Rendering is measured up to this panel and lags one rerun behind.")
+    else:
+        st.info("No timings yet. Run a simulation step.")
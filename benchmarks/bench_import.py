@@ -0,0 +1,97 @@
+"""
+Giriş noktaları için açılış (import) süresi bütçesi.
+
+Her hedef, temiz bir Python sürecinde import edilir; süre ve yüklenen ağır
+kütüphaneler ölçülür. Medyan süre bütçeyi aşarsa ya da hedef yasak bir
+kütüphaneyi (UI, NumPy, asyncio, süreç havuzu) import ederse çıkış kodu 1'dir.
+Kısa ömürlü CLI koşuları ve filo worker'ları bu yoldan açılır.
+
+Kullanım (repo kökünden):
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --repeat 20 --out import.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Çekirdek yolda hiç yüklenmemesi gereken kütüphaneler
+UI_MODULES = ("dotenv", "tabulate", "colorama", "pandas", "streamlit")
+CORE_FORBIDDEN = UI_MODULES + ("numpy", "asyncio", "concurrent.futures")
+
+# hedef → (bütçe ms, yasak modüller)
+TARGETS = {
+    "modules.runner": (40.0, CORE_FORBIDDEN),
+    "modules.fleet": (50.0, CORE_FORBIDDEN),
+    "modules.snapshot": (50.0, CORE_FORBIDDEN),
+    "headless": (60.0, CORE_FORBIDDEN),
+    "main": (60.0, UI_MODULES),
+}
+
+_CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+import {target}
+elapsed = (time.perf_counter() - t0) * 1000
+print(json.dumps({{"ms": elapsed, "loaded": [m for m in {watch!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(target: str, repeat: int, watch: tuple) -> dict:
+    """`target` modülünü `repeat` kez ayrı süreçte import eder."""
+    samples = []
+    loaded = set()
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _CHILD.format(target=target, watch=watch)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        row = json.loads(out.stdout.strip().splitlines()[-1])
+        samples.append(row["ms"])
+        loaded.update(row["loaded"])
+    return {
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "max_ms": max(samples),
+        "loaded": sorted(loaded),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SHIA import-time budget check.")
+    parser.add_argument("--repeat", type=int, default=10, help="Fresh processes per target.")
+    parser.add_argument("--out", help="Write results to this JSON file.")
+    args = parser.parse_args(argv)
+
+    results = {}
+    failed = []
+    for target, (budget, forbidden) in TARGETS.items():
+        stats = measure_import(target, args.repeat, forbidden)
+        stats["budget_ms"] = budget
+        results[target] = stats
+
+        status = "ok"
+        if stats["loaded"]:
+            status = f"FAIL imports {', '.join(stats['loaded'])}"
+        elif stats["median_ms"] > budget:
+            status = "FAIL over budget"
+        if status != "ok":
+            failed.append(target)
+        print(f"{target:<18} median {stats['median_ms']:>7.1f} ms  "
+              f"(budget {budget:>5.1f} ms)  {status}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
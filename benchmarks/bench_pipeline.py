@@ -0,0 +1,296 @@
+"""
+SHIA kontrol döngüsü için aşama bazlı benchmark paketi.
+
+Her aşama için gecikme yüzdelikleri (p50/p90/p99/max) ve throughput ölçülür,
+parametreler (bellek penceresi, cihaz sayısı, ev sayısı) ölçeklenir ve
+sonuçlar JSON olarak kaydedilir. Önceki bir JSON ile karşılaştırma yapılarak
+commit'ler arası gerilemeler yakalanabilir.
+
+Kullanım (repo kökünden):
+    python -m benchmarks.bench_pipeline --out bench.json
+    python -m benchmarks.bench_pipeline --quick --compare bench.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from modules.sensors import SensorSimulator
+from modules.devices import DeviceManager
+from modules.agent import SHIADecisionAgent
+from modules.policy_manager import PolicyManager
+from modules.decision_cache import DecisionCache
+from modules.runner import HomeStack
+from modules.batch_sensors import BatchSensorSimulator
+from modules.fleet import run_fleet
+
+SEED = 1234
+
+
+# ----------------------------------------------------------------------
+# Ölçüm yardımcıları
+# ----------------------------------------------------------------------
+
+def _stats(samples_ns: list, ops_per_call: int = 1) -> dict:
+    samples = sorted(samples_ns)
+    n = len(samples)
+
+    def pct(p):
+        return samples[min(n - 1, int(p / 100 * n))] / 1000  # µs
+
+    total_s = sum(samples) / 1e9
+    return {
+        "calls": n,
+        "p50_us": pct(50),
+        "p90_us": pct(90),
+        "p99_us": pct(99),
+        "max_us": samples[-1] / 1000,
+        "mean_us": sum(samples) / n / 1000,
+        "ops_per_sec": n * ops_per_call / total_s if total_s > 0 else float("inf"),
+    }
+
+
+def measure(fn, args_list: list, warmup: int = 50, ops_per_call: int = 1) -> dict:
+    """fn'i args_list'teki her argüman demeti için ayrı ayrı zamanlar."""
+    for args in args_list[:warmup]:
+        fn(*args)
+    clock = time.perf_counter_ns
+    samples = []
+    for args in args_list:
+        t0 = clock()
+        fn(*args)
+        samples.append(clock() - t0)
+    return _stats(samples, ops_per_call)
+
+
+def _sensor_stream(n: int) -> list:
+    sim = SensorSimulator(seed=SEED)
+    return [dict(sim.update()) for _ in range(n)]
+
+
+def _device_manager(n_devices: int) -> DeviceManager:
+    """Varsayılan 4 cihaza ek ışıklar ekleyerek n cihazlı bir site kurar."""
+    dm = DeviceManager()
+    for i in range(len(dm.devices), n_devices):
+        dm.devices[f"light_extra_{i}"] = {
+            "state": "ON" if i % 3 == 0 else "OFF",
+            "power_usage": 10,
+            "type": "light",
+            "room": f"room_{i % 20}",
+            "description": "Benchmark ışığı",
+            "last_changed": None,
+        }
+    return dm
+
+
+# ----------------------------------------------------------------------
+# Benchmark'lar
+# ----------------------------------------------------------------------
+
+def bench_sensors(n: int) -> dict:
+    sim = SensorSimulator(seed=SEED)
+    return {"sensors.update": measure(sim.update, [()] * n)}
+
+
+def bench_decide(n: int, windows: list) -> dict:
+    stream = _sensor_stream(n)
+    results = {}
+    for window in windows:
+        agent = SHIADecisionAgent(memory_limit=window)
+        results[f"agent.decide[memory={window}]"] = measure(
+            agent.decide, [(d,) for d in stream]
+        )
+    # Eşik aralığı anahtarlı önbellek (birebir aynı kararlar)
+    cached = SHIADecisionAgent(cache=DecisionCache())
+    results["agent.decide[cache=4096]"] = measure(cached.decide, [(d,) for d in stream])
+    return results
+
+
+def bench_reflect(n: int) -> dict:
+    stream = _sensor_stream(n)
+    agent = SHIADecisionAgent()
+    decisions = [agent.decide(d) for d in stream]
+    return {
+        "agent.reflect": measure(agent.reflect, list(zip(decisions, stream))),
+    }
+
+
+def bench_policy(n: int, device_counts: list) -> dict:
+    # Güç sınırı kontrolüne kadar inen ON komutları (ev dolu, ılık, loş)
+    stream = [
+        dict(d, occupancy=True, temperature=22.0, light_level=100)
+        for d in _sensor_stream(n)
+    ]
+    proposals = [
+        {"device_id": dev_id, "action": "ON"}
+        for dev_id in ("heater_main", "ac_main", "lights_living")
+    ]
+    args = [(proposals[i % len(proposals)], d) for i, d in enumerate(stream)]
+
+    results = {}
+    for count in device_counts:
+        dm = _device_manager(count)
+        devices = dm.get_status()
+        plain = dict(devices)  # koşan toplamı olmayan düz tablo → tarama yolu
+        policy = PolicyManager()
+
+        # last_actions birikip rapid-switching kuralına takılmasın
+        def scan(action, d):
+            policy.last_actions.clear()
+            return policy.validate_action(action, d, plain)
+
+        def running(action, d):
+            policy.last_actions.clear()
+            return policy.validate_action(action, d, devices, active_power=dm.get_energy_usage())
+
+        results[f"policy.validate_action[devices={count},scan]"] = measure(scan, args)
+        results[f"policy.validate_action[devices={count},running]"] = measure(running, args)
+    return results
+
+
+def bench_policy_batch(n: int, batch_sizes: list) -> dict:
+    """PolicyEngine.validate_batch: bir çağrıda `size` eylem (örn. filo genelinde)."""
+    stream = _sensor_stream(n)
+    dm = DeviceManager()
+    engine = PolicyManager().engine
+    results = {}
+    for size in batch_sizes:
+        rows = [stream[i % n] for i in range(size)]
+        dev_ids = [("heater_main", "ac_main", "lights_living")[i % 3] for i in range(size)]
+        columns = {
+            "device_id": dev_ids,
+            "action": ["ON"] * size,
+            "device_type": [dm.devices[d]["type"] for d in dev_ids],
+            "device_power": [dm.devices[d]["power_usage"] for d in dev_ids],
+            "active_power": [0] * size,
+            "temperature": [d["temperature"] for d in rows],
+            "light_level": [d["light_level"] for d in rows],
+            "occupancy": [d["occupancy"] for d in rows],
+        }
+        results[f"policy_engine.validate_batch[actions={size}]"] = measure(
+            lambda: engine.validate_batch(power_limit=3500, **columns),
+            [()] * 20, warmup=2, ops_per_call=size,
+        )
+    return results
+
+
+def bench_devices(n: int, device_counts: list) -> dict:
+    results = {}
+    commands = [("heater_main", "ON"), ("heater_main", "OFF"),
+                ("lights_living", "ON"), ("lights_living", "OFF")]
+    for count in device_counts:
+        dm = _device_manager(count)
+        args = [commands[i % len(commands)] for i in range(n)]
+        results[f"devices.update_device[devices={count}]"] = measure(dm.update_device, args)
+        results[f"registry.find[devices={count},light/room/ON]"] = measure(
+            dm.devices.find, [("light", "room_0", "ON")] * n
+        )
+    return results
+
+
+def bench_loop(n: int) -> dict:
+    stack = HomeStack(seed=SEED)
+    return {"loop.step": measure(stack.step, [()] * n)}
+
+
+def bench_homes(steps: int, home_counts: list) -> dict:
+    results = {}
+    for homes in home_counts:
+        batch = BatchSensorSimulator(homes, seed=SEED)
+        results[f"batch_sensors.run[homes={homes}]"] = measure(
+            batch.run, [(steps,)] * 5, warmup=1, ops_per_call=homes * steps
+        )
+        results[f"fleet.run[homes={homes},workers=1]"] = measure(
+            lambda: run_fleet(homes, steps, workers=1, seed=SEED),
+            [()] * 3, warmup=0, ops_per_call=homes * steps,
+        )
+    return results
+
+
+# ----------------------------------------------------------------------
+
+
+def run_all(quick: bool = False) -> dict:
+    n = 2000 if quick else 20000
+    results = {}
+    results.update(bench_sensors(n))
+    results.update(bench_decide(n, [20, 240] if quick else [20, 240, 2880]))
+    results.update(bench_reflect(n))
+    results.update(bench_policy(n, [4, 100] if quick else [4, 100, 1000]))
+    results.update(bench_policy_batch(n, [1000, 100000] if not quick else [1000, 10000]))
+    results.update(bench_devices(n, [4, 100] if quick else [4, 100, 1000]))
+    results.update(bench_loop(n))
+    results.update(bench_homes(48 if quick else 96, [10, 100] if quick else [10, 100, 1000]))
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """p50 gecikmesi `threshold` oranından fazla artan benchmark'ları döner."""
+    regressions = []
+    print(f"{'benchmark':<52} {'base p50':>10} {'now p50':>10} {'ratio':>7}")
+    for name, now in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = now["p50_us"] / base["p50_us"] if base["p50_us"] else float("inf")
+        flag = "  <-- regression" if ratio > 1 + threshold else ""
+        print(f"{name:<52} {base['p50_us']:>10.2f} {now['p50_us']:>10.2f} {ratio:>7.2f}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SHIA per-stage benchmarks.")
+    parser.add_argument("--out", help="Write results to this JSON file.")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="Relative p50 slowdown reported as a regression (default 0.20).")
+    parser.add_argument("--quick", action="store_true", help="Fewer iterations and sizes.")
+    args = parser.parse_args(argv)
+
+    results = run_all(quick=args.quick)
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+
+    for name, stats in results.items():
+        print(f"{name:<52} p50 {stats['p50_us']:>9.2f} µs  p99 {stats['p99_us']:>9.2f} µs"
+              f"  {stats['ops_per_sec']:>12.0f} ops/s")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        print()
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,16 @@
 import os
+import re
+import shutil
+import sys
+import time
 from tabulate import tabulate
 from colorama import Fore, Style
 
+# Renk / imleç kontrol dizileri (ekranda yer kaplamaz)
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
 
-def display_dashboard(
+
+def build_dashboard_lines(
     sensor_data: dict,
     devices_status: dict,
     decision: dict,
@@ -11,18 +18,19 @@ def display_dashboard(
     device_msg: str,
     total_power: int,
     logs: list
-):
+) -> list[str]:
     """
-    SHIA terminal dashboard (main.py için).
-    Yeni cihaz modeli + policy sistemi + gelişmiş agent için güncellendi.
+    Dashboard içeriğini ekrana basmadan satır listesi olarak üretir.
+    display_dashboard ve TerminalRenderer aynı içeriği kullanır.
     """
+    out = []
 
-    # Ekranı temizle
-    os.system("cls" if os.name == "nt" else "clear")
+    def emit(text=""):
+        out.extend(str(text).split("\n"))
 
-    print(Fore.CYAN + "=== SHIA: Smart Household Intelligent Agent (Terminal Dashboard) ===" + Style.RESET_ALL)
-    print(f"Time: {sensor_data['time'].strftime('%Y-%m-%d %H:%M:%S')}")
-    print()
+    emit(Fore.CYAN + "=== SHIA: Smart Household Intelligent Agent (Terminal Dashboard) ===" + Style.RESET_ALL)
+    emit(f"Time: {sensor_data['time'].strftime('%Y-%m-%d %H:%M:%S')}")
+    emit()
 
     # ---------------------------------------------------------
     # 1. Sensör Tablosu
@@ -34,9 +42,9 @@ def display_dashboard(
         ["Occupancy", "YES" if sensor_data["occupancy"] else "NO"],
     ]
 
-    print(Fore.YELLOW + "--- ENVIRONMENT SENSORS ---" + Style.RESET_ALL)
-    print(tabulate(sensor_table, headers=["Sensor", "Value"], tablefmt="fancy_grid"))
-    print()
+    emit(Fore.YELLOW + "--- ENVIRONMENT SENSORS ---" + Style.RESET_ALL)
+    emit(tabulate(sensor_table, headers=["Sensor", "Value"], tablefmt="fancy_grid"))
+    emit()
 
     # ---------------------------------------------------------
     # 2. Cihaz Durumları
@@ -51,49 +59,182 @@ def display_dashboard(
             dev["last_changed"] or "-"
         ])
 
-    print(Fore.GREEN + "--- DEVICE STATUS ---" + Style.RESET_ALL)
-    print(tabulate(
+    emit(Fore.GREEN + "--- DEVICE STATUS ---" + Style.RESET_ALL)
+    emit(tabulate(
         device_table,
         headers=["Device", "State", "Power (W)", "Description", "Last Changed"],
         tablefmt="fancy_grid"
     ))
-    print()
+    emit()
 
     # ---------------------------------------------------------
     # 3. AI Kararı
     # ---------------------------------------------------------
-    print(Fore.MAGENTA + "--- AI DECISION ---" + Style.RESET_ALL)
-    print(f"Device   : {decision.get('device_id')}")
-    print(f"Action   : {decision.get('action')}")
-    print(f"Reason   : {decision.get('reason')}")
-    print()
+    emit(Fore.MAGENTA + "--- AI DECISION ---" + Style.RESET_ALL)
+    emit(f"Device   : {decision.get('device_id')}")
+    emit(f"Action   : {decision.get('action')}")
+    emit(f"Reason   : {decision.get('reason')}")
+    emit()
 
     # ---------------------------------------------------------
     # 4. Policy Sonucu
     # ---------------------------------------------------------
-    print(Fore.BLUE + "--- POLICY CHECK ---" + Style.RESET_ALL)
-    print(policy_msg)
-    print()
+    emit(Fore.BLUE + "--- POLICY CHECK ---" + Style.RESET_ALL)
+    emit(policy_msg)
+    emit()
 
     # ---------------------------------------------------------
     # 5. Uygulama Sonucu (DeviceManager geri bildirimi)
     # ---------------------------------------------------------
-    print(Fore.CYAN + "--- DEVICE UPDATE RESULT ---" + Style.RESET_ALL)
-    print(device_msg)
-    print()
+    emit(Fore.CYAN + "--- DEVICE UPDATE RESULT ---" + Style.RESET_ALL)
+    emit(device_msg)
+    emit()
 
     # ---------------------------------------------------------
     # 6. Enerji Tüketimi
     # ---------------------------------------------------------
-    print(Fore.YELLOW + f"Total Power Consumption: {total_power} W" + Style.RESET_ALL)
-    print()
+    emit(Fore.YELLOW + f"Total Power Consumption: {total_power} W" + Style.RESET_ALL)
+    emit()
 
     # ---------------------------------------------------------
     # 7. Log
     # ---------------------------------------------------------
-    print(Fore.WHITE + "--- LAST LOG ENTRY ---" + Style.RESET_ALL)
+    emit(Fore.WHITE + "--- LAST LOG ENTRY ---" + Style.RESET_ALL)
     if logs:
-        print(logs[-1])
+        emit(logs[-1])
     else:
-        print("No logs yet.")
-    print("\n" + "-" * 80 + "\n")
+        emit("No logs yet.")
+    emit("\n" + "-" * 80 + "\n")
+    return out
+
+
+def display_dashboard(
+    sensor_data: dict,
+    devices_status: dict,
+    decision: dict,
+    policy_msg: str,
+    device_msg: str,
+    total_power: int,
+    logs: list
+):
+    """
+    SHIA terminal dashboard (main.py için).
+    Yeni cihaz modeli + policy sistemi + gelişmiş agent için güncellendi.
+    """
+
+    # Ekranı temizle
+    os.system("cls" if os.name == "nt" else "clear")
+
+    lines = build_dashboard_lines(
+        sensor_data, devices_status, decision,
+        policy_msg, device_msg, total_power, logs,
+    )
+    print("\n".join(lines))
+
+
+class TerminalRenderer:
+    """
+    Titremesiz, artımlı terminal dashboard'u.
+
+    - Ekran sadece ilk karede temizlenir (shell alt süreci yok, ANSI kodu).
+    - Sonraki karelerde önceki kareyle karşılaştırılıp sadece değişen
+      satırlar, değişimin başladığı sütundan itibaren yeniden yazılır.
+    - Kare hızı `max_fps` ile simülasyon adımından bağımsız sınırlanır;
+      aradaki kareler atlanır, en son içerik flush() ile çizilebilir.
+    - İçerik değişmediyse hiçbir şey yazılmaz.
+    """
+
+    def __init__(self, max_fps: float = 4.0, stream=None):
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.stream = stream or sys.stdout
+        self._previous = None       # ekrandaki satırlar
+        self._pending = None        # henüz çizilmemiş en son kare
+        self._last_draw = 0.0
+
+    # ------------------------------------------------------------------
+
+    def render(self, **dashboard_kwargs) -> bool:
+        """
+        display_dashboard ile aynı argümanları alır.
+        Returns: kare çizildiyse True, atlandıysa False.
+        """
+        self._pending = dashboard_kwargs
+        if time.monotonic() - self._last_draw < self.min_interval:
+            return False
+        return self.flush()
+
+    def flush(self) -> bool:
+        """Bekleyen son kareyi hız sınırına bakmadan çizer."""
+        if self._pending is None:
+            return False
+        lines = build_dashboard_lines(**self._pending)
+        self._pending = None
+        self._last_draw = time.monotonic()
+
+        width = shutil.get_terminal_size().columns
+        lines = [self._fit(line, width) for line in lines]
+
+        if lines == self._previous:
+            return False
+
+        write = self.stream.write
+        if self._previous is None:
+            # İlk kare: ekranı temizle, imleci gizle, her şeyi yaz
+            write("\x1b[?25l\x1b[2J\x1b[H")
+            write("\n".join(lines))
+        else:
+            previous = self._previous
+            for row, line in enumerate(lines):
+                old = previous[row] if row < len(previous) else None
+                if line == old:
+                    continue
+                col = self._first_diff(old, line) if old is not None else 0
+                write(f"\x1b[{row + 1};{col + 1}H{line[col:]}\x1b[K")
+            if len(lines) < len(previous):
+                # Fazla kalan eski satırları temizle
+                write(f"\x1b[{len(lines) + 1};1H\x1b[J")
+
+        self.stream.flush()
+        self._previous = lines
+        return True
+
+    def close(self):
+        """Bekleyen kareyi çizer, imleci tekrar gösterir ve alt satıra geçer."""
+        self.flush()
+        if self._previous is not None:
+            self.stream.write(f"\x1b[{len(self._previous) + 1};1H\x1b[?25h\n")
+            self.stream.flush()
+
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _fit(line: str, width: int) -> str:
+        """
+        Satır kaydırması satır numaralarını bozar: görünür genişliği (renk
+        kodları hariç) terminali aşan satırlar kırpılır, kodlar korunur.
+        """
+        if "\x1b" not in line:
+            return line if len(line) < width else line[:width - 1]
+        if len(_ANSI_ESCAPE.sub("", line)) < width:
+            return line
+
+        out = []
+        visible = 0
+        pos = 0
+        for match in _ANSI_ESCAPE.finditer(line):
+            text = line[pos:match.start()][:width - 1 - visible]
+            out.append(text)
+            visible += len(text)
+            out.append(match.group())
+            pos = match.end()
+        out.append(line[pos:][:width - 1 - visible])
+        # Kırpılan kısımdaki renk sıfırlaması kaybolmasın
+        out.append(Style.RESET_ALL)
+        return "".join(out)
+
+    @staticmethod
+    def _first_diff(old: str, new: str) -> int:
+        """Değişimin başladığı sütun; renk kodu içeren satırlar baştan yazılır."""
+        if "\x1b" in old or "\x1b" in new:
+            return 0
+        return len(os.path.commonprefix([old, new]))
@@ -0,0 +1,129 @@
+import argparse
+from datetime import timedelta
+
+from modules.runner import HomeStack, run_headless, steps_for_duration, format_summary
+from modules.fleet import MODES, run_fleet, format_fleet_summary
+from modules.agent import SHIADecisionAgent
+from modules.policy_manager import PolicyManager
+from modules.decision_cache import DecisionCache
+from modules import snapshot
+
+
+# -----------------------------------------------------
+# Headless (hızlı ileri sarma) mod: bekleme yok, dashboard yok
+#
+# Çekirdek giriş noktası: sadece modules/* yüklenir; UI kütüphaneleri
+# (dotenv, tabulate, colorama, pandas, streamlit) hiç import edilmez,
+# NumPy / asyncio / süreç havuzu ise sadece gereken modda yüklenir.
+# Açılış süresi bütçesi: benchmarks/bench_import.py
+# -----------------------------------------------------
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the SHIA control loop headless, as fast as possible."
+    )
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--steps", type=int, help="Number of 30-minute simulation steps.")
+    group.add_argument("--days", type=float, help="Simulated duration in days.")
+    group.add_argument("--hours", type=float, help="Simulated duration in hours.")
+    parser.add_argument("--homes", type=int, default=1, help="Number of independent homes.")
+    parser.add_argument("--workers", type=int, help="Worker processes for multi-home runs.")
+    parser.add_argument("--mode", choices=MODES, default="lockstep", help="Fleet stepping mode.")
+    parser.add_argument("--seed", type=int, help="Root seed for a reproducible run.")
+    parser.add_argument("--plan", action="store_true",
+                        help="Let the agent act on several devices per step (action plans).")
+    parser.add_argument("--closed-loop", action="store_true",
+                        help="Active heater/AC/lights feed back into simulated temperature and light.")
+    parser.add_argument("--cache", type=int, default=0, metavar="N",
+                        help="Memoize decisions and policy checks in an LRU of N entries.")
+    parser.add_argument("--resume", metavar="PATH",
+                        help="Continue a single-home run from a saved snapshot.")
+    parser.add_argument("--save", metavar="PATH",
+                        help="Write a snapshot of the single-home stack after the run.")
+    parser.add_argument("--serve", type=int, metavar="PORT",
+                        help="Run the asyncio runtime with the local HTTP/WebSocket API on PORT.")
+    parser.add_argument("--async-seconds", type=float,
+                        help="Run the asyncio runtime for this many wall-clock seconds instead.")
+    args = parser.parse_args(argv)
+
+    if args.resume:
+        # Görüntü bu ayarları zaten taşır; sessizce yok sayılmaları yanıltıcı olur
+        fixed = [flag for flag, value in (
+            ("--seed", args.seed is not None), ("--plan", args.plan),
+            ("--closed-loop", args.closed_loop),
+        ) if value]
+        if fixed:
+            parser.error(f"{', '.join(fixed)} cannot be changed when resuming from a snapshot.")
+    if args.homes > 1 and (args.resume or args.save):
+        parser.error("--resume / --save only apply to single-home runs.")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.serve is not None:
+        from modules.api_server import run_server
+
+        print(f"SHIA API listening on http://127.0.0.1:{args.serve} (events: ws://…/events)")
+        try:
+            stats = run_server(port=args.serve, duration=args.async_seconds)
+        except KeyboardInterrupt:
+            return
+        print("=== SHIA API Server Summary ===")
+        for key, value in stats.items():
+            print(f"{key:<15}: {value}")
+        return
+
+    if args.async_seconds is not None:
+        from modules.async_runtime import run_async
+
+        stats = run_async(args.async_seconds)
+        print("=== SHIA Async Runtime Summary ===")
+        for key, value in stats.items():
+            print(f"{key:<15}: {value}")
+        return
+
+    if args.steps is not None:
+        steps = args.steps
+    elif args.days is not None:
+        steps = steps_for_duration(timedelta(days=args.days))
+    elif args.hours is not None:
+        steps = steps_for_duration(timedelta(hours=args.hours))
+    else:
+        steps = steps_for_duration(timedelta(days=30))
+
+    if args.homes > 1:
+        result = run_fleet(
+            args.homes, steps, workers=args.workers, mode=args.mode, seed=args.seed,
+            closed_loop=args.closed_loop, cache_size=args.cache,
+        )
+        print(format_fleet_summary(result))
+    else:
+        cache = DecisionCache(args.cache) if args.cache > 0 else None
+        if args.resume:
+            stack = snapshot.load(args.resume, cache=cache)
+            # --cache görüntü önbelleksiz kaydedilmiş olsa da uygulanır
+            stack.agent.cache = stack.policy.cache = cache
+        else:
+            stack = HomeStack(
+                seed=args.seed, plan_actions=args.plan, thermal=args.closed_loop,
+                agent=SHIADecisionAgent(cache=cache),
+                policy=PolicyManager(cache=cache),
+            )
+        summary = run_headless(steps, stack)
+        print(format_summary(summary))
+        if args.save:
+            snapshot.save(stack, args.save)
+            print(f"Snapshot saved : {args.save}")
+        if cache is not None:
+            stats = cache.stats()
+            print(
+                f"Decision cache : {stats['hit_rate']:.1%} hits "
+                f"({stats['hits']}/{stats['hits'] + stats['misses']}), "
+                f"{stats['evictions']} evictions"
+            )
+
+
+if __name__ == "__main__":
+    main()
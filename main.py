@@ -1,20 +1,43 @@
+import argparse
 import time
 import os
-from dotenv import load_dotenv
+from collections import deque
 
 # Modüller
 from modules.sensors import SensorSimulator
 from modules.devices import DeviceManager
 from modules.agent import SHIADecisionAgent
 from modules.policy_manager import PolicyManager
-from dashboard import display_dashboard
+from modules.log_sink import CsvLogSink, DEFAULT_LOG_PATH, make_log_record
+from modules.instrumentation import Instrumentation, format_snapshot
 
 # -------------------------------------------------------
 # Sistem Konfigürasyonu
 # -------------------------------------------------------
-load_dotenv()
+# Bellekte tutulan son log sayısı (uzun koşularda sabit bellek)
+MAX_LOG_ENTRIES = 200
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="SHIA terminal dashboard loop.")
+    parser.add_argument("--tick", type=float, default=5.0,
+                        help="Seconds between simulation steps.")
+    parser.add_argument("--fps", type=float, default=4.0,
+                        help="Maximum dashboard frames per second.")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Collect per-stage timings and print them on exit.")
+    parser.add_argument("--profile-slowest", type=int, default=0, metavar="N",
+                        help="cProfile every step and dump the N slowest to data/profiles.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Terminal arayüzü kütüphaneleri sadece dashboard çalışırken yüklenir
+    from dotenv import load_dotenv
+    from dashboard import TerminalRenderer
+
+    load_dotenv()
 
     # 1. Nesneleri başlat
     sensors = SensorSimulator()
@@ -22,7 +45,13 @@ def main():
     agent = SHIADecisionAgent()
     policy = PolicyManager()
 
-    logs = []
+    logs = deque(maxlen=MAX_LOG_ENTRIES)
+    log_sink = CsvLogSink(DEFAULT_LOG_PATH)
+    renderer = TerminalRenderer(max_fps=args.fps)
+    inst = Instrumentation(
+        enabled=args.instrument or args.profile_slowest > 0,
+        profile_slowest=args.profile_slowest,
+    )
 
     print("SHIA System Initializing...")
     time.sleep(1)
@@ -32,70 +61,94 @@ def main():
     # ---------------------------------------------------
     try:
         while True:
-            # ------------------------
-            # A. Sensör verilerini oku
-            # ------------------------
-            current_data = sensors.update()
-
-            # ------------------------
-            # B. AI kararını al
-            # ------------------------
-            decision_json = agent.decide(current_data)
-
-            # ------------------------
-            # C. Policy kontrolü
-            # ------------------------
-            is_valid, policy_msg = policy.validate_action(decision_json, current_data, devices.get_status())
-
-            # ------------------------
-            # D. Cihaza uygula
-            # ------------------------
-            if is_valid:
-                dev_id = decision_json.get("device_id")
-                action = decision_json.get("action")
-
-                if dev_id != "none":
-                    success, device_msg = devices.update_device(dev_id, action)
-                else:
-                    device_msg = "System IDLE — No device action taken."
-            else:
-                device_msg = f"BLOCKED: {policy_msg}"
-
-            # ------------------------
-            # E. Reflection (AI geri bildirim)
-            # ------------------------
-            reflection = agent.reflect(decision_json, current_data)
-
-            # ------------------------
-            # F. Log kaydı ekle
-            # ------------------------
-            log_entry = (
-                f"[{current_data['time'].strftime('%H:%M:%S')}] "
-                f"Decision: {decision_json} | Policy: {policy_msg} | "
-                f"Device: {device_msg} | Reflection: {reflection}"
-            )
-            logs.append(log_entry)
-
-            # ------------------------
-            # G. Dashboard Terminal UI
-            # ------------------------
-            display_dashboard(
-                sensor_data=current_data,
-                devices_status=devices.get_status(),
-                decision=decision_json,
-                policy_msg=policy_msg,
-                device_msg=device_msg,
-                total_power=devices.get_energy_usage(),
-                logs=logs
-            )
+            with inst.step():
+                # ------------------------
+                # A. Sensör verilerini oku
+                # ------------------------
+                with inst.stage("perception"):
+                    current_data = sensors.update()
+
+                # ------------------------
+                # B. AI kararını al
+                # ------------------------
+                with inst.stage("decision"):
+                    decision_json = agent.decide(current_data)
+
+                # ------------------------
+                # C. Policy kontrolü
+                # ------------------------
+                with inst.stage("policy"):
+                    is_valid, policy_msg = policy.validate_action(
+                        decision_json, current_data, devices.get_status(),
+                        active_power=devices.get_energy_usage(),
+                    )
+
+                # ------------------------
+                # D. Cihaza uygula
+                # ------------------------
+                with inst.stage("actuation"):
+                    if is_valid:
+                        dev_id = decision_json.get("device_id")
+                        action = decision_json.get("action")
+
+                        if dev_id != "none":
+                            success, device_msg = devices.update_device(dev_id, action)
+                        else:
+                            device_msg = "System IDLE — No device action taken."
+                    else:
+                        device_msg = f"BLOCKED: {policy_msg}"
+
+                # ------------------------
+                # E. Reflection (AI geri bildirim)
+                # ------------------------
+                with inst.stage("reflection"):
+                    reflection = agent.reflect(decision_json, current_data)
+
+                # ------------------------
+                # F. Log kaydı ekle
+                # ------------------------
+                with inst.stage("logging"):
+                    log_entry = (
+                        f"[{current_data['time'].strftime('%H:%M:%S')}] "
+                        f"Decision: {decision_json} | Policy: {policy_msg} | "
+                        f"Device: {device_msg} | Reflection: {reflection}"
+                    )
+                    logs.append(log_entry)
+                    log_sink.write(make_log_record(
+                        current_data, decision_json, is_valid,
+                        policy_msg, device_msg, reflection,
+                    ))
+
+                # ------------------------
+                # G. Dashboard Terminal UI
+                # ------------------------
+                with inst.stage("rendering"):
+                    renderer.render(
+                        sensor_data=current_data,
+                        devices_status=devices.get_status(),
+                        decision=decision_json,
+                        policy_msg=policy_msg,
+                        device_msg=device_msg,
+                        total_power=devices.get_energy_usage(),
+                        logs=logs
+                    )
 
             # ------------------------
             # H. Bekleme süresi (simülasyon hızı)
             # ------------------------
-            time.sleep(5)
+            time.sleep(args.tick)
 
     except KeyboardInterrupt:
         print("\nSHIA System Shutdown.")
+    finally:
+        # Her çıkışta (hata dahil) imleci geri getir
+        renderer.close()
+        log_sink.close()
+        if inst.enabled:
+            print(format_snapshot(inst.snapshot()))
+        if inst.profile_slowest:
+            for path in inst.dump_profiles(os.path.join("data", "profiles")):
+                print(f"Profile written: {path}")
 
 
 # -----------------------------------------------------
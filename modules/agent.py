@@ -1,98 +1,105 @@
 from datetime import datetime
 
+from modules.explain import DecisionExplanation, Reflection
+from modules.memory import RollingWindow
+from modules.rules import RuleEngine
+
 
 class SHIADecisionAgent:
     """
     OFFLINE SHIA Agent (LLM yok)
     - Memory (history)
     - Trend analysis
-    - Rule-based decision making
+    - Rule-based decision making (declarative rule table)
     - Manual lock awareness (kullanıcı kilitlediyse dokunmaz)
     """
 
-    def __init__(self):
+    SIGNALS = ("temperature", "light_level", "occupancy")
+
+    def __init__(
+        self,
+        memory_limit: int = 20,
+        windows: dict | None = None,
+        thresholds: dict | None = None,
+        cache=None,
+    ):
+        """
+        memory_limit: varsayılan pencere uzunluğu (adım)
+        windows: sinyal bazında pencere uzunluğu, örn. {"temperature": 240}
+        thresholds: karar eşiklerini ezmek için, örn. {"heater_temp": 18}
+        cache: DecisionCache; verilirse kural seçimi eşdeğer girdiler için
+            (RuleEngine.input_key) önbellekten okunur (birçok ajan aynı önbelleği paylaşabilir)
+        """
+        self.rules = RuleEngine(thresholds=thresholds)
+        self.cache = cache
+        self.memory_limit = memory_limit
+        windows = windows or {}
         self.memory = {
-            "temperature": [],
-            "light_level": [],
-            "occupancy": [],
+            key: RollingWindow(windows.get(key, memory_limit))
+            for key in self.SIGNALS
         }
-        self.memory_limit = 20
 
-    def _trend(self, values):
-        if len(values) < 2:
-            return 0.0
-        diffs = [values[i] - values[i - 1] for i in range(1, len(values))]
-        return sum(diffs) / len(diffs)
+    def _trend(self, key):
+        return self.memory[key].slope()
 
     def _push(self, key, value):
-        self.memory[key].append(value)
-        if len(self.memory[key]) > self.memory_limit:
-            self.memory[key].pop(0)
+        self.memory[key].push(value)
 
-    def decide(self, sensor_data: dict) -> dict:
+    def _observe(self, sensor_data: dict) -> dict:
+        """Okumayı belleğe yazar ve kural girdilerini (trendlerle) döner."""
         temp = float(sensor_data.get("temperature", 22.0))
         light = int(sensor_data.get("light_level", 400))
         occupancy = bool(sensor_data.get("occupancy", True))
-        ts = datetime.now().isoformat()
-
-        # manual locks: {"heater_main": True/False, ...}
-        manual_locks = sensor_data.get("manual_locks", {}) or {}
 
         # memory update
         self._push("temperature", temp)
         self._push("light_level", light)
         self._push("occupancy", occupancy)
 
-        temp_trend = self._trend(self.memory["temperature"])
-        light_trend = self._trend(self.memory["light_level"])
-
-        device_id = "none"
-        action = "IDLE"
-        base_reason = "No action required."
+        return {
+            "temperature": temp,
+            "temp_trend": self._trend("temperature"),
+            "light_level": light,
+            "light_trend": self._trend("light_level"),
+            "occupancy": occupancy,
+        }
 
-        if not occupancy:
-            device_id = "none"
-            action = "IDLE"
-            base_reason = "House is empty; keeping system idle to save energy."
-        else:
-            # Trend-aware heating/cooling/lighting
-            if temp < 19 or (temp < 21 and temp_trend < -0.30):
-                device_id = "heater_main"
-                action = "ON"
-                base_reason = "Temperature is low or decreasing rapidly; turning heater ON proactively."
-
-            elif temp > 25 or (temp > 24 and temp_trend > 0.30):
-                device_id = "ac_main"
-                action = "ON"
-                base_reason = "Temperature is high or rising rapidly; turning AC ON proactively."
-
-            elif light < 120 or (light < 180 and light_trend < -15):
-                device_id = "lights_living"
-                action = "ON"
-                base_reason = "Light level is low or decreasing; turning living room lights ON."
-
-            else:
-                device_id = "none"
-                action = "IDLE"
-                base_reason = "Environmental conditions are stable; no action needed."
+    def _select(self, kind: str, inputs: dict):
+        """
+        Kural seçimi (evaluate / evaluate_all). Önbellek varsa anahtar
+        girdilerin kural eşiklerine göre konumudur (RuleEngine.input_key);
+        aynı anahtar aynı kuralı seçtiği için sonuç önbelleksiz koşuyla
+        aynıdır. Manuel kilitler anahtarda yoktur, _decision() içinde
+        sonradan uygulanır.
+        """
+        evaluate = self.rules.evaluate if kind == "decide" else self.rules.evaluate_all
+        cache = self.cache
+        if cache is None:
+            return evaluate(inputs)
+
+        key = (kind, self.rules.key, self.rules.input_key(inputs))
+        selected = cache.get(key)
+        if selected is None:
+            selected = evaluate(inputs)
+            cache.put(key, selected)
+        return selected
+
+    def _decision(self, inputs: dict, rule: dict, manual_locks: dict, ts: str) -> dict:
+        device_id = rule["device_id"]
+        action = rule["action"]
 
         # ✅ Manual lock enforcement (kritik)
+        locked_device = None
         if device_id != "none" and manual_locks.get(device_id, False):
-            locked_reason = (
-                f"User manual control is ACTIVE for '{device_id}'. "
-                f"AI will not change this device until manual lock is released."
-            )
+            locked_device = device_id
             device_id = "none"
             action = "IDLE"
-            base_reason = locked_reason
-
-        reason = (
-            "Environment analysis:\n"
-            f"- Temperature: {temp:.1f}°C (trend {temp_trend:+.2f}°C/step)\n"
-            f"- Light level: {light} (trend {light_trend:+.1f}/step)\n"
-            f"- Occupancy: {'occupied' if occupancy else 'empty'}\n\n"
-            "Decision reasoning:\n"
-            f"- {base_reason}"
+
+        # Gerekçe metni sadece okunduğunda (dashboard / log) üretilir
+        reason = DecisionExplanation(
+            inputs["temperature"], inputs["temp_trend"],
+            inputs["light_level"], inputs["light_trend"], inputs["occupancy"],
+            rule["name"], rule["reason"], locked_device,
         )
 
         return {
@@ -102,7 +109,42 @@ class SHIADecisionAgent:
             "timestamp": ts,
         }
 
-    def reflect(self, last_decision: dict, sensor_data: dict) -> str:
+    def decide(self, sensor_data: dict) -> dict:
+        ts = datetime.now().isoformat()
+        # manual locks: {"heater_main": True/False, ...}
+        manual_locks = sensor_data.get("manual_locks", {}) or {}
+        inputs = self._observe(sensor_data)
+
+        # Kural tablosu (modules/rules.py) – ilk eşleşen kural kazanır
+        rule = self._select("decide", inputs)
+        return self._decision(inputs, rule, manual_locks, ts)
+
+    def plan(self, sensor_data: dict) -> list:
+        """
+        Bir adımda değişmesi gereken tüm cihazlar için karar listesi.
+
+        Kural tablosu cihaz başına ayrı değerlendirilir (RuleEngine.evaluate_all);
+        soğuk bir sabah + düşük ışık tek adımda hem ısıtıcıyı hem ışığı açar.
+        Manuel kilitli cihazlar plandan çıkarılır. Yapılacak bir şey yoksa
+        decide() ile aynı tek IDLE kararı döner.
+        """
+        ts = datetime.now().isoformat()
+        manual_locks = sensor_data.get("manual_locks", {}) or {}
+        inputs = self._observe(sensor_data)
+
+        decisions = [
+            self._decision(inputs, rule, manual_locks, ts)
+            for rule in self._select("plan", inputs)
+        ]
+        actionable = [d for d in decisions if d["device_id"] != "none"]
+        return actionable or decisions[:1]
+
+    def reflect(self, last_decision: dict, sensor_data: dict) -> Reflection:
+        """
+        Kararın kısa değerlendirmesi. decide()'daki reason gibi LazyText
+        döner: metin ancak okunduğunda (log, dashboard) üretilir; JSON'a
+        yazmadan önce str() ile çevrilmelidir.
+        """
         action = last_decision.get("action", "IDLE")
         device_id = last_decision.get("device_id", "none")
         temp = float(sensor_data.get("temperature", 22.0))
@@ -113,13 +155,13 @@ class SHIADecisionAgent:
             manual_locks = sensor_data.get("manual_locks", {}) or {}
             locked = [d for d, v in manual_locks.items() if v]
             if locked:
-                return f"AI stayed idle because manual control is active for: {', '.join(locked)}."
-            return "System stayed idle; likely energy-efficient."
+                return Reflection("idle_locked", tuple(locked))
+            return Reflection("idle")
 
         if action == "ON" and not occupancy:
-            return "Turning devices ON while house is empty is not energy-efficient."
+            return Reflection("on_empty")
 
         if action == "ON" and 20 <= temp <= 24:
-            return "Turning device ON in a comfortable temperature range may waste energy."
+            return Reflection("on_comfortable")
 
-        return "Decision seems reasonable given the current conditions."
+        return Reflection("reasonable")
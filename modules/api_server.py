@@ -0,0 +1,404 @@
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+from collections import Counter
+from http import HTTPStatus
+
+from modules.async_runtime import AsyncRuntime
+
+# WebSocket el sıkışmasında istemci anahtarına eklenen sabit (RFC 6455)
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+MAX_BODY_BYTES = 1 << 20      # POST gövdesi üst sınırı
+MAX_HEADER_LINES = 100
+SUBSCRIBER_QUEUE = 256        # abone başına bekleyen olay sayısı (yavaş istemci)
+
+
+def _json_bytes(payload) -> bytes:
+    # datetime, DecisionExplanation vb. metne çevrilir
+    return json.dumps(payload, default=str).encode()
+
+
+def _ws_frame(payload: bytes, opcode: int = 0x1) -> bytes:
+    """Sunucudan istemciye maskesiz tek parça WebSocket çerçevesi."""
+    n = len(payload)
+    if n < 126:
+        header = struct.pack("!BB", 0x80 | opcode, n)
+    elif n < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, n)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, n)
+    return header + payload
+
+
+def _close_queue(queue: asyncio.Queue):
+    """Abone kuyruğuna kapanış işareti (None) koyar; doluysa yer açar."""
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(None)
+
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ApiServer:
+    """
+    AsyncRuntime üzerine yerel HTTP + WebSocket kontrol API'si (sadece stdlib).
+
+    Simülasyonu tek bir AsyncRuntime sürer; istemciler sadece okur ya da
+    komut gönderir, hiçbiri döngüyü yeniden çalıştırmaz. Karar / policy /
+    cihaz olayları runtime.on_event üzerinden bir kez JSON'a ve WebSocket
+    çerçevesine çevrilip tüm abonelere dağıtılır. Yavaş abonenin kuyruğu
+    dolarsa en eski olay atılır; döngü hiçbir istemciyi beklemez.
+
+    Uç noktalar:
+        GET  /sensors            son sensör okumaları
+        GET  /devices            DeviceManager.get_status() + toplam güç
+        GET  /locks              manuel kilitler
+        POST /locks              {device_id: bool, ...} kilitleri günceller
+        POST /devices/commands   toplu manuel komut (bkz. _post_commands)
+        GET  /stats              runtime istatistikleri
+        GET  /events             WebSocket: olay akışı
+    """
+
+    def __init__(self, runtime: AsyncRuntime, host: str = "127.0.0.1", port: int = 8765):
+        self.runtime = runtime
+        self.host = host
+        self.port = port
+        self._server = None
+        self._subscribers = set()
+        self._writers = set()
+        self.stats = {"requests": Counter(), "events": 0, "dropped": 0}
+
+        # Runtime'ın mevcut olay dinleyicisini koruyarak araya gir
+        self._previous_on_event = runtime.on_event
+        runtime.on_event = self._on_event
+
+        self._routes = {
+            ("GET", "/sensors"): self._get_sensors,
+            ("GET", "/devices"): self._get_devices,
+            ("GET", "/locks"): self._get_locks,
+            ("POST", "/locks"): self._post_locks,
+            ("POST", "/devices/commands"): self._post_commands,
+            ("GET", "/stats"): self._get_stats,
+        }
+
+    # ------------------------------------------------------------------
+    # Yaşam döngüsü
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """Dinlemeye başlar; port=0 verildiyse seçilen port self.port'a yazılır."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """
+        Dinlemeyi bırakır, WebSocket oturumlarını ve açık bağlantıları kapatır.
+        wait_closed() (Python ≥ 3.12.1) tüm bağlantılar bitene kadar beklediği
+        için önce oturumlar ve bağlantılar kapatılır.
+        """
+        if self._server is None:
+            return
+        self._server.close()
+        for queue in list(self._subscribers):
+            _close_queue(queue)  # WebSocket oturumlarını kapat
+        for writer in list(self._writers):
+            writer.close()  # keep-alive ile bekleyen HTTP bağlantıları
+        await self._server.wait_closed()
+        self._server = None
+
+    # ------------------------------------------------------------------
+    # Olay dağıtımı
+    # ------------------------------------------------------------------
+
+    def _on_event(self, event: dict):
+        if self._previous_on_event is not None:
+            self._previous_on_event(event)
+        self.publish(event)
+
+    def publish(self, event: dict):
+        """Olayı bir kez çerçeveleyip tüm WebSocket abonelerine kuyruklar."""
+        self.stats["events"] += 1
+        if not self._subscribers:
+            return
+        frame = _ws_frame(_json_bytes(event))
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.stats["dropped"] += 1
+            queue.put_nowait(frame)
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._writers.add(writer)
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+
+                if path == "/events" and headers.get("upgrade", "").lower() == "websocket":
+                    self.stats["requests"]["WS /events"] += 1
+                    await self._websocket(reader, writer, headers)
+                    break
+
+                self.stats["requests"][f"{method} {path}"] += 1
+                try:
+                    handler = self._routes.get((method, path))
+                    if handler is None:
+                        if any(route_path == path for _, route_path in self._routes):
+                            raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED,
+                                           f"Method {method} not allowed on {path}.")
+                        raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown endpoint {path}.")
+                    status, payload = HTTPStatus.OK, handler(self._parse_json(body))
+                except ApiError as e:
+                    status, payload = e.status, {"error": e.message}
+                except Exception as e:
+                    # Uç nokta hatası bağlantıyı düşürmesin: JSON 500 dön
+                    status = HTTPStatus.INTERNAL_SERVER_ERROR
+                    payload = {"error": f"Internal server error ({type(e).__name__})."}
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ApiError as e:
+            # İstek okunamadı (bozuk başlık, büyük gövde): yanıtla ve kapat
+            self._write_response(writer, e.status, {"error": e.message}, keep_alive=False)
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Malformed request line.")
+
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise ApiError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Too many headers.")
+
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.")
+        if length < 0 or length > MAX_BODY_BYTES:
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large.")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target.split("?", 1)[0], headers, body
+
+    @staticmethod
+    def _parse_json(body: bytes):
+        if not body:
+            return None
+        try:
+            return json.loads(body)
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Request body must be valid JSON.")
+
+    @staticmethod
+    def _write_response(writer, status: HTTPStatus, payload, keep_alive: bool):
+        body = _json_bytes(payload)
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n".encode("latin-1") + body
+        )
+
+    # ------------------------------------------------------------------
+    # Uç noktalar
+    # ------------------------------------------------------------------
+
+    def _get_sensors(self, _body):
+        return self.runtime.store.snapshot()
+
+    def _get_devices(self, _body):
+        status = self.runtime.devices.get_status()
+        return {
+            "devices": {dev_id: dict(device.items()) for dev_id, device in status.items()},
+            "total_power": self.runtime.devices.get_energy_usage(),
+        }
+
+    def _get_locks(self, _body):
+        return dict(self.runtime.manual_locks)
+
+    def _post_locks(self, body):
+        """{device_id: bool}; false kilidi kaldırır, cihaz AI kontrolüne döner."""
+        if not isinstance(body, dict):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Expected a JSON object {device_id: bool}.")
+        status = self.runtime.devices.get_status()
+        unknown = sorted(dev_id for dev_id in body if dev_id not in status)
+        if unknown:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown devices: {unknown}")
+        for dev_id, locked in body.items():
+            self.runtime.manual_locks[dev_id] = bool(locked)
+        return dict(self.runtime.manual_locks)
+
+    def _post_commands(self, body):
+        """
+        Toplu manuel komut (AsyncRuntime.apply_manual); dashboard'daki manuel
+        butonlar gibi policy'den geçmez, aynı cihazın uçuştaki AI komutunu
+        iptal eder ve (lock=true iken) cihazı manuel kilide alır.
+
+        Gövde:
+            {"commands": [{"device_id": str, "action": str}, ...],
+             "atomic": false,   # true: DeviceManager.apply_plan, hepsi ya da hiçbiri
+             "lock": true}
+
+        Returns:
+            dict: ok, results (komut başına success / message), locks
+        """
+        if isinstance(body, list):
+            body = {"commands": body}
+        commands = body.get("commands") if isinstance(body, dict) else None
+        if not isinstance(commands, list) or not all(
+            isinstance(c, dict)
+            and isinstance(c.get("device_id"), str) and isinstance(c.get("action"), str)
+            for c in commands
+        ):
+            raise ApiError(
+                HTTPStatus.BAD_REQUEST,
+                'Expected {"commands": [{"device_id": str, "action": str}, ...]}.',
+            )
+        manager = self.runtime.devices.manager
+        errors = [
+            error for error in (
+                manager.check_command(c["device_id"], c["action"]) for c in commands
+                if c["device_id"] != "none"
+            ) if error
+        ]
+        if errors:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "; ".join(errors))
+
+        ok, results = self.runtime.apply_manual(
+            commands, atomic=body.get("atomic", False), lock=body.get("lock", True),
+        )
+        for r in results:
+            if r["success"]:
+                self.publish({"type": "manual", **r})
+
+        return {"ok": ok, "results": results, "locks": dict(self.runtime.manual_locks)}
+
+    def _get_stats(self, _body):
+        return {
+            "runtime": self.runtime.stats,
+            "server": {**self.stats, "subscribers": len(self._subscribers)},
+        }
+
+    # ------------------------------------------------------------------
+    # WebSocket
+    # ------------------------------------------------------------------
+
+    async def _websocket(self, reader, writer, headers: dict):
+        key = headers.get("sec-websocket-key")
+        if not key:
+            self._write_response(writer, HTTPStatus.BAD_REQUEST,
+                                 {"error": "Missing Sec-WebSocket-Key."}, keep_alive=False)
+            return
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest()).decode()
+        writer.write(
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n"
+            "\r\n".encode("latin-1")
+        )
+        await writer.drain()
+
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE)
+        self._subscribers.add(queue)
+        control = asyncio.create_task(self._ws_read(reader, writer, queue))
+        try:
+            while True:
+                frame = await queue.get()
+                if frame is None:
+                    writer.write(_ws_frame(b"", opcode=0x8))
+                    await writer.drain()
+                    break
+                writer.write(frame)
+                await writer.drain()
+        finally:
+            self._subscribers.discard(queue)
+            control.cancel()
+
+    async def _ws_read(self, reader, writer, queue):
+        """İstemci çerçeveleri: ping → pong, close → oturumu bitir; veri yok sayılır."""
+        try:
+            while True:
+                first, second = await reader.readexactly(2)
+                opcode = first & 0x0F
+                length = second & 0x7F
+                if length == 126:
+                    (length,) = struct.unpack("!H", await reader.readexactly(2))
+                elif length == 127:
+                    (length,) = struct.unpack("!Q", await reader.readexactly(8))
+                if length > MAX_BODY_BYTES:
+                    break
+                mask = await reader.readexactly(4) if second & 0x80 else b""
+                data = await reader.readexactly(length)
+                if mask:
+                    data = bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+                if opcode == 0x8:
+                    break
+                if opcode == 0x9:
+                    writer.write(_ws_frame(data, opcode=0xA))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        # Yazma döngüsünü kapanış çerçevesiyle sonlandır
+        _close_queue(queue)
+
+
+# ----------------------------------------------------------------------
+
+
+async def serve(runtime: AsyncRuntime, host: str = "127.0.0.1", port: int = 8765,
+                duration: float | None = None) -> ApiServer:
+    """Runtime'ı ve API sunucusunu birlikte çalıştırır (duration: saniye, None: sonsuz)."""
+    server = ApiServer(runtime, host, port)
+    await server.start()
+    try:
+        await runtime.run(duration)
+    finally:
+        await server.close()
+    return server
+
+
+def run_server(host: str = "127.0.0.1", port: int = 8765, duration: float | None = None,
+               **runtime_kwargs) -> dict:
+    """Senkron giriş noktası; bitince sunucu istatistiklerini döner."""
+    server = asyncio.run(serve(AsyncRuntime(**runtime_kwargs), host, port, duration))
+    return {
+        "requests": dict(server.stats["requests"]),
+        "events": server.stats["events"],
+        "dropped": server.stats["dropped"],
+    }
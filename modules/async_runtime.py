@@ -0,0 +1,308 @@
+import asyncio
+import time
+from collections import Counter
+
+from modules.sensors import SensorSimulator
+from modules.devices import DeviceManager
+from modules.agent import SHIADecisionAgent
+from modules.policy_manager import PolicyManager
+
+# Sensör başına örnekleme periyotları (saniye): hızlı occupancy, yavaş sıcaklık
+DEFAULT_SENSOR_RATES = {
+    "occupancy": 0.5,
+    "light_level": 1.0,
+    "temperature": 5.0,
+    "humidity": 5.0,
+}
+
+
+class LatestValueStore:
+    """
+    Sensör görevlerinin yazdığı, karar görevinin okuduğu ortak son-değer deposu.
+
+    Sadece değişen değerler sürümü artırır; karar görevi wait_for_change()
+    ile yeni bir değer gelene kadar uyur.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._version = 0
+        self._changed = asyncio.Event()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def publish(self, field: str, value):
+        if field in self._values and self._values[field] == value:
+            return
+        self._values[field] = value
+        self._version += 1
+        self._changed.set()
+
+    def snapshot(self) -> dict:
+        """SensorSimulator.data formatında anlık kopya."""
+        return dict(self._values)
+
+    async def wait_for_change(self, since_version: int) -> int:
+        while self._version == since_version:
+            self._changed.clear()
+            await self._changed.wait()
+        return self._version
+
+
+class AsyncSensorAdapter:
+    """
+    SensorSimulator'ı asenkron ortama bağlar.
+
+    Ortam (simülatör) kendi periyodunda ilerler; her sensör görevi ise
+    ortamı kendi hızında örnekler, tıpkı fiziksel bir sensör gibi.
+    """
+
+    def __init__(self, simulator: SensorSimulator, env_period: float = 1.0):
+        self.simulator = simulator
+        self.env_period = env_period
+
+    async def run_environment(self, store: LatestValueStore):
+        while True:
+            data = self.simulator.update()
+            store.publish("time", data["time"])
+            await asyncio.sleep(self.env_period)
+
+    def sample(self, field: str):
+        return self.simulator.data[field]
+
+
+class AsyncDeviceAdapter:
+    """
+    DeviceManager komutlarını await edilebilir hale getirir.
+
+    `latency` gerçek cihaz I/O gecikmesini simüle eder; komut beklerken
+    algı ve karar görevleri çalışmaya devam eder. DeviceManager event
+    loop thread'inde çağrılır, bu yüzden ek kilit gerekmez.
+    """
+
+    def __init__(self, manager: DeviceManager, latency: float = 0.0):
+        self.manager = manager
+        self.latency = latency
+
+    async def update_device(self, device_id: str, action: str):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.manager.update_device(device_id, action)
+
+    def get_status(self):
+        return self.manager.get_status()
+
+    def get_energy_usage(self) -> int:
+        return self.manager.get_energy_usage()
+
+
+# ----------------------------------------------------------------------
+
+
+class AsyncRuntime:
+    """
+    asyncio tabanlı Perception–Decision–Action döngüsü.
+
+    - Her sensör ayrı bir görevdir ve kendi periyodunda LatestValueStore'a yazar.
+    - Karar görevi ortam saatinin her adımında (store'daki "time" değişince)
+      en son okumalarla bir kez decide → validate_action çalıştırır; ajan
+      belleğindeki trendler adım başına kalibre olduğu için sensör
+      örneklemeleri ek karar tetiklemez.
+    - Onaylanan cihaz komutları ayrı görev olarak başlatılır; algıyı bloklamaz.
+      Aynı cihaz için uçuşta bir komut varsa karar policy'ye hiç gönderilmez
+      (last_actions sadece gerçekten gönderilen komutlarla güncellenir).
+    - Manuel komutlar apply_manual() ile uygulanır; aynı cihazın uçuştaki
+      AI komutu iptal edilir, böylece manuel komutu sonradan ezemez.
+    - on_event(event: dict) verilirse her karar/komut sonucu ona iletilir.
+    """
+
+    def __init__(
+        self,
+        sensors: AsyncSensorAdapter | None = None,
+        agent: SHIADecisionAgent | None = None,
+        policy: PolicyManager | None = None,
+        devices: AsyncDeviceAdapter | None = None,
+        sensor_rates: dict | None = None,
+        on_event=None,
+    ):
+        self.sensors = sensors or AsyncSensorAdapter(SensorSimulator())
+        self.agent = agent or SHIADecisionAgent()
+        self.policy = policy or PolicyManager()
+        self.devices = devices or AsyncDeviceAdapter(DeviceManager())
+        self.sensor_rates = dict(sensor_rates or DEFAULT_SENSOR_RATES)
+        self.on_event = on_event
+        self.manual_locks = {}
+
+        self.store = LatestValueStore()
+        self.stats = {
+            "decisions": 0, "commands": 0, "skipped": 0, "cancelled": 0,
+            "samples": Counter(), "blocks": Counter(),
+        }
+        self._in_flight = {}  # device_id -> Task
+
+    # ------------------------------------------------------------------
+
+    async def _sensor_task(self, field: str, period: float):
+        while True:
+            self.store.publish(field, self.sensors.sample(field))
+            self.stats["samples"][field] += 1
+            await asyncio.sleep(period)
+
+    async def _decision_task(self):
+        seen = self.store.version
+        decided_at = None
+        while True:
+            seen = await self.store.wait_for_change(seen)
+            sensor_data = self.store.snapshot()
+            if not all(field in sensor_data for field in self.sensor_rates):
+                continue  # henüz her sensörden ilk okuma gelmedi
+            if sensor_data.get("time") == decided_at:
+                continue  # bu ortam adımı için karar zaten verildi
+            decided_at = sensor_data.get("time")
+            sensor_data["manual_locks"] = dict(self.manual_locks)
+            self._decide_and_act(sensor_data)
+
+    def _decide_and_act(self, sensor_data: dict):
+        decision = self.agent.decide(sensor_data)
+        self.stats["decisions"] += 1
+
+        dev_id = decision["device_id"]
+        if dev_id != "none" and dev_id in self._in_flight:
+            # Komut gönderilmeyecek: policy durumuna (last_actions) yazılmasın
+            self.stats["skipped"] += 1
+            self._emit({
+                "type": "decision",
+                "sensor_data": sensor_data,
+                "decision": decision,
+                "is_valid": None,
+                "policy_msg": f"Command for {dev_id} already in flight — skipped.",
+            })
+            return
+
+        is_valid, policy_msg = self.policy.validate_action(
+            decision, sensor_data, self.devices.get_status(),
+            active_power=self.devices.get_energy_usage(),
+        )
+
+        event = {
+            "type": "decision",
+            "sensor_data": sensor_data,
+            "decision": decision,
+            "is_valid": is_valid,
+            "policy_msg": policy_msg,
+        }
+        if not is_valid:
+            self.stats["blocks"][policy_msg] += 1
+        self._emit(event)
+
+        if is_valid and dev_id != "none":
+            task = asyncio.create_task(self._command(dev_id, decision["action"]))
+            self._in_flight[dev_id] = task
+
+    async def _command(self, device_id: str, action: str):
+        try:
+            success, device_msg = await self.devices.update_device(device_id, action)
+        finally:
+            # apply_manual bu komutu iptal edip yerine yenisini koymuş olabilir
+            if self._in_flight.get(device_id) is asyncio.current_task():
+                del self._in_flight[device_id]
+        self.stats["commands"] += 1
+        self._emit({
+            "type": "device",
+            "device_id": device_id,
+            "action": action,
+            "success": success,
+            "device_msg": device_msg,
+        })
+
+    def apply_manual(self, commands: list, atomic: bool = False, lock: bool = True):
+        """
+        Manuel komutları policy'den geçirmeden hemen uygular.
+
+        Komut verilen cihazların uçuştaki AI komutları önce iptal edilir;
+        lock=True iken uygulanan cihazlar manuel kilide alınır. Cihazsız
+        ("none") komutlar bir şey yapmadığı için atlanır.
+
+        Parametreler:
+            commands: [{"device_id": str, "action": str}, ...]
+            atomic: True ise DeviceManager.apply_plan, hepsi ya da hiçbiri
+
+        Returns:
+            (bool, list[dict]): hepsi başarılı mı, uygulanan her komut için
+                sonuç (device_id, action, success, message)
+        """
+        commands = [c for c in commands if c["device_id"] != "none"]
+        for command in commands:
+            task = self._in_flight.pop(command["device_id"], None)
+            if task is not None:
+                task.cancel()
+                self.stats["cancelled"] += 1
+
+        manager = self.devices.manager
+        if atomic:
+            ok, messages = manager.apply_plan(commands)
+            if not ok:
+                # Hiçbir komut uygulanmadı; her komut planın hatalarını taşır
+                messages = [f"Plan rejected: {'; '.join(messages)}"] * len(commands)
+            outcomes = [(ok, msg) for msg in messages]
+        else:
+            outcomes = [manager.update_device(c["device_id"], c["action"]) for c in commands]
+
+        results = [
+            {"device_id": c["device_id"], "action": c["action"],
+             "success": success, "message": msg}
+            for c, (success, msg) in zip(commands, outcomes)
+        ]
+        if lock:
+            for r in results:
+                if r["success"]:
+                    self.manual_locks[r["device_id"]] = True
+        return all(r["success"] for r in results), results
+
+    def _emit(self, event: dict):
+        if self.on_event is not None:
+            self.on_event(event)
+
+    # ------------------------------------------------------------------
+
+    async def run(self, duration: float | None = None):
+        """Tüm görevleri başlatır; duration saniye sonra (None: sonsuza dek) durdurur."""
+        tasks = [asyncio.create_task(self.sensors.run_environment(self.store))]
+        tasks += [
+            asyncio.create_task(self._sensor_task(field, period))
+            for field, period in self.sensor_rates.items()
+        ]
+        tasks.append(asyncio.create_task(self._decision_task()))
+        try:
+            if duration is None:
+                await asyncio.gather(*tasks)
+            else:
+                await asyncio.sleep(duration)
+        finally:
+            for task in tasks + list(self._in_flight.values()):
+                task.cancel()
+            await asyncio.gather(*tasks, *self._in_flight.values(), return_exceptions=True)
+
+
+def run_async(duration: float, sensor_rates: dict | None = None,
+              env_period: float = 1.0, device_latency: float = 0.0) -> dict:
+    """AsyncRuntime'ı `duration` saniye çalıştırıp istatistikleri döner."""
+    runtime = AsyncRuntime(
+        sensors=AsyncSensorAdapter(SensorSimulator(), env_period=env_period),
+        devices=AsyncDeviceAdapter(DeviceManager(), latency=device_latency),
+        sensor_rates=sensor_rates,
+    )
+    start = time.perf_counter()
+    asyncio.run(runtime.run(duration))
+    elapsed = time.perf_counter() - start
+    return {
+        "elapsed_s": elapsed,
+        "decisions": runtime.stats["decisions"],
+        "commands": runtime.stats["commands"],
+        "skipped": runtime.stats["skipped"],
+        "samples": dict(runtime.stats["samples"]),
+        "blocks": dict(runtime.stats["blocks"]),
+        "energy_w": runtime.devices.get_energy_usage(),
+    }
@@ -0,0 +1,170 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from modules.sensors import (
+    base_outdoor_temp,
+    humidity_trend,
+    light_range,
+    occupancy_change_prob,
+)
+
+
+class BatchSensorSimulator:
+    """
+    Çok evli (N ev) vektörel sensör simülatörü.
+
+    SensorSimulator ile aynı günlük eğrileri kullanır, fakat her evin
+    durumunu Python sözlüğü yerine NumPy dizilerinde tutar:
+        - temperature (N,) float
+        - humidity (N,) int
+        - light_level (N,) int
+        - occupancy (N,) bool
+        - time (tüm evler için ortak simülasyon saati)
+
+    Tüm evler tek bir `step()` çağrısıyla ya da `run(T)` ile T adım
+    birden ilerletilir.
+
+    thermal (ThermalModel) verilirse step(power) / run(T, power) ile ev
+    başına aktif cihaz gücü ({tür: (N,) W dizisi}) sıcaklık ve ışığa
+    geri beslenir (kapalı çevrim). Kontrol döngüsü her adımda step(power)
+    çağırır; cihazlar sabit kalacaksa run(T, power) T adımı tek seferde işler.
+
+    seeds (ev başına seed listesi) verilirse her ev kendi Generator'ından
+    çeker; bir evin akışı hangi evlerle aynı simülatörde olduğundan
+    bağımsızdır (fleet shard'ları). Aksi halde tüm evler tek `seed` akışını
+    paylaşır (daha hızlı).
+    """
+
+    STEP = timedelta(minutes=30)
+
+    def __init__(self, n_homes: int, start_time: datetime | None = None, seed=None,
+                 thermal=None, seeds=None):
+        if seeds is not None and len(seeds) != n_homes:
+            raise ValueError("seeds must have one entry per home.")
+        self.n_homes = n_homes
+        self.thermal = thermal
+        self.time = start_time or datetime.now()
+        self.rng = np.random.default_rng(seed)
+        self.rngs = None if seeds is None else [np.random.default_rng(s) for s in seeds]
+
+        # Başlangıç değerleri SensorSimulator ile aynı
+        self.temperature = np.full(n_homes, 22.0)
+        self.humidity = np.full(n_homes, 45, dtype=np.int64)
+        self.light_level = np.full(n_homes, 400, dtype=np.int64)
+        self.occupancy = np.ones(n_homes, dtype=bool)
+
+        # 24 saatlik eğri tabloları: sensors.py'deki eğri fonksiyonlarından
+        # türetilir, böylece iki simülatör aynı eğrileri paylaşır.
+        hours = range(24)
+        self._outdoor = np.array([base_outdoor_temp(h) for h in hours])
+        self._humidity_trend = np.array([humidity_trend(h) for h in hours])
+        light_ranges = [light_range(h) for h in hours]
+        self._light_low = np.array([low for low, _ in light_ranges])
+        self._light_high = np.array([high for _, high in light_ranges])
+        self._occupancy_prob = np.array([occupancy_change_prob(h) for h in hours])
+
+    def _draw(self, method: str, steps: int, *args):
+        """
+        (T, N) rastgele dizi. args skaler ya da T uzunluğunda (adım başına)
+        dizilerdir; ev başına akışlarda her sütun kendi Generator'ından gelir.
+        """
+        if self.rngs is None:
+            args = [a[:, None] if np.ndim(a) else a for a in args]
+            return getattr(self.rng, method)(*args, size=(steps, self.n_homes))
+        return np.stack(
+            [getattr(rng, method)(*args, size=steps) for rng in self.rngs], axis=1
+        )
+
+    # ------------------------------ Public API ------------------------------
+
+    @property
+    def data(self) -> dict:
+        """Güncel durum; SensorSimulator.data ile aynı anahtarlar, değerler dizi."""
+        return {
+            "time": self.time,
+            "temperature": self.temperature,
+            "humidity": self.humidity,
+            "light_level": self.light_level,
+            "occupancy": self.occupancy,
+        }
+
+    def home(self, index: int) -> dict:
+        """Tek bir evin durumunu SensorSimulator.data formatında döner."""
+        return {
+            "time": self.time,
+            "temperature": float(self.temperature[index]),
+            "humidity": int(self.humidity[index]),
+            "light_level": int(self.light_level[index]),
+            "occupancy": bool(self.occupancy[index]),
+        }
+
+    def step(self, power: dict | None = None) -> dict:
+        """Tüm evleri bir adım (30 dakika) ilerletir."""
+        self.run(1, power)
+        return self.data
+
+    def run(self, steps: int, power: dict | None = None) -> dict:
+        """
+        Tüm evleri `steps` adım ilerletir ve her adımın değerlerini döner.
+
+        power: {cihaz türü: W} (skaler ya da (N,) dizi); sadece thermal
+            verilmişse kullanılır ve koşu boyunca sabit kabul edilir.
+
+        Returns:
+            dict: "time" (T uzunluğunda liste) ve (T, N) boyutlu
+                  temperature / humidity / light_level / occupancy dizileri.
+        """
+        n = self.n_homes
+
+        times = [self.time + self.STEP * (t + 1) for t in range(steps)]
+        hours = np.array([ts.hour for ts in times], dtype=np.int64)
+
+        # --- Işık: adımlar arası bağımlılık yok, (T, N) tek seferde ---
+        base = self._draw("integers", steps, self._light_low[hours], self._light_high[hours] + 1)
+        noise = self._draw("integers", steps, -20, 21)
+        light = np.maximum(0, base + noise)
+
+        heat_w = cool_w = 0
+        if self.thermal is not None and power:
+            heat_w, cool_w, light_w = self.thermal.split_power(power)
+            light = light + np.rint(self.thermal.light_gain(np.asarray(light_w))).astype(np.int64)
+
+        # --- Occupancy: flip olayları kümülatif XOR ile birikir ---
+        flips = self._draw("random", steps) < self._occupancy_prob[hours][:, None]
+        occupancy = np.logical_xor.accumulate(flips, axis=0) ^ self.occupancy
+
+        # --- Sıcaklık / nem: önceki adıma bağlı, T boyunca döngü ---
+        temp_noise = self._draw("uniform", steps, -0.9, 0.9)
+        hum_noise = self._draw("uniform", steps, -1, 1)
+        temperature = np.empty((steps, n))
+        humidity = np.empty((steps, n), dtype=np.int64)
+
+        temp = self.temperature
+        hum = self.humidity
+        for t in range(steps):
+            hour = hours[t]
+            if self.thermal is not None:
+                expected = self.thermal.temperature_step(temp, self._outdoor[hour], heat_w, cool_w)
+            else:
+                expected = temp + (self._outdoor[hour] - temp) * 0.1
+            temp = np.round(expected + temp_noise[t], 1)
+            hum = np.clip(hum + self._humidity_trend[hour] + hum_noise[t], 10, 90)
+            hum = hum.astype(np.int64)
+            temperature[t] = temp
+            humidity[t] = hum
+
+        if steps:
+            self.time = times[-1]
+            self.temperature = temperature[-1].copy()
+            self.humidity = humidity[-1].copy()
+            self.light_level = light[-1].copy()
+            self.occupancy = occupancy[-1].copy()
+
+        return {
+            "time": times,
+            "temperature": temperature,
+            "humidity": humidity,
+            "light_level": light,
+            "occupancy": occupancy,
+        }
@@ -0,0 +1,63 @@
+from collections import OrderedDict
+
+
+class DecisionCache:
+    """
+    Karar / policy hattının durumsuz kısmı için sınırlı LRU önbellek.
+
+    Anahtarı çağıran taraf kurar:
+        - sıcaklık, ışık, trendler ve doluluk kendi değerleriyle değil,
+          kural tablosundaki eşiklere göre konumlarıyla (RuleEngine /
+          PolicyEngine.input_key) anahtara girer; aynı aralıktaki girdiler
+          aynı sonucu verdiği için önbellek açıkken kararlar değişmez
+        - last_action, toplam güç, cihaz / eylem gibi durum bilgileri
+          anahtarda açıkça ve olduğu gibi yer alır
+        - tablo / eşikler engine.key içerik özetiyle ayrışır
+
+    Aynı örnek bir süreçteki birçok ev arasında paylaşılabilir (fleet).
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        if maxsize <= 0:
+            raise ValueError("Cache size must be positive.")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # --- LRU ------------------------------------------------------------
+
+    def get(self, key):
+        """Değer ya da None (kaçırma)."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,350 @@
+import csv
+import json
+from collections.abc import MutableMapping
+
+# Güç tüketen durumlar
+ACTIVE_STATES = ("ON", "UNLOCKED")
+
+
+class DeviceRecord:
+    """
+    Tek bir cihazın kompakt (__slots__) kaydı.
+
+    Eski sözlük arayüzü korunur: dev["state"], dev["power_usage"],
+    dev.get("room") ... çalışır. "state" değişince kayıt bağlı olduğu
+    registry'ye haber verir; indeksler ve güç toplamları güncellenir.
+    device_id, type, room ve power_usage indekslere bağlıdır: kayıt bir
+    registry'deyken (öznitelik ya da sözlük yoluyla) değiştirilemez.
+    """
+
+    __slots__ = (
+        "_device_id",
+        "_type",
+        "_room",
+        "_power_usage",
+        "description",
+        "last_changed",
+        "_state",
+        "_registry",
+    )
+
+    FIELDS = ("state", "power_usage", "type", "room", "description", "last_changed")
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init__(self, device_id, state, power_usage, type, room=None,
+                 description="", last_changed=None):
+        self._device_id = device_id
+        self._type = type
+        self._room = room
+        self._power_usage = int(power_usage)
+        self.description = description
+        self.last_changed = last_changed
+        self._state = state
+        self._registry = None
+
+    def _check_unregistered(self, field: str):
+        if self._registry is not None:
+            # İndeksler ve güç toplamları bu alanlara bağlı: salt okunur
+            raise TypeError(f"'{field}' cannot be changed on a registered device.")
+
+    @property
+    def device_id(self):
+        return self._device_id
+
+    @device_id.setter
+    def device_id(self, value):
+        self._check_unregistered("device_id")
+        self._device_id = value
+
+    @property
+    def type(self):
+        return self._type
+
+    @type.setter
+    def type(self, value):
+        self._check_unregistered("type")
+        self._type = value
+
+    @property
+    def room(self):
+        return self._room
+
+    @room.setter
+    def room(self, value):
+        self._check_unregistered("room")
+        self._room = value
+
+    @property
+    def power_usage(self) -> int:
+        return self._power_usage
+
+    @power_usage.setter
+    def power_usage(self, value):
+        self._check_unregistered("power_usage")
+        self._power_usage = int(value)
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @state.setter
+    def state(self, new_state: str):
+        old = self._state
+        self._state = new_state
+        if self._registry is not None and old != new_state:
+            self._registry._on_state_change(self, old)
+
+    @property
+    def active(self) -> bool:
+        return self._state in ACTIVE_STATES
+
+    # --- sözlük uyumluluğu -------------------------------------------
+
+    def __getitem__(self, key):
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self._FIELD_SET else default
+
+    def keys(self):
+        return self.FIELDS
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.FIELDS]
+
+    def to_dict(self) -> dict:
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"DeviceRecord({self.device_id!r}, {self.to_dict()!r})"
+
+
+class DeviceRegistry(MutableMapping):
+    """
+    device_id → DeviceRecord eşlemesi + tür / oda / durum indeksleri.
+
+    - find(type=, room=, state=): en küçük eşleşen indeks kümesi üzerinden
+      çalışır; maliyet tüm cihaz sayısına değil sonuç boyutuna bağlıdır.
+    - Aktif güç toplamı ve tür / oda alt toplamları durum değiştikçe
+      artımlı güncellenir; active_power / power_by_type sorguları O(1).
+    - subscribe(fn): durum geçişlerinde fn(record, old_state) çağrılır
+      (örn. EnergyMeter).
+    """
+
+    def __init__(self):
+        self._listeners = []
+        self._records = {}
+        self._by_type = {}
+        self._by_room = {}
+        self._by_state = {}
+        self.active_power = 0
+        self.power_by_type = {}
+        self.power_by_room = {}
+
+    # --- oluşturma ------------------------------------------------------
+
+    @classmethod
+    def from_dict(cls, devices: dict) -> "DeviceRegistry":
+        """{device_id: {"state": ..., "power_usage": ..., ...}} → registry."""
+        registry = cls()
+        for device_id, fields in devices.items():
+            registry[device_id] = fields
+        return registry
+
+    @classmethod
+    def load(cls, path: str) -> "DeviceRegistry":
+        """
+        Cihaz envanterini dosyadan yükler.
+            .json: {device_id: {...}} ya da [{"device_id": ..., ...}, ...]
+            .csv : device_id,type,room,power_usage,state,description başlıklı
+        """
+        if path.endswith(".csv"):
+            with open(path, newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+        else:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            rows = (
+                [dict(fields, device_id=dev_id) for dev_id, fields in data.items()]
+                if isinstance(data, dict) else data
+            )
+
+        registry = cls()
+        for row in rows:
+            row = dict(row)
+            device_id = row.pop("device_id")
+            row.setdefault("state", "LOCKED" if row.get("type") == "lock" else "OFF")
+            registry[device_id] = row
+        return registry
+
+    # --- MutableMapping -------------------------------------------------
+
+    def __getitem__(self, device_id) -> DeviceRecord:
+        return self._records[device_id]
+
+    def __setitem__(self, device_id, fields):
+        if isinstance(fields, DeviceRecord):
+            owner = fields._registry
+            if owner is not None and owner.get(fields.device_id) is fields and not (
+                owner is self and fields.device_id == device_id
+            ):
+                raise ValueError(
+                    f"Device record '{fields.device_id}' already belongs to a registry; "
+                    "delete it there first or pass its to_dict()."
+                )
+        if device_id in self._records:
+            del self[device_id]
+        record = fields if isinstance(fields, DeviceRecord) else DeviceRecord(
+            device_id,
+            state=fields["state"],
+            power_usage=fields.get("power_usage", 0),
+            type=fields["type"],
+            room=fields.get("room"),
+            description=fields.get("description", ""),
+            last_changed=fields.get("last_changed"),
+        )
+        record._device_id = device_id
+        record._registry = self
+        self._records[device_id] = record
+        _index_add(self._by_type, record.type, device_id)
+        _index_add(self._by_room, record.room, device_id)
+        _index_add(self._by_state, record.state, device_id)
+        if record.active:
+            self._add_power(record, record.power_usage)
+
+    def __delitem__(self, device_id):
+        record = self._records.pop(device_id)
+        _index_remove(self._by_type, record.type, device_id)
+        _index_remove(self._by_room, record.room, device_id)
+        _index_remove(self._by_state, record.state, device_id)
+        if record.active:
+            self._add_power(record, -record.power_usage)
+        record._registry = None
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, device_id):
+        return device_id in self._records
+
+    def get(self, device_id, default=None):
+        return self._records.get(device_id, default)
+
+    # --- artımlı bakım --------------------------------------------------
+
+    def _add_power(self, record: DeviceRecord, watts: int):
+        self.active_power += watts
+        self.power_by_type[record.type] = self.power_by_type.get(record.type, 0) + watts
+        self.power_by_room[record.room] = self.power_by_room.get(record.room, 0) + watts
+
+    def _on_state_change(self, record: DeviceRecord, old_state: str):
+        _index_remove(self._by_state, old_state, record.device_id)
+        _index_add(self._by_state, record.state, record.device_id)
+        was_active = old_state in ACTIVE_STATES
+        if was_active != record.active:
+            watts = record.power_usage
+            self._add_power(record, watts if record.active else -watts)
+        for listener in self._listeners:
+            listener(record, old_state)
+
+    def subscribe(self, listener):
+        """Durum geçişlerinde listener(record, old_state) çağrılır."""
+        self._listeners.append(listener)
+
+    # --- sorgular -------------------------------------------------------
+
+    def ids(self, type=None, room=None, state=None) -> set:
+        """Filtrelere uyan cihaz id'leri (en küçük indeks kümesinden başlar)."""
+        candidates = []
+        if type is not None:
+            candidates.append(self._by_type.get(type, set()))
+        if room is not None:
+            candidates.append(self._by_room.get(room, set()))
+        if state is not None:
+            candidates.append(self._by_state.get(state, set()))
+        if not candidates:
+            return set(self._records)
+        candidates.sort(key=len)
+        smallest, rest = candidates[0], candidates[1:]
+        return {dev_id for dev_id in smallest if all(dev_id in s for s in rest)}
+
+    def find(self, type=None, room=None, state=None) -> list:
+        """Filtrelere uyan DeviceRecord listesi, örn. find(type="light", room="living", state="ON")."""
+        return [self._records[dev_id] for dev_id in self.ids(type, room, state)]
+
+    def total_power(self, type=None, room=None, active_only: bool = True) -> int:
+        """
+        Aktif cihazların toplam gücü. Sadece type ya da sadece room verilirse
+        O(1) alt toplamdan, ikisi birden verilirse sonuç kümesinden hesaplanır.
+        """
+        if active_only:
+            if type is None and room is None:
+                return self.active_power
+            if room is None:
+                return self.power_by_type.get(type, 0)
+            if type is None:
+                return self.power_by_room.get(room, 0)
+        records = self.find(type=type, room=room)
+        return sum(r.power_usage for r in records if r.active or not active_only)
+
+    def reindex(self):
+        """Tüm indeksleri ve güç toplamlarını kayıtlardan sıfırdan kurar."""
+        records = list(self._records.values())
+        listeners = self._listeners
+        self.__init__()
+        self._listeners = listeners
+        for record in records:
+            self[record.device_id] = record
+
+    def verify(self) -> bool:
+        """
+        Koşan toplamları tam yeniden hesaplama ile karşılaştırır.
+
+        Raises:
+            RuntimeError: toplamlar tutarsızsa
+        """
+        total = 0
+        by_type = {}
+        by_room = {}
+        for record in self._records.values():
+            if record.active:
+                total += record.power_usage
+                by_type[record.type] = by_type.get(record.type, 0) + record.power_usage
+                by_room[record.room] = by_room.get(record.room, 0) + record.power_usage
+
+        def nonzero(subtotals):
+            return {k: v for k, v in subtotals.items() if v}
+
+        recomputed = (total, nonzero(by_type), nonzero(by_room))
+        running = (self.active_power, nonzero(self.power_by_type), nonzero(self.power_by_room))
+        if recomputed != running:
+            raise RuntimeError(
+                f"Power totals out of sync: running {self.active_power}W, "
+                f"recomputed {total}W."
+            )
+        return True
+
+
+def _index_add(index: dict, key, device_id):
+    bucket = index.get(key)
+    if bucket is None:
+        bucket = index[key] = set()
+    bucket.add(device_id)
+
+
+def _index_remove(index: dict, key, device_id):
+    bucket = index.get(key)
+    if bucket is not None:
+        bucket.discard(device_id)
+        if not bucket:
+            del index[key]
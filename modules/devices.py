@@ -1,16 +1,34 @@
 from datetime import datetime
 
+from modules.device_registry import ACTIVE_STATES, DeviceRegistry  # noqa: F401
+
 
 class DeviceManager:
-    def __init__(self):
+    def __init__(self, check_consistency: bool = False, registry: DeviceRegistry | None = None):
         """
         Cihazların gelişmiş durumu.
+
+        self.devices bir DeviceRegistry'dir: cihazlar __slots__ kayıtlarında
+        tutulur, tür / oda / durum indeksleri ve aktif güç toplamları durum
+        değiştikçe artımlı güncellenir; get_energy_usage() O(1) çalışır.
+        Kayıtlar sözlük gibi okunabilir (dev["state"]), dashboard'lar değişmez.
+
+        check_consistency: True ise her güncellemeden sonra koşan toplam,
+            tam yeniden hesaplama ile karşılaştırılır (debug / test modu).
+        registry: hazır cihaz envanteri (örn. DeviceRegistry.load(path));
+            verilmezse varsayılan dört cihaz kullanılır.
         """
-        self.devices = {
+        self.check_consistency = check_consistency
+        if registry is not None:
+            self.devices = registry
+            return
+
+        self.devices = DeviceRegistry.from_dict({
             "heater_main": {
                 "state": "OFF",
                 "power_usage": 1800,  # Watt
                 "type": "heater",
+                "room": "main",
                 "description": "Ana oda elektrikli ısıtıcı",
                 "last_changed": None
             },
@@ -18,6 +36,7 @@ class DeviceManager:
                 "state": "OFF",
                 "power_usage": 2200,  # Watt
                 "type": "ac",
+                "room": "main",
                 "description": "Merkezi klima sistemi",
                 "last_changed": None
             },
@@ -25,6 +44,7 @@ class DeviceManager:
                 "state": "OFF",
                 "power_usage": 60,  # Watt
                 "type": "light",
+                "room": "living",
                 "description": "Salon LED aydınlatma",
                 "last_changed": None
             },
@@ -32,13 +52,44 @@ class DeviceManager:
                 "state": "LOCKED",
                 "power_usage": 0,
                 "type": "lock",
+                "room": "entrance",
                 "description": "Giriş kapısı akıllı kilit",
                 "last_changed": None
             },
-        }
+        })
 
     # ----------------------------------------------------------------------
 
+    @classmethod
+    def from_file(cls, path: str, check_consistency: bool = False) -> "DeviceManager":
+        """Cihaz envanterini JSON / CSV dosyasından yükler (bkz. DeviceRegistry.load)."""
+        return cls(check_consistency, registry=DeviceRegistry.load(path))
+
+    def _recompute_power(self):
+        """İndeksleri ve koşan güç toplamlarını sıfırdan kurar (O(cihaz))."""
+        self.devices.reindex()
+
+    # ----------------------------------------------------------------------
+
+    def check_command(self, device_id: str, action: str):
+        """Komut uygulanamıyorsa hata mesajını, uygulanabiliyorsa None döner."""
+        if device_id not in self.devices:
+            return f"Device '{device_id}' not found."
+
+        if action == "IDLE":
+            return None
+
+        # Kilit için özel durumlar
+        if self.devices[device_id]["type"] == "lock":
+            if action not in ["LOCKED", "UNLOCKED"]:
+                return f"Invalid command for lock device: {action}"
+
+        # Genel cihazlar
+        elif action not in ["ON", "OFF"]:
+            return f"Invalid action '{action}' for device '{device_id}'"
+
+        return None
+
     def update_device(self, device_id: str, action: str):
         """
         Cihazın durumunu günceller.
@@ -47,8 +98,9 @@ class DeviceManager:
         Returns:
             (bool, str): Başarılı mı?, Açıklama mesajı
         """
-        if device_id not in self.devices:
-            return False, f"Device '{device_id}' not found."
+        error = self.check_command(device_id, action)
+        if error:
+            return False, error
 
         device = self.devices[device_id]
         previous_state = device["state"]
@@ -57,23 +109,42 @@ class DeviceManager:
         if action == "IDLE":
             return True, f"{device_id} remains in state {previous_state} (IDLE)"
 
-        # Kilit için özel durumlar
-        if device["type"] == "lock":
-            if action not in ["LOCKED", "UNLOCKED"]:
-                return False, f"Invalid command for lock device: {action}"
-            device["state"] = action
-
-        # Genel cihazlar
-        else:
-            if action not in ["ON", "OFF"]:
-                return False, f"Invalid action '{action}' for device '{device_id}'"
-            device["state"] = action
+        device["state"] = action
 
         # Değişim zamanı kaydet
         device["last_changed"] = datetime.now().strftime("%H:%M:%S")
 
+        if self.check_consistency:
+            self.verify_power_totals()
+
         return True, f"{device_id} changed from {previous_state} to {device['state']}"
 
+    def apply_plan(self, plan: list):
+        """
+        Bir karar planını atomik olarak uygular: önce tüm komutlar denetlenir,
+        biri bile geçersizse hiçbir cihaz değişmez.
+        "none" cihazlı (IDLE) kararlar atlanır.
+
+        Returns:
+            (bool, list[str]): Başarılı mı?, komut başına mesajlar
+                (başarısızsa sadece hata mesajları)
+        """
+        commands = [(d["device_id"], d["action"]) for d in plan if d["device_id"] != "none"]
+
+        errors = []
+        seen = set()
+        for device_id, action in commands:
+            if device_id in seen:
+                errors.append(f"Duplicate command for '{device_id}' in plan.")
+            seen.add(device_id)
+            error = self.check_command(device_id, action)
+            if error:
+                errors.append(error)
+        if errors:
+            return False, errors
+
+        return True, [self.update_device(device_id, action)[1] for device_id, action in commands]
+
     # ----------------------------------------------------------------------
 
     def get_status(self):
@@ -86,10 +157,25 @@ class DeviceManager:
 
     def get_energy_usage(self) -> int:
         """
-        Şu an aktif (ON/UNLOCKED) cihazların toplam güç tüketimini hesaplar.
+        Şu an aktif (ON/UNLOCKED) cihazların toplam güç tüketimini döner (O(1)).
+        """
+        return self.devices.active_power
+
+    def get_power_breakdown(self) -> dict:
+        """Aktif gücün tür ve oda bazında alt toplamları."""
+        return {
+            "total": self.devices.active_power,
+            "by_type": dict(self.devices.power_by_type),
+            "by_room": dict(self.devices.power_by_room),
+        }
+
+    # ----------------------------------------------------------------------
+
+    def verify_power_totals(self) -> bool:
+        """
+        Koşan toplamları tam yeniden hesaplama ile karşılaştırır.
+
+        Raises:
+            RuntimeError: toplamlar tutarsızsa
         """
-        total = 0
-        for dev_id, dev in self.devices.items():
-            if dev["state"] in ["ON", "UNLOCKED"]:
-                total += dev["power_usage"]
-        return total
+        return self.devices.verify()
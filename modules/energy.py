@@ -0,0 +1,216 @@
+from datetime import datetime, timedelta
+
+from modules.device_registry import ACTIVE_STATES
+
+_HOUR = timedelta(hours=1)
+
+
+def _hour_start(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+class EnergyMeter:
+    """
+    Tek bir evin enerji sayacı: gücü simülasyon saati üzerinde integre eder.
+
+    - advance(now): sayaç saatini simülasyon zamanına (sensor_data["time"])
+      ilerletir; aradaki süre boyunca o anki aktif güç harcanmış sayılır.
+      Ev, tür ve oda toplamları DeviceRegistry'nin koşan alt toplamlarından
+      O(tür + oda) ile, saatlik / günlük dökümler saat sınırlarında bölünerek tutulur.
+    - Cihaz bazında enerji, registry'nin durum geçişlerinden (ON → OFF) tembel
+      hesaplanır: aktif cihazın açık kaldığı süre ancak kapanınca ya da
+      sorgulanınca işlenir.
+
+    Cihaz komutları advance() ile aynı simülasyon anında uygulanmış kabul
+    edilir; HomeStack her adımda önce advance(), sonra eylemi çalıştırır.
+    """
+
+    def __init__(self, devices, start_time: datetime | None = None):
+        """devices: DeviceRegistry (DeviceManager.devices)"""
+        self.devices = devices
+        self.start = start_time
+        self.now = start_time
+        self.total_wh = 0.0
+        self._type_wh = {}
+        self._room_wh = {}
+        self._device_wh = {}
+        self._on_since = {
+            dev_id: start_time for dev_id, record in devices.items() if record.active
+        }
+        self._hourly = {}
+        self._daily = {}
+        devices.subscribe(self._on_transition)
+
+    # ------------------------------------------------------------------
+
+    def _on_transition(self, record, old_state: str):
+        was_active = old_state in ACTIVE_STATES
+        if record.active and not was_active:
+            self._on_since[record.device_id] = self.now
+        elif was_active and not record.active:
+            self._device_wh[record.device_id] = self.device_wh(record.device_id)
+            self._on_since.pop(record.device_id, None)
+
+    def advance(self, now: datetime):
+        """Aktif gücü [self.now, now] aralığı boyunca integre eder."""
+        if self.now is None:
+            self.start = self.now = now
+            for dev_id in self._on_since:
+                self._on_since[dev_id] = now
+            return
+        if now < self.now:
+            raise ValueError("Energy meter clock cannot go backwards.")
+
+        power = self.devices.active_power
+        if power:
+            hours = (now - self.now).total_seconds() / 3600
+            self.total_wh += power * hours
+            for dev_type, watts in self.devices.power_by_type.items():
+                if watts:
+                    self._type_wh[dev_type] = self._type_wh.get(dev_type, 0.0) + watts * hours
+            for room, watts in self.devices.power_by_room.items():
+                if watts:
+                    self._room_wh[room] = self._room_wh.get(room, 0.0) + watts * hours
+
+            # Saat sınırlarında bölerek saatlik / günlük dökümlere işle
+            t = self.now
+            while t < now:
+                hour = _hour_start(t)
+                seg_end = min(hour + _HOUR, now)
+                wh = power * (seg_end - t).total_seconds() / 3600
+                self._hourly[hour] = self._hourly.get(hour, 0.0) + wh
+                self._daily[hour.date()] = self._daily.get(hour.date(), 0.0) + wh
+                t = seg_end
+        self.now = now
+
+    # ------------------------------------------------------------------
+
+    def device_wh(self, device_id: str) -> float:
+        """Cihazın şimdiye kadarki enerjisi (Wh), açık olduğu süre dahil."""
+        wh = self._device_wh.get(device_id, 0.0)
+        if device_id in self._on_since and self.now is not None:
+            since = self._on_since[device_id]
+            wh += self.devices[device_id].power_usage * (self.now - since).total_seconds() / 3600
+        return wh
+
+    @property
+    def total_kwh(self) -> float:
+        return self.total_wh / 1000
+
+    def by_device_kwh(self) -> dict:
+        return {dev_id: self.device_wh(dev_id) / 1000 for dev_id in self.devices}
+
+    def by_type_kwh(self) -> dict:
+        return {dev_type: wh / 1000 for dev_type, wh in self._type_wh.items()}
+
+    def by_room_kwh(self) -> dict:
+        return {room: wh / 1000 for room, wh in self._room_wh.items()}
+
+    def hourly_kwh(self) -> dict:
+        """Saat başı (datetime) → kWh"""
+        return {hour: wh / 1000 for hour, wh in sorted(self._hourly.items())}
+
+    def daily_kwh(self) -> dict:
+        """Gün (date) → kWh"""
+        return {day: wh / 1000 for day, wh in sorted(self._daily.items())}
+
+    def summary(self) -> dict:
+        return {
+            "total_kwh": self.total_kwh,
+            "by_type_kwh": self.by_type_kwh(),
+            "by_room_kwh": self.by_room_kwh(),
+            "by_device_kwh": self.by_device_kwh(),
+            "daily_kwh": self.daily_kwh(),
+        }
+
+
+# ----------------------------------------------------------------------
+
+
+class FleetEnergyMeter:
+    """
+    N evin enerji sayacı; ev başına güçler NumPy dizileriyle işlenir.
+
+    - step(now, power_w): advance(now) + yeni güç vektörünü (W, uzunluk N) kaydet
+    - integrate(times, power_w, until): (T, N) güç matrisini tek seferde işler;
+      satır t, times[t] ile times[t + 1] (son satırda until) arasında geçerlidir
+
+    Ev başına toplam (home_wh), filo geneli saatlik döküm ve ev başına
+    günlük döküm tutulur. Adımlar en fazla 1 saat olmalıdır.
+    NumPy, tek evli koşuları yavaşlatmamak için sadece burada yüklenir.
+    """
+
+    def __init__(self, n_homes: int, start_time: datetime | None = None):
+        import numpy as np
+
+        self.n_homes = n_homes
+        self.now = start_time
+        self.power_w = np.zeros(n_homes)
+        self.home_wh = np.zeros(n_homes)
+        self._hourly = {}
+        self._daily = {}
+
+    def advance(self, now: datetime):
+        if self.now is not None:
+            self.integrate([self.now], self.power_w[None, :], until=now)
+        self.now = now
+
+    def step(self, now: datetime, power_w):
+        import numpy as np
+
+        self.advance(now)
+        self.power_w = np.asarray(power_w, dtype=float)
+
+    def integrate(self, times, power_w, until: datetime):
+        import numpy as np
+
+        power_w = np.asarray(power_w, dtype=float).reshape(len(times), self.n_homes)
+        starts = np.asarray(times, dtype="datetime64[us]")
+        ends = np.append(starts[1:], np.datetime64(until, "us"))
+        one_hour = np.timedelta64(1, "h")
+        if np.any(ends < starts) or np.any(ends - starts > one_hour):
+            raise ValueError("Energy meter steps must be non-negative and at most 1 hour.")
+
+        # Her satırı bulunduğu saat ve (sınırı geçiyorsa) sonraki saat arasında böl
+        hours = starts.astype("datetime64[h]")
+        boundary = (hours + 1).astype("datetime64[us]")
+        first_h = (np.minimum(ends, boundary) - starts) / one_hour
+        second_h = (ends - starts) / one_hour - first_h
+
+        first = power_w * first_h[:, np.newaxis]
+        second = power_w * second_h[:, np.newaxis]
+        self.home_wh += first.sum(axis=0) + second.sum(axis=0)
+
+        for hour_keys, energy in ((hours, first), (hours + 1, second)):
+            unique, inverse = np.unique(hour_keys, return_inverse=True)
+            per_hour = np.zeros((len(unique), self.n_homes))
+            np.add.at(per_hour, inverse, energy)
+            for hour, row in zip(unique.astype(datetime), per_hour):
+                total = float(row.sum())
+                if not total:
+                    continue
+                self._hourly[hour] = self._hourly.get(hour, 0.0) + total
+                day = hour.date()
+                if day in self._daily:
+                    self._daily[day] += row
+                else:
+                    self._daily[day] = row.copy()
+
+        self.now = until
+
+    # ------------------------------------------------------------------
+
+    @property
+    def total_kwh(self) -> float:
+        return float(self.home_wh.sum()) / 1000
+
+    def home_kwh(self):
+        return self.home_wh / 1000
+
+    def hourly_kwh(self) -> dict:
+        """Saat başı (datetime) → filo geneli kWh"""
+        return {hour: wh / 1000 for hour, wh in sorted(self._hourly.items())}
+
+    def daily_kwh(self) -> dict:
+        """Gün (date) → ev başına kWh dizisi"""
+        return {day: wh / 1000 for day, wh in sorted(self._daily.items())}
@@ -0,0 +1,134 @@
+from abc import ABC, abstractmethod
+
+
+class LazyText(ABC):
+    """
+    Metnini ilk ihtiyaç anında üreten, str gibi davranan açıklama nesnesi.
+
+    Alt sınıflar yapılandırılmış alanları saklar ve `_render()` ile metni
+    üretir. str(), f-string, repr(), ==, `in` ve str metotları metni bir kez
+    render edip önbellekte tutar; kimse okumazsa metin hiç oluşturulmaz.
+    """
+
+    __slots__ = ("_text",)
+
+    def __init__(self):
+        self._text = None
+
+    @abstractmethod
+    def _render(self) -> str:
+        """Metni üretir; alt sınıflar tanımlar."""
+
+    # ------------------------------------------------------------------
+
+    def __str__(self):
+        if self._text is None:
+            self._text = self._render()
+        return self._text
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __format__(self, spec):
+        return format(str(self), spec)
+
+    def __eq__(self, other):
+        if isinstance(other, (str, LazyText)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __len__(self):
+        return len(str(self))
+
+    def __contains__(self, item):
+        return item in str(self)
+
+    def __add__(self, other):
+        return str(self) + other
+
+    def __radd__(self, other):
+        return other + str(self)
+
+    def __getattr__(self, name):
+        # splitlines(), startswith() vb. str metotları
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(str(self), name)
+
+    def __getstate__(self):
+        return {slot: getattr(self, slot) for cls in type(self).__mro__
+                for slot in getattr(cls, "__slots__", ()) if slot != "_text"}
+
+    def __setstate__(self, state):
+        self._text = None
+        for slot, value in state.items():
+            object.__setattr__(self, slot, value)
+
+
+class DecisionExplanation(LazyText):
+    """SHIADecisionAgent.decide() kararının gerekçesi."""
+
+    __slots__ = (
+        "temperature",
+        "temp_trend",
+        "light_level",
+        "light_trend",
+        "occupancy",
+        "rule",
+        "base_reason",
+        "locked_device",
+    )
+
+    def __init__(self, temperature, temp_trend, light_level, light_trend,
+                 occupancy, rule, base_reason, locked_device=None):
+        super().__init__()
+        self.temperature = temperature
+        self.temp_trend = temp_trend
+        self.light_level = light_level
+        self.light_trend = light_trend
+        self.occupancy = occupancy
+        self.rule = rule                    # tetiklenen kuralın adı
+        self.base_reason = base_reason
+        self.locked_device = locked_device  # manuel kilit yüzünden bırakılan cihaz
+
+    def _render(self) -> str:
+        if self.locked_device:
+            reason = (
+                f"User manual control is ACTIVE for '{self.locked_device}'. "
+                f"AI will not change this device until manual lock is released."
+            )
+        else:
+            reason = self.base_reason
+        return (
+            "Environment analysis:\n"
+            f"- Temperature: {self.temperature:.1f}°C (trend {self.temp_trend:+.2f}°C/step)\n"
+            f"- Light level: {self.light_level} (trend {self.light_trend:+.1f}/step)\n"
+            f"- Occupancy: {'occupied' if self.occupancy else 'empty'}\n\n"
+            "Decision reasoning:\n"
+            f"- {reason}"
+        )
+
+
+class Reflection(LazyText):
+    """SHIADecisionAgent.reflect() değerlendirmesi."""
+
+    __slots__ = ("kind", "locked")
+
+    TEMPLATES = {
+        "idle_locked": "AI stayed idle because manual control is active for: {locked}.",
+        "idle": "System stayed idle; likely energy-efficient.",
+        "on_empty": "Turning devices ON while house is empty is not energy-efficient.",
+        "on_comfortable": "Turning device ON in a comfortable temperature range may waste energy.",
+        "reasonable": "Decision seems reasonable given the current conditions.",
+    }
+
+    def __init__(self, kind: str, locked=()):
+        super().__init__()
+        self.kind = kind
+        self.locked = locked
+
+    def _render(self) -> str:
+        return self.TEMPLATES[self.kind].format(locked=", ".join(self.locked))
@@ -0,0 +1,278 @@
+import os
+import time
+from collections import Counter
+
+from modules.runner import HomeStack
+from modules.agent import SHIADecisionAgent
+from modules.policy_manager import PolicyManager
+from modules.decision_cache import DecisionCache
+from modules.energy import FleetEnergyMeter
+from modules.seeding import SEEDED_START_TIME, root_entropy, home_seed
+from modules.thermal import ThermalModel, HEAT_TYPES, COOL_TYPES, LIGHT_TYPES
+
+MODES = ("lockstep", "independent")
+
+# Kapalı çevrimde sensörlere geri beslenen cihaz türleri
+_THERMAL_TYPES = tuple(dict.fromkeys(HEAT_TYPES + COOL_TYPES + LIGHT_TYPES))
+
+
+def _shard_bounds(n_homes: int, n_shards: int) -> list[tuple[int, int]]:
+    """N evi n_shards parçaya (start, count) olarak olabildiğince eşit böler."""
+    n_shards = max(1, min(n_shards, n_homes))
+    base, extra = divmod(n_homes, n_shards)
+    bounds = []
+    start = 0
+    for i in range(n_shards):
+        count = base + (1 if i < extra else 0)
+        bounds.append((start, count))
+        start += count
+    return bounds
+
+
+class _BatchHomeSensors:
+    """
+    BatchSensorSimulator'daki bir evi HomeStack'e SensorSimulator gibi
+    gösterir. update() simülatörü ilerletmez; shard döngüsü tüm evleri
+    birlikte BatchSensorSimulator.step(power) ile ilerletir.
+    """
+
+    def __init__(self, batch, index: int):
+        self.batch = batch
+        self.index = index
+        self.data = batch.home(index)
+
+    def update(self) -> dict:
+        self.data = self.batch.home(self.index)
+        return self.data
+
+
+def _run_shard(start: int, count: int, steps: int, mode: str, entropy: int,
+               closed_loop: bool = False, cache_size: int = 0):
+    """
+    Worker süreçte bir ev grubunu çalıştırır.
+
+    IPC maliyetini düşük tutmak için worker'a sadece (start, count, steps,
+    entropy) gider; her ev kendi home_id'sinden türeyen RNG akışını kullanır,
+    bu yüzden sonuçlar shard/worker sayısından bağımsızdır. Geri dönen sonuç
+    ev başına küçük bir tuple listesi, shard genelinde birleştirilmiş blok
+    sebepleri ve günlük enerji dökümüdür.
+
+    cache_size > 0 ise shard'daki tüm evlerin ajanları ve policy'leri tek bir
+    DecisionCache paylaşır (anahtarlar karar / policy olarak ayrışır).
+
+    closed_loop: shard'ın sensörleri tek bir BatchSensorSimulator'dır; her
+    adımda evlerin aktif ısıtıcı / klima / ışık gücü (N,) vektörler olarak
+    step(power)'a verilir. Her ev simülatörde kendi home_seed akışından
+    çeker, bu yüzden kapalı çevrim sonuçları da shard bölünmesinden bağımsızdır.
+
+    Enerji ev başına EnergyMeter yerine shard genelinde FleetEnergyMeter ile
+    ölçülür: her adımdan sonraki aktif güç (adım, ev) matrisine yazılır ve
+    koşu sonunda tek integrate() çağrısıyla işlenir. Seed'li evler ortak
+    simülasyon saatini (SEEDED_START_TIME) paylaşır.
+
+    Returns:
+        (list[(home_id, actions, blocked, energy_wh)], Counter,
+         Counter(gün → kWh), elapsed_s, önbellek istatistikleri ya da None)
+    """
+    # NumPy sadece worker süreçte yüklenir
+    import numpy as np
+
+    cache = DecisionCache(cache_size) if cache_size > 0 else None
+    batch = None
+    if closed_loop:
+        from modules.batch_sensors import BatchSensorSimulator
+
+        batch = BatchSensorSimulator(
+            count, start_time=SEEDED_START_TIME, thermal=ThermalModel(),
+            seeds=[home_seed(entropy, start + i) for i in range(count)],
+        )
+    stacks = [
+        HomeStack(
+            sensors=_BatchHomeSensors(batch, i) if batch else None,
+            seed=home_seed(entropy, start + i),
+            agent=SHIADecisionAgent(cache=cache),
+            policy=PolicyManager(cache=cache), meter=False,
+        )
+        for i in range(count)
+    ]
+    actions = [0] * count
+    blocked = [0] * count
+    reasons = Counter()
+
+    times = [None] * steps
+    power = np.zeros((steps, count))
+    step_of = [0] * count
+
+    def account(i, result):
+        t = step_of[i]
+        times[t] = result["sensor_data"]["time"]
+        power[t, i] = stacks[i].devices.get_energy_usage()
+        step_of[i] = t + 1
+        if result["acted"]:
+            actions[i] += 1
+        elif not result["is_valid"]:
+            blocked[i] += 1
+            reasons[result["policy_msg"]] += 1
+
+    t0 = time.perf_counter()
+    if batch is not None:
+        # Tüm evlerin cihaz gücü tek vektörel sensör adımına geri beslenir
+        registries = [stack.devices.devices for stack in stacks]
+        for _ in range(steps):
+            batch.step({
+                dev_type: np.array([r.power_by_type.get(dev_type, 0) for r in registries])
+                for dev_type in _THERMAL_TYPES
+            })
+            for i, stack in enumerate(stacks):
+                account(i, stack.step())
+    elif mode == "lockstep":
+        # Tüm evler aynı simülasyon adımında ilerler
+        for _ in range(steps):
+            for i, stack in enumerate(stacks):
+                account(i, stack.step())
+    else:
+        # Her ev kendi ufkunu sonuna kadar koşar
+        for i, stack in enumerate(stacks):
+            for _ in range(steps):
+                account(i, stack.step())
+    elapsed = time.perf_counter() - t0
+
+    # Son adımdaki güç bir adım süresi boyunca sayılır (HomeStack.settle_energy gibi)
+    meter = FleetEnergyMeter(count)
+    if steps and count:
+        meter.integrate(times, power, until=times[-1] + stacks[0].step_duration)
+    daily = Counter({day: float(kwh.sum()) for day, kwh in meter.daily_kwh().items()})
+
+    homes = [
+        (start + i, actions[i], blocked[i], float(meter.home_wh[i]))
+        for i in range(count)
+    ]
+    return homes, reasons, daily, elapsed, cache.stats() if cache is not None else None
+
+
+# ----------------------------------------------------------------------
+
+
+def run_fleet(
+    n_homes: int,
+    steps: int,
+    workers: int | None = None,
+    mode: str = "lockstep",
+    shards_per_worker: int = 1,
+    seed=None,
+    closed_loop: bool = False,
+    cache_size: int = 0,
+) -> dict:
+    """
+    N bağımsız ev yığınını ProcessPoolExecutor üzerinde shard'layarak çalıştırır.
+
+    Parametreler:
+        n_homes: ev sayısı
+        steps: ev başına simülasyon adımı
+        workers: süreç sayısı (varsayılan: CPU sayısı); 1 ise havuz kullanılmaz
+        mode: "lockstep" (adım adım tüm evler) veya "independent"
+        shards_per_worker: yük dengesi için worker başına shard sayısı
+        seed: kök seed; aynı seed aynı filo sonucunu birebir üretir
+        closed_loop: evler ThermalModel ile kapalı çevrimde, shard başına tek
+            BatchSensorSimulator üzerinden simüle edilir (sadece lockstep)
+        cache_size: > 0 ise shard başına bu boyutta karar / policy önbelleği
+
+    Returns:
+        dict: homes (ev başına sonuç listesi), blocks (sebep → sayı),
+              daily_kwh (gün → filo geneli kWh), totals, elapsed_s,
+              home_steps_per_sec, cache (shard'lar toplamı; önbellek yoksa None)
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown fleet mode '{mode}'. Expected one of {MODES}.")
+    if closed_loop and mode != "lockstep":
+        raise ValueError("Closed-loop fleet runs step all homes together; use mode='lockstep'.")
+
+    workers = workers or os.cpu_count() or 1
+    bounds = _shard_bounds(n_homes, workers * shards_per_worker)
+    entropy = root_entropy(seed)
+
+    t0 = time.perf_counter()
+    if workers == 1:
+        shard_results = [
+            _run_shard(start, count, steps, mode, entropy, closed_loop, cache_size)
+            for start, count in bounds
+        ]
+    else:
+        # Süreç havuzu sadece çok worker'lı koşularda yüklenir
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_run_shard, start, count, steps, mode, entropy,
+                            closed_loop, cache_size)
+                for start, count in bounds
+            ]
+            shard_results = [f.result() for f in futures]
+    elapsed = time.perf_counter() - t0
+
+    homes = []
+    blocks = Counter()
+    daily = Counter()
+    cache = Counter()
+    for shard_homes, shard_reasons, shard_daily, _, shard_cache in shard_results:
+        homes.extend(
+            {"home_id": h, "actions": a, "blocked": b, "energy_wh": e}
+            for h, a, b, e in shard_homes
+        )
+        blocks.update(shard_reasons)
+        daily.update(shard_daily)
+        if shard_cache:
+            cache.update({k: v for k, v in shard_cache.items() if k != "hit_rate"})
+
+    return {
+        "homes": homes,
+        "blocks": dict(blocks),
+        "daily_kwh": dict(sorted(daily.items())),
+        "totals": {
+            "homes": n_homes,
+            "steps": steps,
+            "actions": sum(h["actions"] for h in homes),
+            "blocked": sum(h["blocked"] for h in homes),
+            "energy_wh": sum(h["energy_wh"] for h in homes),
+        },
+        "workers": workers,
+        "elapsed_s": elapsed,
+        "home_steps_per_sec": n_homes * steps / elapsed if elapsed > 0 else float("inf"),
+        "cache": _cache_totals(cache) if cache_size > 0 else None,
+    }
+
+
+def _cache_totals(cache: Counter) -> dict:
+    lookups = cache["hits"] + cache["misses"]
+    return {
+        "size": cache["size"],
+        "maxsize": cache["maxsize"],
+        "hits": cache["hits"],
+        "misses": cache["misses"],
+        "evictions": cache["evictions"],
+        "hit_rate": cache["hits"] / lookups if lookups else 0.0,
+    }
+
+
+def format_fleet_summary(result: dict) -> str:
+    """run_fleet sonucunu terminal için metne çevirir."""
+    totals = result["totals"]
+    lines = [
+        "=== SHIA Fleet Run Summary ===",
+        f"Homes          : {totals['homes']}",
+        f"Steps per home : {totals['steps']}",
+        f"Workers        : {result['workers']}",
+        f"Wall time      : {result['elapsed_s']:.3f} s",
+        f"Home-steps/sec : {result['home_steps_per_sec']:.0f}",
+        f"Actions taken  : {totals['actions']}",
+        f"Blocked        : {totals['blocked']}",
+        f"Energy used    : {totals['energy_wh'] / 1000:.2f} kWh",
+    ]
+    cache = result.get("cache")
+    if cache:
+        lines.append(
+            f"Decision cache : {cache['hit_rate']:.1%} hits "
+            f"({cache['hits']}/{cache['hits'] + cache['misses']}), "
+            f"{cache['evictions']} evictions"
+        )
+    return "\n".join(lines)
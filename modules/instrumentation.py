@@ -0,0 +1,205 @@
+import cProfile
+import heapq
+import math
+import os
+import pstats
+import time
+
+
+class LatencyHistogram:
+    """
+    Log ölçekli kovalarla gecikme histogramı (kova genişliği ~%19, 2^(1/4)).
+    Kayıt O(1)'dir; yüzdelikler kova üst sınırından yaklaşık hesaplanır.
+    """
+
+    BUCKETS_PER_OCTAVE = 4
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns: int):
+        bucket = int(math.log2(ns) * self.BUCKETS_PER_OCTAVE) if ns > 0 else 0
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def percentile(self, p: float) -> float:
+        """p. yüzdelik (ns)."""
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(2 ** ((bucket + 1) / self.BUCKETS_PER_OCTAVE), self.max_ns)
+        return float(self.max_ns)
+
+
+class _NullStage:
+    """Ölçüm kapalıyken dönen, hiçbir şey yapmayan context manager."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("_hist", "_t0")
+
+    def __init__(self, hist: LatencyHistogram):
+        self._hist = hist
+
+    def __enter__(self):
+        self._t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self._hist.record(time.perf_counter_ns() - self._t0)
+        return False
+
+
+class _Step:
+    """Bir döngü adımının tamamını ölçer; istenirse adımı cProfile ile profiller."""
+
+    __slots__ = ("_inst", "_t0", "_profiler")
+
+    def __init__(self, inst):
+        self._inst = inst
+        self._profiler = None
+
+    def __enter__(self):
+        if self._inst.profile_slowest:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter_ns() - self._t0
+        if self._profiler is not None:
+            self._profiler.disable()
+        self._inst._finish_step(elapsed, self._profiler)
+        return False
+
+
+class Instrumentation:
+    """
+    Döngü aşamaları için sayaç + gecikme histogramı katmanı.
+
+    Kullanım:
+        inst = Instrumentation(enabled=True)
+        with inst.step():
+            with inst.stage("perception"):
+                ...
+        inst.snapshot()
+
+    enabled=False iken stage()/step() paylaşılan boş bir context manager
+    döner; ölçüm maliyeti tek bir metot çağrısıdır.
+
+    profile_slowest=N verilirse her adım cProfile ile profillenir ve en yavaş
+    N adımın profili saklanır; dump_profiles() bunları .prof dosyalarına yazar.
+    """
+
+    def __init__(self, enabled: bool = False, profile_slowest: int = 0):
+        self.enabled = enabled
+        self.profile_slowest = profile_slowest
+        self.reset()
+
+    def reset(self):
+        self._histograms = {}
+        self._step_seq = 0
+        self._slowest = []  # (elapsed_ns, seq, profiler) min-heap
+
+    # ------------------------------------------------------------------
+
+    def _histogram(self, name: str) -> LatencyHistogram:
+        hist = self._histograms.get(name)
+        if hist is None:
+            hist = self._histograms[name] = LatencyHistogram()
+        return hist
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self._histogram(name))
+
+    def record(self, name: str, elapsed_ns: int):
+        """Dışarıda ölçülmüş bir süreyi `name` aşamasına ekler."""
+        if self.enabled:
+            self._histogram(name).record(elapsed_ns)
+
+    def step(self):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Step(self)
+
+    def _finish_step(self, elapsed_ns: int, profiler):
+        self._histogram("step").record(elapsed_ns)
+        self._step_seq += 1
+
+        if profiler is not None:
+            entry = (elapsed_ns, self._step_seq, profiler)
+            if len(self._slowest) < self.profile_slowest:
+                heapq.heappush(self._slowest, entry)
+            elif elapsed_ns > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> dict:
+        """Aşama adı → sayaç ve gecikme özetleri (ms)."""
+        result = {}
+        for name, hist in self._histograms.items():
+            if not hist.count:
+                continue
+            result[name] = {
+                "count": hist.count,
+                "total_ms": hist.total_ns / 1e6,
+                "mean_ms": hist.total_ns / hist.count / 1e6,
+                "p50_ms": hist.percentile(50) / 1e6,
+                "p90_ms": hist.percentile(90) / 1e6,
+                "p99_ms": hist.percentile(99) / 1e6,
+                "max_ms": hist.max_ns / 1e6,
+            }
+        return result
+
+    def slowest_steps(self) -> list:
+        """Profili saklanan en yavaş adımlar: [(step_no, elapsed_ms), ...]."""
+        return [
+            (seq, elapsed / 1e6)
+            for elapsed, seq, _ in sorted(self._slowest, reverse=True)
+        ]
+
+    def dump_profiles(self, directory: str) -> list:
+        """En yavaş adımların cProfile çıktılarını `directory` altına yazar."""
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for rank, (elapsed, seq, profiler) in enumerate(sorted(self._slowest, reverse=True), 1):
+            path = os.path.join(directory, f"slow_{rank:02d}_step{seq}_{elapsed / 1e6:.2f}ms.prof")
+            pstats.Stats(profiler).dump_stats(path)
+            paths.append(path)
+        return paths
+
+
+def format_snapshot(snapshot: dict) -> str:
+    """snapshot() çıktısını terminal tablosu olarak biçimlendirir."""
+    lines = [f"{'stage':<14} {'count':>8} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+    for name, s in sorted(snapshot.items(), key=lambda kv: -kv[1]["total_ms"]):
+        lines.append(
+            f"{name:<14} {s['count']:>8} {s['mean_ms']:>9.3f} {s['p50_ms']:>9.3f} "
+            f"{s['p99_ms']:>9.3f} {s['max_ms']:>9.3f}"
+        )
+    return "\n".join(lines)
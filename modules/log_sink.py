@@ -0,0 +1,170 @@
+import csv
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Varsayılan log dosyası; data/run_logs/ git tarafından yok sayılır
+DEFAULT_LOG_PATH = os.path.join("data", "run_logs", "logs.csv")
+
+# Log dosyası kolonları (bir satır = bir döngü adımı)
+LOG_FIELDS = [
+    "time",
+    "temperature",
+    "humidity",
+    "light_level",
+    "occupancy",
+    "device_id",
+    "action",
+    "reason",
+    "policy_ok",
+    "policy_msg",
+    "device_msg",
+    "reflection",
+]
+
+_STOP = object()
+
+
+class CsvLogSink:
+    """
+    Yapılandırılmış log kayıtlarını arka plan thread'inde toplu olarak CSV'ye yazar.
+
+    - write() sadece kuyruğa ekler; ana döngü disk I/O'su beklemez.
+      Kuyruk `max_queue` kayıtla sınırlıdır; disk yetişemezse yeni kayıtlar
+      atılır ve `dropped` sayacı artar (bellek sınırlı kalır).
+    - Yazma hatası thread'i durdurmaz: hata loglanır, o parti atılır ve
+      `errors` sayacı artar.
+    - Kayıtlar `batch_size` kadar birikince ya da `flush_interval` saniye
+      geçince tek seferde yazılır.
+    - Dosya `max_bytes` boyutunu aşınca logs.csv → logs.csv.1 → ... şeklinde
+      döndürülür (en fazla `backup_count` eski dosya tutulur).
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_LOG_PATH,
+        fields: list | None = None,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 3,
+        max_queue: int = 10000,
+    ):
+        self.path = path
+        self.fields = fields or LOG_FIELDS
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+        self.dropped = 0
+        self.errors = 0
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="shia-log-sink", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+
+    def write(self, record: dict):
+        """Kaydı yazma kuyruğuna ekler (bloklamaz; kuyruk doluysa kayıt atılır)."""
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """Kuyrukta kalanları yazar ve thread'i durdurur."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        batch = []
+        last_flush = time.monotonic()
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+
+            # Kuyrukta bekleyenleri de aynı partiye al
+            while item is not None:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            now = time.monotonic()
+            due = now - last_flush >= self.flush_interval
+            if batch and (stopping or due or len(batch) >= self.batch_size):
+                try:
+                    self._flush(batch)
+                except Exception:
+                    self.errors += 1
+                    logger.exception("Failed to write %d log records to %s", len(batch), self.path)
+                batch = []
+                last_flush = now
+
+    def _flush(self, batch: list):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=self.fields, extrasaction="ignore")
+            if write_header:
+                writer.writeheader()
+            writer.writerows(batch)
+            size = f.tell()
+
+        if size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        """logs.csv → logs.csv.1, logs.csv.1 → logs.csv.2, ..."""
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+
+def make_log_record(sensor_data, decision, is_valid, policy_msg, device_msg, reflection) -> dict:
+    """Bir döngü adımını LOG_FIELDS formatında düz bir sözlüğe çevirir."""
+    return {
+        "time": sensor_data["time"].isoformat(timespec="seconds"),
+        "temperature": sensor_data["temperature"],
+        "humidity": sensor_data["humidity"],
+        "light_level": sensor_data["light_level"],
+        "occupancy": sensor_data["occupancy"],
+        "device_id": decision.get("device_id"),
+        "action": decision.get("action"),
+        "reason": decision.get("reason"),
+        "policy_ok": is_valid,
+        "policy_msg": policy_msg,
+        "device_msg": device_msg,
+        "reflection": reflection,
+    }
@@ -0,0 +1,99 @@
+import numpy as np
+
+# Dashboard log tablosunun kolonları ve dtype'ları
+LOG_COLUMNS = {
+    "time": object,
+    "temperature": np.float64,
+    "humidity": np.int64,
+    "light_level": np.int64,
+    "occupancy": bool,
+    "action": object,
+    "policy": object,
+    "device_msg": object,
+    "reflection": object,
+}
+
+
+class LogStore:
+    """
+    Sabit kapasiteli, kolon bazlı, sadece-ekleme (append-only) log deposu.
+
+    Her kolon 2 × capacity uzunluğunda önceden ayrılmış bir NumPy dizisidir.
+    Her kayıt iki kez yazılır (slot ve slot + capacity); böylece son
+    `capacity` kayıt her zaman bellekte bitişik durur ve DataFrame'e
+    kopyalamadan dilim (view) olarak verilebilir. Kapasite dolunca en eski
+    kayıtların üzerine yazılır; bellek kullanımı sabittir.
+    """
+
+    def __init__(self, capacity: int = 1000, columns: dict | None = None):
+        if capacity < 1:
+            raise ValueError("LogStore capacity must be at least 1.")
+        self.capacity = capacity
+        self.columns = dict(columns or LOG_COLUMNS)
+        self._data = {
+            name: np.empty(2 * capacity, dtype=dtype)
+            for name, dtype in self.columns.items()
+        }
+        self._total = 0         # şimdiye kadar eklenen kayıt sayısı
+        self._frame_cache = {}  # (version, limit) -> DataFrame
+
+    # ------------------------------------------------------------------
+
+    def append(self, record: dict):
+        """Bir log kaydı ekler (O(1)); eksik kolonlar None olur."""
+        slot = self._total % self.capacity
+        mirror = slot + self.capacity
+        for name, column in self._data.items():
+            value = record.get(name)
+            column[slot] = value
+            column[mirror] = value
+        self._total += 1
+        self._frame_cache.clear()
+
+    def __len__(self):
+        return min(self._total, self.capacity)
+
+    @property
+    def version(self) -> int:
+        """Her eklemede artar; dashboard önbelleği için kullanılabilir."""
+        return self._total
+
+    # ------------------------------------------------------------------
+
+    def _window(self, name: str, limit: int | None = None) -> np.ndarray:
+        """Son `limit` kaydın en yeniden eskiye doğru view'ı (kopya yok)."""
+        count = len(self)
+        if limit is not None:
+            count = min(count, max(0, limit))
+        end = (self._total - 1) % self.capacity + self.capacity + 1
+        return self._data[name][end - count:end][::-1]
+
+    def latest(self) -> dict | None:
+        """En son kayıt (yoksa None)."""
+        if not self._total:
+            return None
+        return {name: self._window(name, 1)[0] for name in self._data}
+
+    def recent(self, limit: int | None = None) -> dict:
+        """Kolon adı → en yeniden eskiye view sözlüğü."""
+        return {name: self._window(name, limit) for name in self._data}
+
+    def to_dataframe(self, limit: int | None = None):
+        """
+        Son kayıtları en yeni üstte olacak şekilde DataFrame olarak verir.
+        Kolonlar depo dizilerinin view'larıdır; sonuç, yeni kayıt gelene
+        kadar önbellekte tutulur.
+        """
+        import pandas as pd
+
+        key = (self._total, limit)
+        frame = self._frame_cache.get(key)
+        if frame is None:
+            frame = pd.DataFrame(self.recent(limit), copy=False)
+            self._frame_cache[key] = frame
+        return frame
+
+    def page(self, page: int = 0, page_size: int = 50):
+        """En yeniden başlayarak `page`. sayfayı DataFrame olarak verir."""
+        start = page * page_size
+        return self.to_dataframe(start + page_size).iloc[start:]
@@ -0,0 +1,128 @@
+from collections import deque
+
+
+class RollingWindow:
+    """
+    Sabit boyutlu halka tampon (ring buffer) + artımlı istatistikler.
+
+    Her `push()` O(1) (min/max için amortize O(1)) çalışır ve şu değerleri
+    güncel tutar; sorgular pencere uzunluğundan bağımsız olarak O(1)'dir:
+        - slope    : ardışık farkların ortalaması = (son - ilk) / (n - 1)
+        - mean / variance : kayan Welford güncellemesi
+        - min / max: monoton deque'ler
+        - ewma     : üssel ağırlıklı hareketli ortalama
+    """
+
+    def __init__(self, size: int, ewma_alpha: float = 0.3):
+        if size < 1:
+            raise ValueError("Window size must be at least 1.")
+        self.size = size
+        self.ewma_alpha = ewma_alpha
+
+        self._buffer = [0.0] * size
+        self._head = 0      # en eski elemanın indeksi
+        self._count = 0
+        self._seq = 0       # toplam push sayısı (min/max deque'leri için)
+
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._ewma = None
+        self._min = deque()  # (seq, value), değerler artan
+        self._max = deque()  # (seq, value), değerler azalan
+
+    # ------------------------------------------------------------------
+
+    def push(self, value):
+        x = float(value)
+        size = self.size
+
+        if self._count < size:
+            # Pencere henüz dolmadı: sadece ekle
+            self._buffer[(self._head + self._count) % size] = x
+            self._count += 1
+            delta = x - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (x - self._mean)
+        else:
+            # Pencere dolu: en eskiyi çıkar, yenisini aynı anda ekle
+            old = self._buffer[self._head]
+            self._buffer[self._head] = x
+            self._head = (self._head + 1) % size
+            new_mean = self._mean + (x - old) / size
+            self._m2 += (x - old) * (x - new_mean + old - self._mean)
+            self._mean = new_mean
+            if self._m2 < 0.0:
+                self._m2 = 0.0
+
+        seq = self._seq
+        self._seq += 1
+        expired = seq - self._count  # bu seq ve öncesi pencereden çıktı
+
+        while self._min and self._min[-1][1] >= x:
+            self._min.pop()
+        self._min.append((seq, x))
+        while self._min[0][0] <= expired:
+            self._min.popleft()
+
+        while self._max and self._max[-1][1] <= x:
+            self._max.pop()
+        self._max.append((seq, x))
+        while self._max[0][0] <= expired:
+            self._max.popleft()
+
+        if self._ewma is None:
+            self._ewma = x
+        else:
+            self._ewma += self.ewma_alpha * (x - self._ewma)
+
+    # ------------------------------------------------------------------
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        """Değerleri eskiden yeniye doğru verir."""
+        for i in range(self._count):
+            yield self._buffer[(self._head + i) % self.size]
+
+    def values(self) -> list:
+        return list(self)
+
+    @property
+    def first(self):
+        return self._buffer[self._head] if self._count else None
+
+    @property
+    def last(self):
+        if not self._count:
+            return None
+        return self._buffer[(self._head + self._count - 1) % self.size]
+
+    def slope(self) -> float:
+        """Ardışık farkların ortalaması (adım başına trend)."""
+        if self._count < 2:
+            return 0.0
+        return (self.last - self.first) / (self._count - 1)
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def variance(self) -> float:
+        """Pencerenin popülasyon varyansı."""
+        if self._count < 2:
+            return 0.0
+        return self._m2 / self._count
+
+    @property
+    def min(self):
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self):
+        return self._max[0][1] if self._max else None
+
+    @property
+    def ewma(self):
+        return self._ewma
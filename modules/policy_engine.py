@@ -0,0 +1,315 @@
+from modules.rules import _OPS, _fingerprint, _interval_key, _threshold_cuts
+
+# ----------------------------------------------------------------------
+# Policy eşikleri (isimli)
+# ----------------------------------------------------------------------
+POLICY_THRESHOLDS = {
+    "heater_max_temp": 28,      # bu değerin üstünde ısıtıcı açılamaz
+    "ac_min_temp": 18,          # bu değerin altında klima açılamaz
+    "light_max_level": 600,     # bu değerin üstünde ışık açmaya gerek yok
+}
+
+# ----------------------------------------------------------------------
+# Güvenlik kuralları: (cihaz türü, eylem) çiftine uygulanır, yukarıdan
+# aşağı ilk tutan kural eylemi engeller.
+#   when: VE'lenen (alan, op, eşik) üçlüleri; eşik POLICY_THRESHOLDS
+#         içindeki bir isim ya da sabit bir değer olabilir.
+#   message: eşik isimleri {isim} ile mesaja yazılabilir.
+# Alanlar: temperature, light_level, occupancy
+# ----------------------------------------------------------------------
+SAFETY_RULES = [
+    {
+        "name": "empty_climate",
+        "types": ("heater", "ac"),
+        "actions": ("ON",),
+        "when": [("occupancy", "==", False)],
+        "message": "Cannot turn ON AC/Heater when house is empty.",
+    },
+    {
+        "name": "empty_lights",
+        "types": ("light",),
+        "actions": ("ON",),
+        "when": [("occupancy", "==", False)],
+        "message": "Lights cannot be turned ON when house is empty.",
+    },
+    {
+        "name": "empty_door",
+        "types": ("lock",),
+        "actions": ("UNLOCKED",),
+        "when": [("occupancy", "==", False)],
+        "message": "Front door cannot be unlocked when house is empty.",
+    },
+    {
+        "name": "heater_overheat",
+        "types": ("heater",),
+        "actions": ("ON",),
+        "when": [("temperature", ">", "heater_max_temp")],
+        "message": "Heater cannot be turned ON above {heater_max_temp}°C (safety rule).",
+    },
+    {
+        "name": "ac_overcool",
+        "types": ("ac",),
+        "actions": ("ON",),
+        "when": [("temperature", "<", "ac_min_temp")],
+        "message": "AC cannot be turned ON under {ac_min_temp}°C (avoid overcooling).",
+    },
+    {
+        "name": "bright_enough",
+        "types": ("light",),
+        "actions": ("ON",),
+        "when": [("light_level", ">", "light_max_level")],
+        "message": "Light is already bright enough; no need to turn ON.",
+    },
+]
+
+# Cihaz türüne göre geçerli komutlar; listede olmayan tür "default" kullanır
+VALID_ACTIONS = {
+    "lock": (("LOCKED", "UNLOCKED"), "Locks only accept LOCKED / UNLOCKED commands."),
+    "default": (("ON", "OFF"), "Invalid action '{action}' for device '{device_id}'."),
+}
+
+# Cihaz tablosu verilmediğinde türün id'den çıkarımı (eski id kuralları)
+LEGACY_DEVICE_TYPES = {
+    "heater_main": "heater",
+    "ac_main": "ac",
+    "smart_lock": "lock",
+}
+
+# Gücü artıran eylem (güç sınırı kontrolünde cihaz gücü eklenir)
+POWER_ON_ACTION = "ON"
+
+def infer_device_type(device_id: str) -> str | None:
+    """Kayıtlı olmayan cihaz için türü id'den tahmin eder."""
+    if device_id in LEGACY_DEVICE_TYPES:
+        return LEGACY_DEVICE_TYPES[device_id]
+    if "light" in device_id:
+        return "light"
+    return None
+
+
+class PolicyEngine:
+    """
+    SAFETY_RULES / VALID_ACTIONS tablolarını (cihaz türü, eylem) anahtarlı
+    arama tablolarına bir kez derler ve iki yoldan değerlendirir:
+        - check(): tek bir eylem için (PolicyManager.validate_action)
+        - validate_batch(): NumPy dizileri için; çok ev ya da çok cihaz
+          tek vektörel geçişte, satır başına kural zinciri yok
+    Kontrol sırası ve mesajlar eski PolicyManager zinciriyle aynıdır:
+    güvenlik kuralları → hızlı değişim → güç sınırı → komut geçerliliği.
+
+    Durum tutmaz: last_action ve aktif güç çağıran tarafından verilir.
+    """
+
+    def __init__(self, rules: list | None = None, thresholds: dict | None = None):
+        self.rules = rules if rules is not None else SAFETY_RULES
+        self.thresholds = dict(POLICY_THRESHOLDS)
+        if thresholds:
+            unknown = set(thresholds) - set(POLICY_THRESHOLDS)
+            if unknown:
+                raise ValueError(f"Unknown policy thresholds: {sorted(unknown)}")
+            self.thresholds.update(thresholds)
+
+        # (tür, eylem) → ((koşullar, mesaj), ...) güvenlik zinciri;
+        # koşullar (alan, operatör fonksiyonu, sayısal eşik) üçlüleridir
+        self._safety = {}
+        for rule in self.rules:
+            compiled = tuple(
+                (field, _OPS[op], self.thresholds.get(value, value)
+                 if isinstance(value, str) else value)
+                for field, op, value in rule["when"]
+            )
+            message = rule["message"].format(**self.thresholds)
+            for dev_type in rule["types"]:
+                for action in rule["actions"]:
+                    self._safety.setdefault((dev_type, action), []).append(
+                        (compiled, message)
+                    )
+        self._safety = {key: tuple(chain) for key, chain in self._safety.items()}
+
+        # tür → (geçerli komut kümesi, mesaj şablonu)
+        self._valid = {
+            dev_type: (frozenset(allowed), message)
+            for dev_type, (allowed, message) in VALID_ACTIONS.items()
+        }
+
+        # Önbellek anahtarlarında tabloyu ve eşikleri ayırt eden parmak izi:
+        # eşikleri çözülmüş kurallar ve geçerli komut tablosu
+        self.key = _fingerprint(
+            tuple(
+                (rule["types"], rule["actions"], tuple(
+                    (field, op, self.thresholds.get(value, value)
+                     if isinstance(value, str) else value)
+                    for field, op, value in rule["when"]
+                ), rule["message"].format(**self.thresholds))
+                for rule in self.rules
+            ),
+            tuple(sorted((t, tuple(sorted(allowed)), m) for t, (allowed, m) in VALID_ACTIONS.items())),
+        )
+        self._cuts = _threshold_cuts(
+            (field, op, value)
+            for chain in self._safety.values() for conditions, _ in chain
+            for field, op, value in conditions
+        )
+
+    # ------------------------------------------------------------------
+
+    def safety_chain(self, device_type, action) -> tuple:
+        return self._safety.get((device_type, action), ())
+
+    def input_key(self, inputs: dict) -> tuple:
+        """Girdilerin güvenlik kuralları açısından eşdeğerlik sınıfı (bkz. RuleEngine.input_key)."""
+        return _interval_key(self._cuts, inputs)
+
+    def invalid_message(self, device_type, device_id: str, action: str) -> str | None:
+        """Komut cihaz türü için geçersizse mesaj, geçerliyse None."""
+        allowed, message = self._valid.get(device_type) or self._valid["default"]
+        if action in allowed:
+            return None
+        return message.format(action=action, device_id=device_id)
+
+    def check(
+        self,
+        device_id: str,
+        action: str,
+        device_type,
+        inputs: dict,
+        last_action=None,
+        total_power=None,
+        power_limit=None,
+        registered: bool = True,
+    ):
+        """
+        IDLE ve var olmayan cihaz dışındaki tüm kontrolleri uygular.
+
+        Parametreler:
+            inputs: temperature, light_level, occupancy
+            total_power: eylem sonrası toplam güç (W); None ise kontrol edilmez
+            registered: cihaz tablosunda kayıtlı mı (değilse komut geçerliliği
+                kontrol edilmez)
+
+        Returns:
+            (bool, str): Onay durumu, açıklama
+        """
+        for conditions, message in self._safety.get((device_type, action), ()):
+            for field, op, value in conditions:
+                if not op(inputs[field], value):
+                    break
+            else:
+                return False, message
+
+        if last_action and last_action != action:
+            return False, f"Rapid switching detected on {device_id} — blocked."
+
+        if total_power is not None and total_power > power_limit:
+            return False, (
+                f"Power limit exceeded ({total_power}W). Action blocked to save energy."
+            )
+
+        if registered:
+            message = self.invalid_message(device_type, device_id, action)
+            if message:
+                return False, message
+
+        return True, "Action approved."
+
+    def validate_batch(
+        self,
+        device_id,
+        action,
+        device_type,
+        power_limit: int,
+        active_power=None,
+        device_power=None,
+        last_action=None,
+        exists=None,
+        **columns,
+    ) -> dict:
+        """
+        M önerilen eylemi tek geçişte denetler (durumsuz; last_actions'a yazmaz).
+
+        Parametreler (M uzunluğunda diziler):
+            device_id, action, device_type: object dizileri
+            active_power: satırın evindeki aktif güç (W); None ise güç
+                sınırı kontrol edilmez (cihaz tablosu yok)
+            device_power: cihazın gücü (W); active_power verildiyse zorunlu
+            last_action: cihazın son onaylanan eylemi (yoksa None)
+            exists: cihaz kayıtlı mı (bool); None ise hepsi kayıtlı sayılır
+            columns: temperature, light_level, occupancy
+
+        Returns:
+            dict: ok (bool dizisi), message (object dizisi)
+        """
+        import numpy as np
+
+        device_id = np.asarray(device_id, dtype=object)
+        action = np.asarray(action, dtype=object)
+        device_type = np.asarray(device_type, dtype=object)
+        columns = {k: np.asarray(v) for k, v in columns.items()}
+        n = len(action)
+
+        message = np.empty(n, dtype=object)
+        pending = np.ones(n, dtype=bool)
+
+        def block(mask, text):
+            nonlocal pending
+            take = mask & pending
+            if take.any():
+                if callable(text):
+                    for i in np.flatnonzero(take):
+                        message[i] = text(i)
+                else:
+                    message[take] = text
+                pending = pending & ~take
+
+        idle = action == "IDLE"
+        message[idle] = "IDLE action allowed."
+        pending &= ~idle
+
+        registered = np.ones(n, dtype=bool) if exists is None else np.asarray(exists, dtype=bool)
+        block(~registered, lambda i: f"Device '{device_id[i]}' does not exist.")
+
+        # Güvenlik zinciri: derlenmiş her (tür, eylem) anahtarı için bir maske
+        for (dev_type, act), chain in self._safety.items():
+            group = (device_type == dev_type) & (action == act) & pending
+            if not group.any():
+                continue
+            for conditions, text in chain:
+                mask = group.copy()
+                for field, op, value in conditions:
+                    mask &= op(columns[field], value)
+                block(mask, text)
+
+        if last_action is not None:
+            last_action = np.asarray(last_action, dtype=object)
+            rapid = (last_action != None) & (last_action != "") & (last_action != action)  # noqa: E711
+            block(rapid, lambda i: f"Rapid switching detected on {device_id[i]} — blocked.")
+
+        if active_power is not None:
+            if device_power is None:
+                raise ValueError("device_power is required when active_power is given.")
+            total = np.asarray(active_power, dtype=np.int64) + np.where(
+                (action == POWER_ON_ACTION) & registered,
+                np.asarray(device_power, dtype=np.int64), 0,
+            )
+            block(
+                total > power_limit,
+                lambda i: (
+                    f"Power limit exceeded ({int(total[i])}W). "
+                    "Action blocked to save energy."
+                ),
+            )
+
+        type_names = device_type.astype(str)
+        action_names = action.astype(str)
+        special = [t for t in VALID_ACTIONS if t != "default"]
+        for dev_type, (allowed, _) in VALID_ACTIONS.items():
+            if dev_type == "default":
+                of_type = ~np.isin(type_names, special)
+            else:
+                of_type = type_names == dev_type
+            invalid = of_type & registered & ~np.isin(action_names, allowed)
+            block(invalid, lambda i: self.invalid_message(device_type[i], device_id[i], action[i]))
+
+        message[pending] = "Action approved."
+        ok = idle | pending
+        return {"ok": ok, "message": message}
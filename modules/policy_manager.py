@@ -1,16 +1,30 @@
+from modules.policy_engine import PolicyEngine, infer_device_type
+
+
 class PolicyManager:
     """
     SHIA için güvenlik ve enerji tasarrufu politikalarını içeren karar doğrulama sistemi.
+
+    Kurallar modules/policy_engine.py tablolarında tanımlıdır ve bir kez
+    (cihaz türü, eylem) anahtarlı arama tablolarına derlenir. PolicyManager
+    sadece durumu (last_actions, power_limit) tutar.
     """
 
-    def __init__(self):
+    def __init__(self, thresholds: dict | None = None, cache=None):
+        """
+        thresholds: policy eşiklerini ezmek için, örn. {"ac_min_temp": 17}
+        cache: DecisionCache; verilirse engine.check() sonucu eşdeğer
+            girdiler için (PolicyEngine.input_key) önbellekten okunur (last_actions yine burada tutulur)
+        """
+        self.engine = PolicyEngine(thresholds=thresholds)
+        self.cache = cache
         # Cihazların hızlı ON/OFF yapmasını engellemek için basit bir durum tutucu
         self.last_actions = {}  # {device_id: action}
         self.power_limit = 3500  # Watt, ev için örnek güç sınırı
 
     # ----------------------------------------------------------------------
 
-    def validate_action(self, action_json, sensor_data, devices=None):
+    def validate_action(self, action_json, sensor_data, devices=None, active_power=None):
         """
         AI kararını güvenlik, enerji ve mantık kurallarına göre denetler.
 
@@ -18,11 +32,23 @@ class PolicyManager:
             action_json: {"device_id": str, "action": str, ...}
             sensor_data: sensör ölçümleri
             devices: DeviceManager içindeki cihaz veri tablosu
+            active_power: şu anki aktif güç (W); verilirse güç sınırı kontrolü
+                DeviceManager.get_energy_usage() değerini O(1) kullanır;
+                verilmezse DeviceRegistry'nin koşan toplamı, o da yoksa
+                cihaz tablosu taranır
 
         Returns:
             (bool, str): Onay durumu, açıklama
         """
+        is_valid, message = self._check_action(action_json, sensor_data, devices, active_power)
+
+        # Her şey başarılıysa kaydet ve izin ver
+        if is_valid and action_json.get("action") != "IDLE":
+            self.record_actions([action_json])
+        return is_valid, message
 
+    def _check_action(self, action_json, sensor_data, devices=None, active_power=None):
+        """validate_action kontrolleri; last_actions'a yazmaz."""
         device_id = action_json.get("device_id")
         action = action_json.get("action")
 
@@ -31,81 +57,120 @@ class PolicyManager:
             return True, "IDLE action allowed."
 
         # Eğer cihaz yoksa engelle
-        if devices and device_id not in devices:
+        has_table = bool(devices)
+        if has_table and device_id not in devices:
             return False, f"Device '{device_id}' does not exist."
 
-        # Cihaz detayını al
-        device = devices.get(device_id) if devices else None
-        temp = sensor_data["temperature"]
-        light = sensor_data["light_level"]
-        occupancy = sensor_data["occupancy"]
-
-        # ===============================================================
-        # 1. GÜVENLİK KURALLARI
-        # ===============================================================
-
-        # --- Ev boşken klima ve ısıtıcı açılamaz ---
-        if not occupancy:
-            if device_id in ["ac_main", "heater_main"] and action == "ON":
-                return False, "Cannot turn ON AC/Heater when house is empty."
-
-            if "light" in device_id and action == "ON":
-                return False, "Lights cannot be turned ON when house is empty."
-
-            if device_id == "smart_lock" and action == "UNLOCKED":
-                return False, "Front door cannot be unlocked when house is empty."
-
-        # --- Sıcaklık tabanlı güvenlik ---
-        if device_id == "heater_main" and action == "ON" and temp > 28:
-            return False, "Heater cannot be turned ON above 28°C (safety rule)."
-
-        if device_id == "ac_main" and action == "ON" and temp < 18:
-            return False, "AC cannot be turned ON under 18°C (avoid overcooling)."
-
-        # --- Işık seviyesi mantığı ---
-        if "light" in device_id and action == "ON" and light > 600:
-            return False, "Light is already bright enough; no need to turn ON."
-
-        # ===============================================================
-        # 2. ENERJİ TASARRUF KURALLARI
-        # ===============================================================
-
-        # Aynı cihaz bir önceki adımda farklı mod aldıysa hızlı değişimi engelle
-        last_action = self.last_actions.get(device_id)
-        if last_action and last_action != action:
-            # Çok hızlı ON/OFF yapmayı engeller
-            return False, f"Rapid switching detected on {device_id} — blocked."
-
-        # Toplam güç sınırı kontrolü
-        if devices:
-            total_power = 0
-            for dev_id, dev in devices.items():
-                if dev["state"] in ["ON", "UNLOCKED"]:
-                    total_power += dev["power_usage"]
+        # Cihaz detayını al; kayıtlı cihazda tür tablodan, yoksa id'den gelir
+        device = devices.get(device_id) if has_table else None
+        device_type = device["type"] if device else infer_device_type(device_id)
+
+        # Toplam güç (eylem sonrası); cihaz tablosu yoksa kontrol edilmez
+        total_power = None
+        if has_table:
+            if active_power is None:
+                active_power = getattr(devices, "active_power", None)
+            if active_power is not None:
+                total_power = active_power
+            else:
+                total_power = 0
+                for dev_id, dev in devices.items():
+                    if dev["state"] in ["ON", "UNLOCKED"]:
+                        total_power += dev["power_usage"]
 
             # Yeni açılacak cihazın gücünü ekle
             if action == "ON" and device:
                 total_power += device["power_usage"]
 
-            if total_power > self.power_limit:
-                return False, (
-                    f"Power limit exceeded ({total_power}W). Action blocked to save energy."
+        # Güvenlik → hızlı değişim → güç sınırı → komut geçerliliği
+        last_action = self.last_actions.get(device_id)
+        registered = device is not None
+        cache = self.cache
+        if cache is None:
+            is_valid, message = self.engine.check(
+                device_id, action, device_type, sensor_data,
+                last_action=last_action,
+                total_power=total_power,
+                power_limit=self.power_limit,
+                registered=registered,
+            )
+        else:
+            # Durum (last_action, toplam güç) anahtarda açıkça yer alır
+            key = (
+                "policy", self.engine.key, device_id, action, device_type, registered,
+                self.engine.input_key(sensor_data), last_action, total_power,
+                self.power_limit,
+            )
+            verdict = cache.get(key)
+            if verdict is None:
+                verdict = self.engine.check(
+                    device_id, action, device_type, sensor_data,
+                    last_action=last_action,
+                    total_power=total_power,
+                    power_limit=self.power_limit,
+                    registered=registered,
                 )
+                cache.put(key, verdict)
+            is_valid, message = verdict
 
-        # ===============================================================
-        # 3. AI KARAR MANTIĞI KONTROLÜ
-        # ===============================================================
+        return is_valid, message
 
-        # Cihaz türüne özel yanlış komut engelleme
-        if device and device["type"] == "lock":
-            if action not in ["LOCKED", "UNLOCKED"]:
-                return False, "Locks only accept LOCKED / UNLOCKED commands."
+    def record_actions(self, actions):
+        """Uygulanan eylemleri hızlı değişim kontrolü için last_actions'a işler."""
+        for action_json in actions:
+            self.last_actions[action_json.get("device_id")] = action_json.get("action")
 
-        if device and device["type"] != "lock":
-            if action not in ["ON", "OFF"]:
-                return False, f"Invalid action '{action}' for device '{device_id}'."
+    # ----------------------------------------------------------------------
 
-        # Her şey başarılıysa kaydet ve izin ver
-        self.last_actions[device_id] = action
-        return True, "Action approved."
+    def validate_plan(self, plan, sensor_data, devices=None, active_power=None):
+        """
+        Çok cihazlı bir karar planını tek geçişte denetler.
+
+        Her eylem validate_action kurallarından geçer; güç sınırı ise planın
+        toplam etkisine göre uygulanır: onaylanan OFF eylemlerinin boşalttığı
+        ve onaylanan ON eylemlerinin eklediği güç sonraki eylemlerin
+        kontrolüne yansır. Güç bırakan eylemler önce değerlendirilir.
+        Aynı cihaz için ikinci eylem reddedilir. last_actions'a yazılmaz;
+        plan uygulandıktan sonra record_actions ile işlenir.
+
+        Returns:
+            list[(bool, str)]: plan sırasıyla eylem başına onay durumu, açıklama
+        """
+        if devices and active_power is None:
+            active_power = getattr(devices, "active_power", None)
+            if active_power is None:
+                active_power = sum(
+                    dev["power_usage"] for dev in devices.values()
+                    if dev["state"] in ["ON", "UNLOCKED"]
+                )
 
+        order = sorted(
+            range(len(plan)),
+            key=lambda i: plan[i].get("action") not in ["OFF", "LOCKED"],
+        )
+        results = [None] * len(plan)
+        seen = set()
+        for i in order:
+            decision = plan[i]
+            device_id = decision.get("device_id")
+            action = decision.get("action")
+
+            if device_id != "none" and device_id in seen:
+                results[i] = (False, f"Duplicate action for {device_id} in plan.")
+                continue
+            seen.add(device_id)
+
+            results[i] = self._check_action(
+                decision, sensor_data, devices, active_power=active_power
+            )
+
+            # Onaylanan eylemin güç etkisini sonraki kontrollere taşı
+            device = devices.get(device_id) if devices else None
+            if results[i][0] and device:
+                is_active = device["state"] in ["ON", "UNLOCKED"]
+                if action in ["ON", "UNLOCKED"] and not is_active:
+                    active_power += device["power_usage"]
+                elif action in ["OFF", "LOCKED"] and is_active:
+                    active_power -= device["power_usage"]
+
+        return results
@@ -0,0 +1,246 @@
+import hashlib
+import operator
+from bisect import bisect_left
+
+# ----------------------------------------------------------------------
+# Karar eşikleri (isimli); SHIADecisionAgent(thresholds=...) ile ezilebilir
+# ----------------------------------------------------------------------
+DEFAULT_THRESHOLDS = {
+    "heater_temp": 19,          # bu değerin altı: ısıtıcı
+    "heater_trend_temp": 21,    # bu değerin altı + hızlı düşüş: ısıtıcı
+    "heater_trend": -0.30,      # °C/adım
+    "ac_temp": 25,              # bu değerin üstü: klima
+    "ac_trend_temp": 24,        # bu değerin üstü + hızlı artış: klima
+    "ac_trend": 0.30,           # °C/adım
+    "light_level": 120,         # bu değerin altı: ışık
+    "light_trend_level": 180,   # bu değerin altı + düşüş: ışık
+    "light_trend": -15,         # lümen/adım
+}
+
+# ----------------------------------------------------------------------
+# Kural tablosu: yukarıdan aşağı ilk eşleşen kural kazanır.
+#   when: VEYA'lanan koşul grupları; her grup VE'lenen (alan, op, eşik)
+#         üçlülerinden oluşur. Eşik, DEFAULT_THRESHOLDS içindeki bir isim
+#         ya da sabit bir değer olabilir. Boş grup her zaman doğrudur.
+# Alanlar: temperature, temp_trend, light_level, light_trend, occupancy
+# ----------------------------------------------------------------------
+DECISION_RULES = [
+    {
+        "name": "empty_house",
+        "device_id": "none",
+        "action": "IDLE",
+        "when": [[("occupancy", "==", False)]],
+        "reason": "House is empty; keeping system idle to save energy.",
+    },
+    {
+        "name": "heat",
+        "device_id": "heater_main",
+        "action": "ON",
+        "when": [
+            [("temperature", "<", "heater_temp")],
+            [("temperature", "<", "heater_trend_temp"), ("temp_trend", "<", "heater_trend")],
+        ],
+        "reason": "Temperature is low or decreasing rapidly; turning heater ON proactively.",
+    },
+    {
+        "name": "cool",
+        "device_id": "ac_main",
+        "action": "ON",
+        "when": [
+            [("temperature", ">", "ac_temp")],
+            [("temperature", ">", "ac_trend_temp"), ("temp_trend", ">", "ac_trend")],
+        ],
+        "reason": "Temperature is high or rising rapidly; turning AC ON proactively.",
+    },
+    {
+        "name": "light",
+        "device_id": "lights_living",
+        "action": "ON",
+        "when": [
+            [("light_level", "<", "light_level")],
+            [("light_level", "<", "light_trend_level"), ("light_trend", "<", "light_trend")],
+        ],
+        "reason": "Light level is low or decreasing; turning living room lights ON.",
+    },
+    {
+        "name": "stable",
+        "device_id": "none",
+        "action": "IDLE",
+        "when": [[]],
+        "reason": "Environmental conditions are stable; no action needed.",
+    },
+]
+
+_OPS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def _fingerprint(*parts) -> str:
+    """Derlenmiş tabloların içerik özeti; süreçler arasında da kararlıdır."""
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def _threshold_cuts(conditions) -> tuple:
+    """(alan, op, eşik) koşullarından alan başına sıralı benzersiz eşikler."""
+    cuts = {}
+    for field, _, value in conditions:
+        cuts.setdefault(field, set()).add(value)
+    return tuple((field, tuple(sorted(values))) for field, values in sorted(cuts.items()))
+
+
+def _interval_key(cuts: tuple, inputs: dict) -> tuple:
+    """
+    Girdilerin eşiklere göre konumu: alan başına 2 * (altında kalan eşik
+    sayısı) + (bir eşiğe eşit mi). Karşılaştırma koşullarının hepsi bu
+    konuma göre belirlendiği için aynı anahtar aynı sonucu verir.
+    """
+    key = []
+    for field, values in cuts:
+        x = inputs[field]
+        i = bisect_left(values, x)
+        key.append(2 * i + (i < len(values) and values[i] == x))
+    return tuple(key)
+
+
+class RuleEngine:
+    """
+    DECISION_RULES tablosunu bir kez derleyip üç yoldan değerlendirir:
+        - evaluate(): tek bir okuma için (SHIADecisionAgent.decide)
+        - evaluate_all(): cihaz başına ilk eşleşen kural (SHIADecisionAgent.plan)
+        - evaluate_batch(): NumPy dizileri için, satır başına Python çağrısı yok
+    İki yol aynı tabloyu kullandığı için aynı sonucu verir.
+    """
+
+    def __init__(self, rules: list | None = None, thresholds: dict | None = None):
+        self.rules = rules if rules is not None else DECISION_RULES
+        self.thresholds = dict(DEFAULT_THRESHOLDS)
+        if thresholds:
+            unknown = set(thresholds) - set(DEFAULT_THRESHOLDS)
+            if unknown:
+                raise ValueError(f"Unknown decision thresholds: {sorted(unknown)}")
+            self.thresholds.update(thresholds)
+
+        # Eşik isimlerini sayılara çözüp (alan, op, değer) gruplarını hazırla
+        self._compiled = []
+        for rule in self.rules:
+            groups = []
+            for group in rule["when"]:
+                groups.append(tuple(
+                    (field, op, self.thresholds.get(value, value)
+                     if isinstance(value, str) else value)
+                    for field, op, value in group
+                ))
+            self._compiled.append(tuple(groups))
+
+        # Önbellek anahtarlarında tabloyu ve eşikleri ayırt eden parmak izi:
+        # eşikleri çözülmüş koşullar ve kuralların çıktıları
+        self.key = _fingerprint(tuple(
+            (tuple(sorted((k, v) for k, v in rule.items() if k != "when")), groups)
+            for rule, groups in zip(self.rules, self._compiled)
+        ))
+        self._cuts = _threshold_cuts(
+            condition for groups in self._compiled for group in groups for condition in group
+        )
+
+    # ------------------------------------------------------------------
+
+    def input_key(self, inputs: dict) -> tuple:
+        """
+        Girdilerin kural açısından eşdeğerlik sınıfı (eşikler arası aralıklar).
+        Aynı input_key aynı kuralı seçer; önbellek anahtarında sürekli
+        sıcaklık / ışık / eğim değerlerinin kendisi gerekmez.
+        """
+        return _interval_key(self._cuts, inputs)
+
+    def evaluate(self, inputs: dict) -> dict:
+        """İlk eşleşen kuralı döner (tablodaki sözlük)."""
+        for rule, groups in zip(self.rules, self._compiled):
+            for group in groups:
+                if all(_OPS[op](inputs[field], value) for field, op, value in group):
+                    return rule
+        raise LookupError("No decision rule matched; the table needs a catch-all rule.")
+
+    def evaluate_all(self, inputs: dict) -> list:
+        """
+        Her cihaz için ilk eşleşen kuralı tablo sırasıyla döner.
+
+        Cihazsız (device_id "none") bir kurala ulaşıldığında tarama durur:
+        daha önce hiçbir cihaz kuralı eşleşmediyse sonuç sadece o kuraldır
+        (örn. empty_house, stable). Tek cihaz kuralı eşleştiğinde sonuç
+        [evaluate(inputs)] ile aynıdır.
+        """
+        matched = []
+        seen = set()
+        for rule, groups in zip(self.rules, self._compiled):
+            if not any(
+                all(_OPS[op](inputs[field], value) for field, op, value in group)
+                for group in groups
+            ):
+                continue
+            device_id = rule["device_id"]
+            if device_id == "none":
+                return matched or [rule]
+            if device_id not in seen:
+                seen.add(device_id)
+                matched.append(rule)
+        if matched:
+            return matched
+        raise LookupError("No decision rule matched; the table needs a catch-all rule.")
+
+    def evaluate_batch(self, locks: dict | None = None, **columns) -> dict:
+        """
+        Tüm satırları NumPy maskeleriyle değerlendirir.
+
+        Parametreler:
+            locks: {device_id: bool dizisi}; kilitli cihaza düşen satırlar IDLE olur
+            columns: temperature, temp_trend, light_level, light_trend, occupancy
+                     (aynı uzunlukta diziler)
+
+        Returns:
+            dict: rule (kural indeksi), device_id, action (object dizileri),
+                  locked (manuel kilit nedeniyle IDLE'a düşen satırlar)
+        """
+        import numpy as np
+
+        columns = {k: np.asarray(v) for k, v in columns.items()}
+        n = len(next(iter(columns.values())))
+
+        rule_idx = np.full(n, -1, dtype=np.int64)
+        pending = np.ones(n, dtype=bool)
+        for i, groups in enumerate(self._compiled):
+            matched = np.zeros(n, dtype=bool)
+            for group in groups:
+                mask = np.ones(n, dtype=bool)
+                for field, op, value in group:
+                    mask &= _OPS[op](columns[field], value)
+                matched |= mask
+            take = matched & pending
+            rule_idx[take] = i
+            pending &= ~take
+            if not pending.any():
+                break
+
+        if pending.any():
+            raise LookupError("No decision rule matched; the table needs a catch-all rule.")
+
+        device_ids = np.array([r["device_id"] for r in self.rules], dtype=object)[rule_idx]
+        actions = np.array([r["action"] for r in self.rules], dtype=object)[rule_idx]
+
+        locked = np.zeros(n, dtype=bool)
+        for dev_id, lock_mask in (locks or {}).items():
+            locked |= (device_ids == dev_id) & np.asarray(lock_mask, dtype=bool)
+        device_ids[locked] = "none"
+        actions[locked] = "IDLE"
+
+        return {
+            "rule": rule_idx,
+            "device_id": device_ids,
+            "action": actions,
+            "locked": locked,
+        }
@@ -0,0 +1,218 @@
+import time
+from collections import Counter
+from datetime import timedelta
+
+from modules.sensors import SensorSimulator
+from modules.devices import DeviceManager
+from modules.agent import SHIADecisionAgent
+from modules.policy_manager import PolicyManager
+from modules.energy import EnergyMeter
+from modules.thermal import ThermalModel
+from modules.seeding import SEEDED_START_TIME
+
+# SensorSimulator her update() çağrısında saati 30 dakika ilerletir
+STEP_DURATION = timedelta(minutes=30)
+
+
+class HomeStack:
+    """
+    Tek bir evin tam SHIA yığını: sensör → karar → policy → cihaz.
+
+    Dashboard, log veya bekleme içermez; headless ve fleet koşuları için
+    main.py döngüsünün çekirdeğini tek bir `step()` çağrısına indirger.
+    """
+
+    def __init__(self, sensors=None, agent=None, policy=None, devices=None,
+                 seed=None, start_time=None, plan_actions=False, thermal=None,
+                 meter=True):
+        """
+        seed / start_time: sensors verilmediğinde oluşturulan SensorSimulator
+        için. Seed verilip start_time verilmezse SEEDED_START_TIME kullanılır,
+        böylece aynı seed aynı koşuyu birebir tekrar üretir.
+        plan_actions: True ise her adımda tek karar yerine çok cihazlı plan
+        üretilir (agent.plan → policy.validate_plan → devices.apply_plan).
+        thermal: True ya da ThermalModel; oluşturulan SensorSimulator kapalı
+        çevrimde çalışır, açık cihazlar sıcaklığı / ışığı değiştirir.
+        meter: False ise ev başına EnergyMeter kurulmaz (energy=None); filo
+        koşuları enerjiyi FleetEnergyMeter ile toplu ölçer.
+        """
+        self.devices = devices or DeviceManager()
+        if sensors is None:
+            if seed is not None and start_time is None:
+                start_time = SEEDED_START_TIME
+            if thermal is True:
+                thermal = ThermalModel()
+            thermal = thermal or None
+            sensors = SensorSimulator(
+                start_time=start_time, seed=seed, thermal=thermal,
+                devices=self.devices.devices if thermal else None,
+            )
+        self.sensors = sensors
+        self.agent = agent or SHIADecisionAgent()
+        self.policy = policy or PolicyManager()
+        self.plan_actions = plan_actions
+        # Simülasyon saatine göre kWh sayacı (cihaz / tür / ev, saatlik / günlük)
+        self.energy = EnergyMeter(self.devices.devices) if meter else None
+        # Sensör kaynağının son gözlenen adım süresi (TraceReplay farklı olabilir)
+        self.step_duration = STEP_DURATION
+        self._clock = None
+
+    def step(self) -> dict:
+        """
+        Perception–Decision–Action döngüsünü bir adım çalıştırır.
+
+        Returns:
+            dict: sensor_data, decision, is_valid, policy_msg,
+                  acted (cihaz durumu değişti mi), device_msg
+                  (plan_actions=True ise ayrıca plan ve verdicts)
+        """
+        sensor_data = self.sensors.update()
+        now = sensor_data["time"]
+        if self._clock is not None:
+            self.step_duration = now - self._clock
+        self._clock = now
+        if self.energy is not None:
+            self.energy.advance(now)
+        if self.plan_actions:
+            return self._step_plan(sensor_data)
+
+        decision = self.agent.decide(sensor_data)
+        is_valid, policy_msg = self.policy.validate_action(
+            decision, sensor_data, self.devices.get_status(),
+            active_power=self.devices.get_energy_usage(),
+        )
+
+        acted = False
+        if is_valid:
+            dev_id = decision["device_id"]
+            if dev_id != "none":
+                acted, device_msg = self.devices.update_device(dev_id, decision["action"])
+            else:
+                device_msg = "System IDLE — No device action taken."
+        else:
+            device_msg = f"BLOCKED: {policy_msg}"
+
+        return {
+            "sensor_data": sensor_data,
+            "decision": decision,
+            "is_valid": is_valid,
+            "policy_msg": policy_msg,
+            "acted": acted,
+            "device_msg": device_msg,
+        }
+
+    def settle_energy(self):
+        """Son adımdan sonraki gücü bir adım süresi (step_duration) boyunca sayaca işler."""
+        if self.energy is not None and self._clock is not None:
+            self.energy.advance(self._clock + self.step_duration)
+
+    def _step_plan(self, sensor_data: dict) -> dict:
+        """
+        Çok cihazlı adım. Tek eylemli planlarda sonuç step() ile aynıdır;
+        birden çok eylemde decision planın ilk kararı, is_valid tüm
+        eylemlerin onaylanıp onaylanmadığıdır ve mesajlar " | " ile birleşir.
+        """
+        plan = self.agent.plan(sensor_data)
+        verdicts = self.policy.validate_plan(
+            plan, sensor_data, self.devices.get_status(),
+            active_power=self.devices.get_energy_usage(),
+        )
+
+        approved = [d for d, (ok, _) in zip(plan, verdicts) if ok and d["device_id"] != "none"]
+        acted, applied = self.devices.apply_plan(approved) if approved else (False, [])
+        if acted:
+            # Policy durumu ancak plan cihazlara uygulandıktan sonra güncellenir
+            self.policy.record_actions(approved)
+            applied = iter(applied)
+        else:
+            # apply_plan hiçbir komutu uygulamadı; dönen liste hata mesajlarıdır
+            failure = f"FAILED: {'; '.join(applied)}"
+
+        device_msgs = []
+        for decision, (ok, msg) in zip(plan, verdicts):
+            if not ok:
+                device_msgs.append(f"BLOCKED: {msg}")
+            elif decision["device_id"] == "none":
+                device_msgs.append("System IDLE — No device action taken.")
+            else:
+                device_msgs.append(next(applied) if acted else failure)
+
+        failed = [msg for ok, msg in verdicts if not ok]
+        return {
+            "sensor_data": sensor_data,
+            "decision": plan[0],
+            "is_valid": not failed,
+            "policy_msg": " | ".join(failed) if failed else verdicts[0][1],
+            "acted": acted,
+            "device_msg": " | ".join(device_msgs),
+            "plan": plan,
+            "verdicts": verdicts,
+        }
+
+
+# ----------------------------------------------------------------------
+
+
+def steps_for_duration(duration: timedelta) -> int:
+    """Simüle edilecek süreyi adım sayısına çevirir (en az 1 adım)."""
+    return max(1, int(duration / STEP_DURATION))
+
+
+def run_headless(steps: int, stack: HomeStack | None = None) -> dict:
+    """
+    Döngüyü bekleme ve çizim olmadan `steps` adım boyunca çalıştırır.
+
+    Enerji, yığının EnergyMeter'ından okunur: her adımdan sonraki güç bir
+    sonraki okumaya kadar (son adımda step_duration boyunca) sabit kalır.
+    Sayaçsız (meter=False) yığınlarda energy_wh None'dır.
+
+    Returns:
+        dict: steps, elapsed_s, steps_per_sec, actions, blocks (sebep → sayı),
+              energy_wh
+    """
+    stack = stack or HomeStack()
+
+    actions = 0
+    blocks = Counter()
+    meter = stack.energy
+    energy_start = meter.total_wh if meter is not None else None
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        result = stack.step()
+        if result["acted"]:
+            actions += 1
+        elif not result["is_valid"]:
+            blocks[result["policy_msg"]] += 1
+    stack.settle_energy()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "steps": steps,
+        "elapsed_s": elapsed,
+        "steps_per_sec": steps / elapsed if elapsed > 0 else float("inf"),
+        "actions": actions,
+        "blocks": dict(blocks),
+        "energy_wh": meter.total_wh - energy_start if meter is not None else None,
+    }
+
+
+def format_summary(summary: dict) -> str:
+    """run_headless özetini terminal için metne çevirir."""
+    lines = [
+        "=== SHIA Headless Run Summary ===",
+        f"Steps          : {summary['steps']}",
+        f"Wall time      : {summary['elapsed_s']:.3f} s",
+        f"Steps/sec      : {summary['steps_per_sec']:.0f}",
+        f"Actions taken  : {summary['actions']}",
+        "Blocks by reason:",
+    ]
+    if summary["energy_wh"] is not None:
+        lines.insert(-1, f"Energy used    : {summary['energy_wh'] / 1000:.2f} kWh")
+    blocks = summary["blocks"]
+    if blocks:
+        for reason, count in sorted(blocks.items(), key=lambda kv: -kv[1]):
+            lines.append(f"  {count:>7}  {reason}")
+    else:
+        lines.append("  (none)")
+    return "\n".join(lines)
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+# Seed verilen koşuların sabit başlangıç zamanı: gün içi eğriler saate bağlı
+# olduğu için tekrar üretilebilirlik aynı başlangıç saatini de gerektirir.
+SEEDED_START_TIME = datetime(2025, 1, 1, 0, 0)
+
+
+def root_entropy(seed=None) -> int:
+    """
+    Kök seed'i (None ise işletim sisteminden rastgele) tek bir entropi
+    tamsayısına çevirir. Worker'lara sadece bu sayı gönderilir.
+    """
+    # NumPy sadece seed'li / filo koşularında yüklenir (hızlı açılış)
+    import numpy as np
+
+    return np.random.SeedSequence(seed).entropy
+
+
+def home_seed(entropy: int, home_id: int):
+    """
+    Bir evin bağımsız çocuk akışı. SeedSequence(entropy).spawn(n)[home_id]
+    ile aynıdır, fakat diğer evleri üretmeden doğrudan kurulabilir; böylece
+    sonuç, evlerin süreçlere nasıl bölündüğünden bağımsızdır.
+    """
+    import numpy as np
+
+    return np.random.SeedSequence(entropy, spawn_key=(home_id,))
+
+
+def spawn_seeds(seed, n: int) -> list:
+    """Kök seed'den n bağımsız çocuk SeedSequence üretir."""
+    import numpy as np
+
+    return np.random.SeedSequence(seed).spawn(n)
@@ -3,6 +3,67 @@ import math
 from datetime import datetime, timedelta
 
 
+def _seed_to_int(seed):
+    """numpy SeedSequence (veya generate_state sağlayan nesne) → int seed."""
+    if hasattr(seed, "generate_state"):
+        return int.from_bytes(seed.generate_state(4).tobytes(), "little")
+    return seed
+
+
+# --- Günlük eğriler ----------------------------------------------------
+# Saate bağlı, durumsuz eğriler; SensorSimulator ve BatchSensorSimulator
+# ikisi de bunları kullanır.
+
+
+def base_outdoor_temp(hour: int) -> float:
+    """
+    Gün içi dış ortam sıcaklık eğrisi (basit sinus eğrisi).
+    Min: gece 4–5 civarı, Max: öğlen 15–16 civarı.
+    """
+    # Ortalama sıcaklık ve genlik
+    mean = 20   # ortalama dış sıcaklık
+    amplitude = 6  # gün içi oynama
+
+    # 0–23 saatini 0–2π aralığına map et
+    # Faz kaydırma ile tepeyi 15:00 civarına getiriyoruz.
+    angle = 2 * math.pi * (hour - 15) / 24
+    return mean - amplitude * math.cos(angle)
+
+
+def humidity_trend(hour: int) -> float:
+    """Gece (22–7): nem biraz artma eğiliminde, gündüz azalma."""
+    if hour >= 22 or hour <= 7:
+        return 0.3
+    return -0.2
+
+
+def light_range(hour: int) -> tuple[int, int]:
+    """Saate göre taban ışık seviyesinin (min, max) aralığı."""
+    if 0 <= hour < 6:
+        return 0, 50
+    elif 6 <= hour < 10:
+        return 100, 500
+    elif 10 <= hour < 17:
+        return 500, 900
+    elif 17 <= hour < 21:
+        return 150, 400
+    else:  # 21–24
+        return 0, 80
+
+
+def occupancy_change_prob(hour: int) -> float:
+    """Saate göre occupancy durumunun bir adımda flip etme olasılığı."""
+    if 22 <= hour or hour < 7:
+        # Gece: genelde evde
+        return 0.05    # %5 ihtimalle değişsin
+    elif 9 <= hour < 17:
+        # Mesai/school saati: evde olmama olasılığı fazla
+        return 0.25
+    else:
+        # Ara saatler (sabah/akşam)
+        return 0.15
+
+
 class SensorSimulator:
     """
     SHIA için gerçekçi bir ortam sensör simülatörü.
@@ -15,7 +76,24 @@ class SensorSimulator:
         - time (datetime)
     """
 
-    def __init__(self, start_time: datetime | None = None):
+    def __init__(self, start_time: datetime | None = None, seed=None, rng=None,
+                 thermal=None, devices=None):
+        """
+        start_time: simülasyon başlangıç zamanı (verilmezse şu an)
+        seed: int ya da numpy SeedSequence; aynı seed aynı sensör akışını üretir
+        rng: hazır bir random.Random örneği (seed yerine)
+        thermal: ThermalModel; verilirse sıcaklık / ışık bu modelle ilerler
+        devices: DeviceRegistry; thermal ile birlikte verilirse aktif
+            ısıtıcı / klima / ışıkların gücü sensörlere geri beslenir
+            (kapalı çevrim)
+
+        Her simülatör kendi RNG akışını kullanır; global `random` modülüne
+        dokunmaz, böylece paralel simülasyonlar birbirini etkilemez.
+        """
+        self.rng = rng or random.Random(_seed_to_int(seed))
+        self.thermal = thermal
+        self.devices = devices
+
         # Başlangıç zamanı: verilmezse şu an
         self.data = {
             "time": start_time or datetime.now(),
@@ -32,37 +110,35 @@ class SensorSimulator:
         """Her adımda simülasyon zamanını 30 dakika ileri al."""
         self.data["time"] += timedelta(minutes=30)
 
-    def _base_outdoor_temp(self, hour: int) -> float:
-        """
-        Gün içi dış ortam sıcaklık eğrisi (basit sinus eğrisi).
-        Min: gece 4–5 civarı, Max: öğlen 15–16 civarı.
-        """
-        # Ortalama sıcaklık ve genlik
-        mean = 20   # ortalama dış sıcaklık
-        amplitude = 6  # gün içi oynama
-
-        # 0–23 saatini 0–2π aralığına map et
-        # Faz kaydırma ile tepeyi 15:00 civarına getiriyoruz.
-        angle = 2 * math.pi * (hour - 15) / 24
-        return mean - amplitude * math.cos(angle)
+    def _device_power(self) -> tuple:
+        """Kapalı çevrimde (ısıtma_W, soğutma_W, ışık_W); açık çevrimde sıfırlar."""
+        if self.devices is None:
+            return 0, 0, 0
+        return self.thermal.split_power(self.devices.power_by_type)
 
     def _simulate_temperature(self):
         """
         İç ortam sıcaklığını dış sıcaklığa göre yumuşak şekilde güncelle.
-        Bu modelde cihaz etkisini bilmiyoruz, sadece doğal akışı simüle ediyoruz.
+        thermal verilmemişse cihaz etkisi yoktur, sadece doğal akış simüle edilir;
+        verilmişse aktif ısıtıcı / klima ThermalModel üzerinden sıcaklığı değiştirir.
         """
         hour = self.data["time"].hour
-        outdoor = self._base_outdoor_temp(hour)
+        outdoor = base_outdoor_temp(hour)
 
         indoor = self.data["temperature"]
 
-        # İç ortam dış sıcaklığa yavaşça yaklaşsın (örneğin 0.1 oranında)
-        delta = (outdoor - indoor) * 0.1
+        if self.thermal is not None:
+            # Doğal akış + aktif ısıtıcı / klima etkisi
+            heat_w, cool_w, _ = self._device_power()
+            expected = self.thermal.temperature_step(indoor, outdoor, heat_w, cool_w)
+        else:
+            # İç ortam dış sıcaklığa yavaşça yaklaşsın (örneğin 0.1 oranında)
+            expected = indoor + (outdoor - indoor) * 0.1
 
         # Küçük rastgele oynama
-        noise = random.uniform(-0.9, 0.9)
+        noise = self.rng.uniform(-0.9, 0.9)
 
-        new_temp = indoor + delta + noise
+        new_temp = expected + noise
         self.data["temperature"] = round(new_temp, 1)
 
     def _simulate_humidity(self):
@@ -73,13 +149,8 @@ class SensorSimulator:
         hour = self.data["time"].hour
         humidity = self.data["humidity"]
 
-        # Gece (22–7): nem biraz artma eğiliminde
-        if hour >= 22 or hour <= 7:
-            trend = 0.3
-        else:
-            trend = -0.2
-
-        noise = random.uniform(-1, 1)
+        trend = humidity_trend(hour)
+        noise = self.rng.uniform(-1, 1)
 
         new_hum = humidity + trend + noise
         new_hum = max(10, min(90, new_hum))  # 30–70 aralığında tut
@@ -96,22 +167,17 @@ class SensorSimulator:
             - 21–23 : Gece (çok düşük)
         """
         hour = self.data["time"].hour
-
-        if 0 <= hour < 6:
-            base = random.randint(0, 50)
-        elif 6 <= hour < 10:
-            base = random.randint(100, 500)
-        elif 10 <= hour < 17:
-            base = random.randint(500, 900)
-        elif 17 <= hour < 21:
-            base = random.randint(150, 400)
-        else:  # 21–24
-            base = random.randint(0, 80)
+        low, high = light_range(hour)
+        base = self.rng.randint(low, high)
 
         # Küçük noise
-        noise = random.randint(-20, 20)
+        noise = self.rng.randint(-20, 20)
         light = max(0, base + noise)
 
+        # Kapalı çevrim: açık ışıklar ölçülen seviyeyi artırır
+        if self.thermal is not None:
+            light += round(self.thermal.light_gain(self._device_power()[2]))
+
         self.data["light_level"] = light
 
     def _simulate_occupancy(self):
@@ -124,17 +190,9 @@ class SensorSimulator:
         hour = self.data["time"].hour
         occ = self.data["occupancy"]
 
-        if 22 <= hour or hour < 7:
-            # Gece: genelde evde
-            change_prob = 0.05    # %5 ihtimalle değişsin
-        elif 9 <= hour < 17:
-            # Mesai/school saati: evde olmama olasılığı fazla
-            change_prob = 0.25
-        else:
-            # Ara saatler (sabah/akşam)
-            change_prob = 0.15
+        change_prob = occupancy_change_prob(hour)
 
-        if random.random() < change_prob:
+        if self.rng.random() < change_prob:
             occ = not occ
 
         self.data["occupancy"] = occ
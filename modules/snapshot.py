@@ -0,0 +1,130 @@
+import io
+import os
+import pickle
+import random
+import zlib
+
+from modules.decision_cache import DecisionCache
+from modules.sensors import _seed_to_int
+from modules.seeding import root_entropy, home_seed
+
+# ----------------------------------------------------------------------
+# Anlık görüntü (snapshot) biçimi: MAGIC + sürüm baytı + zlib(pickle)
+# ----------------------------------------------------------------------
+MAGIC = b"SHIA"
+SNAPSHOT_VERSION = 1
+
+# Yığına ait olmayan, paylaşılan nesneler; görüntüye yazılmaz, yüklerken
+# çağıranın verdiği nesneye (ya da None'a) bağlanır
+_SHARED_TYPES = (DecisionCache,)
+
+
+class _Pickler(pickle.Pickler):
+    """Paylaşılan nesneleri (önbellek) kopyalamak yerine referans olarak yazar."""
+
+    def __init__(self, file):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.shared = []
+
+    def persistent_id(self, obj):
+        if isinstance(obj, _SHARED_TYPES):
+            for i, known in enumerate(self.shared):
+                if known is obj:
+                    return i
+            self.shared.append(obj)
+            return len(self.shared) - 1
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file, shared):
+        super().__init__(file)
+        self.shared = shared
+
+    def persistent_load(self, pid):
+        return self.shared[pid] if pid < len(self.shared) else None
+
+
+def _pickle(stack) -> tuple[bytes, list]:
+    buffer = io.BytesIO()
+    pickler = _Pickler(buffer)
+    pickler.dump(stack)
+    return buffer.getvalue(), pickler.shared
+
+
+def _unpickle(payload: bytes, shared: list):
+    return _Unpickler(io.BytesIO(payload), shared).load()
+
+
+# ----------------------------------------------------------------------
+
+
+def dumps(stack, level: int = 6) -> bytes:
+    """
+    HomeStack'in (sensör verisi + RNG durumu, ajan belleği, policy
+    last_actions, cihaz tablosu, enerji sayacı) sıkıştırılmış ikili görüntüsü.
+
+    DecisionCache gibi paylaşılan nesneler görüntüye girmez; loads(cache=...)
+    ile yeniden bağlanır.
+    """
+    payload, _ = _pickle(stack)
+    return MAGIC + bytes([SNAPSHOT_VERSION]) + zlib.compress(payload, level)
+
+
+def loads(blob: bytes, cache: DecisionCache | None = None):
+    """
+    dumps() çıktısından yığını birebir geri kurar. Sadece kendi ürettiğiniz
+    görüntüleri yükleyin (pickle güvenilmeyen veri için uygun değildir).
+    """
+    if blob[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a SHIA snapshot.")
+    if len(blob) == len(MAGIC):
+        raise ValueError("Truncated or corrupt SHIA snapshot: missing version byte.")
+    version = blob[len(MAGIC)]
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"Unsupported snapshot version {version} (expected {SNAPSHOT_VERSION})."
+        )
+    try:
+        payload = zlib.decompress(blob[len(MAGIC) + 1:])
+        return _unpickle(payload, [cache] if cache is not None else [])
+    except (zlib.error, pickle.UnpicklingError, EOFError) as exc:
+        raise ValueError(f"Truncated or corrupt SHIA snapshot: {exc}") from None
+
+
+def save(stack, path: str, level: int = 6):
+    """
+    Görüntüyü diske yazar. Önce geçici dosyaya yazılıp yerine taşınır;
+    yazma sırasında çökme eski görüntüyü bozmaz.
+    """
+    blob = dumps(stack, level)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load(path: str, cache: DecisionCache | None = None):
+    with open(path, "rb") as f:
+        return loads(f.read(), cache)
+
+
+def fork(stack, n: int = 1, seed=None) -> list:
+    """
+    Isınmış bir yığından n bağımsız kopya (bellekte, sıkıştırmasız).
+
+    seed verilmezse kopyalar aynı RNG durumunu taşır ve orijinalle aynı
+    geleceği üretir. seed verilirse kopya i'nin sensör RNG'si
+    home_seed(seed, i) akışından yeniden kurulur; "bundan sonra ne olur"
+    dalları birbirinden ayrışır ama seed ile tekrar üretilebilir.
+    Paylaşılan önbellek tüm kopyalarda aynı nesne olarak kalır.
+    """
+    payload, shared = _pickle(stack)
+    branches = [_unpickle(payload, shared) for _ in range(n)]
+    if seed is not None:
+        entropy = root_entropy(seed)
+        for i, branch in enumerate(branches):
+            branch.sensors.rng = random.Random(_seed_to_int(home_seed(entropy, i)))
+    return branches
@@ -0,0 +1,299 @@
+import argparse
+import functools
+import hashlib
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+from modules.agent import SHIADecisionAgent
+from modules.policy_engine import POLICY_THRESHOLDS
+from modules.policy_manager import PolicyManager
+from modules.rules import DEFAULT_THRESHOLDS
+from modules.runner import HomeStack, steps_for_duration
+
+# Ev doluyken konforlu kabul edilen sıcaklık aralığı (°C)
+COMFORT_RANGE = (20, 24)
+
+# Agent eşikleri dışında taranabilen policy parametreleri
+POLICY_PARAMS = ("power_limit", *POLICY_THRESHOLDS)
+
+METRICS = ("energy_wh", "comfort_violations", "blocked", "switches")
+
+# Etkisi ancak cihazlar sensörleri değiştirince görünen parametreler: eşikler
+# cihaz kararlarını değiştirir, açık çevrimde sıcaklık / ışık bundan etkilenmez
+SENSOR_COUPLED_PARAMS = frozenset(DEFAULT_THRESHOLDS) | frozenset(POLICY_THRESHOLDS)
+
+# Koşu sonucunu belirleyen modüller; kaynakları değişince önbellek geçersizleşir
+MODEL_MODULES = (
+    "modules.agent", "modules.rules", "modules.memory",
+    "modules.policy_manager", "modules.policy_engine",
+    "modules.devices", "modules.device_registry",
+    "modules.sensors", "modules.thermal", "modules.energy",
+    "modules.runner", "modules.seeding", "modules.sweep",
+)
+
+
+@functools.cache
+def model_version() -> str:
+    """Kural / policy / fizik / döngü kodunun içerik özeti (SweepCache anahtarı için)."""
+    digest = hashlib.sha1()
+    for name in MODEL_MODULES:
+        __import__(name)
+        with open(sys.modules[name].__file__, "rb") as f:
+            digest.update(name.encode("utf-8") + b"\0" + f.read())
+    return digest.hexdigest()[:16]
+
+
+def expand_grid(grid: dict) -> list[dict]:
+    """{"heater_temp": [18, 19], "power_limit": [3000]} → konfigürasyon listesi."""
+    unknown = set(grid) - set(DEFAULT_THRESHOLDS) - set(POLICY_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def default_closed_loop(grid: dict) -> bool:
+    """Izgara eşik tarıyorsa kapalı çevrim; sadece power_limit ise açık çevrim."""
+    return bool(SENSOR_COUPLED_PARAMS & set(grid))
+
+
+def run_config(config: dict, seed: int, steps: int, max_violations: int | None = None,
+               closed_loop: bool = False) -> dict:
+    """
+    Bir konfigürasyonu tek bir seed ile çalıştırır.
+
+    max_violations verilirse konfor ihlali bu sayıyı aşınca koşu erken
+    durdurulur (stopped_early=True).
+    closed_loop: cihazlar sıcaklığı ThermalModel ile etkiler; konfor
+    metrikleri ancak bu modda kontrolün kalitesini ölçer.
+    """
+    thresholds = {k: v for k, v in config.items() if k in DEFAULT_THRESHOLDS}
+    policy = PolicyManager(
+        thresholds={k: v for k, v in config.items() if k in POLICY_THRESHOLDS}
+    )
+    if "power_limit" in config:
+        policy.power_limit = config["power_limit"]
+    stack = HomeStack(
+        agent=SHIADecisionAgent(thresholds=thresholds), policy=policy, seed=seed,
+        thermal=closed_loop,
+    )
+
+    low, high = COMFORT_RANGE
+    devices = stack.devices.devices
+    metrics = dict.fromkeys(METRICS, 0)
+    stopped_early = False
+
+    steps_run = 0
+    for _ in range(steps):
+        before = [dev["state"] for dev in devices.values()]
+        result = stack.step()
+        steps_run += 1
+
+        sensor_data = result["sensor_data"]
+        if sensor_data["occupancy"] and not low <= sensor_data["temperature"] <= high:
+            metrics["comfort_violations"] += 1
+        if not result["is_valid"]:
+            metrics["blocked"] += 1
+        metrics["switches"] += sum(
+            b != dev["state"] for b, dev in zip(before, devices.values())
+        )
+
+        if max_violations is not None and metrics["comfort_violations"] > max_violations:
+            stopped_early = True
+            break
+
+    stack.settle_energy()
+    metrics["energy_wh"] = stack.energy.total_wh
+    return {**metrics, "steps_run": steps_run, "stopped_early": stopped_early}
+
+
+# ----------------------------------------------------------------------
+
+
+class SweepCache:
+    """
+    (model sürümü, konfigürasyon, seed, adım, erken durdurma) → koşu sonucu;
+    JSON dosyasında kalıcı. Kural, policy, termal model veya döngü kodu
+    değişince model_version() değişir ve eski sonuçlar kullanılmaz.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self._entries = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+
+    @staticmethod
+    def key(config: dict, seed: int, steps: int, max_violations, closed_loop: bool = False) -> str:
+        entry = {
+            "model": model_version(),
+            "config": config, "seed": seed, "steps": steps, "max_violations": max_violations,
+            "closed_loop": closed_loop,
+        }
+        payload = json.dumps(entry, sort_keys=True)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        return self._entries.get(key)
+
+    def put(self, key: str, result: dict):
+        self._entries[key] = result
+
+    def save(self):
+        if self.path:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+
+
+def run_sweep(
+    grid: dict,
+    seeds: int = 4,
+    steps: int = 48 * 7,
+    workers: int | None = None,
+    max_violations: int | None = None,
+    cache_path: str | None = None,
+    closed_loop: bool | None = None,
+) -> list[dict]:
+    """
+    Parametre ızgarasındaki her konfigürasyonu `seeds` seed ile çalıştırır.
+
+    - Koşular seed dalgaları halinde ProcessPoolExecutor'a dağıtılır.
+    - Early stopping: bir koşu max_violations'ı aşınca durur ve o
+      konfigürasyonun kalan seed'leri çalıştırılmaz (pruned).
+    - Daha önce çalıştırılmış (config, seed, steps) koşuları önbellekten gelir.
+    - closed_loop=None: ızgarada karar / policy eşiği varsa kapalı çevrim
+      (default_closed_loop); açık çevrimde eşiklerin konfor ve enerji
+      üzerindeki etkisi sensörlere yansımaz.
+
+    Erken durdurulan koşular daha kısa olduğu için metrikler adım başına
+    normalize edilip tam ufka (steps) ölçeklenerek ortalanır; tam koşularda
+    bu düz ortalamayla aynıdır.
+
+    Returns:
+        Konfigürasyon başına satır: parametreler + metrik ortalamaları,
+        runs, cached, pruned
+    """
+    configs = expand_grid(grid)
+    if closed_loop is None:
+        closed_loop = default_closed_loop(grid)
+    cache = SweepCache(cache_path)
+    runs = {i: [] for i in range(len(configs))}
+    cached = {i: 0 for i in range(len(configs))}
+    pruned = set()
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+    try:
+        for seed in range(seeds):
+            pending = []
+            for i, config in enumerate(configs):
+                if i in pruned:
+                    continue
+                key = SweepCache.key(config, seed, steps, max_violations, closed_loop)
+                hit = cache.get(key)
+                if hit is not None:
+                    runs[i].append(hit)
+                    cached[i] += 1
+                elif pool is None:
+                    result = run_config(config, seed, steps, max_violations, closed_loop)
+                    pending.append((i, key, result))
+                else:
+                    future = pool.submit(
+                        run_config, config, seed, steps, max_violations, closed_loop
+                    )
+                    pending.append((i, key, future))
+
+            for i, key, outcome in pending:
+                result = outcome if pool is None else outcome.result()
+                cache.put(key, result)
+                runs[i].append(result)
+
+            for i in runs:
+                if any(r["stopped_early"] for r in runs[i]):
+                    pruned.add(i)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        cache.save()
+
+    table = []
+    for i, config in enumerate(configs):
+        results = runs[i]
+        row = dict(config)
+        for metric in METRICS:
+            row[metric] = sum(
+                r[metric] * steps / r["steps_run"] for r in results
+            ) / len(results)
+        row["runs"] = len(results)
+        row["cached"] = cached[i]
+        row["pruned"] = i in pruned
+        table.append(row)
+    return table
+
+
+def format_table(table: list[dict]) -> str:
+    """run_sweep sonucunu sabit genişlikli metin tablosuna çevirir."""
+    if not table:
+        return "(empty sweep)"
+    columns = list(table[0])
+    widths = {
+        c: max(len(c), *(len(_fmt(row[c])) for row in table)) for c in columns
+    }
+    lines = ["  ".join(c.rjust(widths[c]) for c in columns)]
+    for row in table:
+        lines.append("  ".join(_fmt(row[c]).rjust(widths[c]) for c in columns))
+    return "\n".join(lines)
+
+
+def _fmt(value) -> str:
+    return f"{value:.1f}" if isinstance(value, float) else str(value)
+
+
+def _parse_grid(items: list[str]) -> dict:
+    """["heater_temp=18,19", "power_limit=3000"] → {"heater_temp": [18, 19], ...}"""
+    grid = {}
+    for item in items:
+        name, _, values = item.partition("=")
+        grid[name] = [float(v) if "." in v else int(v) for v in values.split(",")]
+    return grid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel SHIA threshold / policy sweep.")
+    parser.add_argument("--grid", action="append", required=True,
+                        help="name=v1,v2,... (repeatable), e.g. heater_temp=18,19,20")
+    parser.add_argument("--seeds", type=int, default=4)
+    parser.add_argument("--days", type=float, default=7)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--max-violations", type=int,
+                        help="Stop a run (and prune its config) past this many comfort violations.")
+    parser.add_argument("--closed-loop", action=argparse.BooleanOptionalAction,
+                        help="Simulate device effects on temperature/light (ThermalModel). "
+                             "Default: on when the grid sweeps thresholds.")
+    parser.add_argument("--cache", default=os.path.join("data", "sweep_cache.json"))
+    args = parser.parse_args(argv)
+
+    grid = _parse_grid(args.grid)
+    closed_loop = default_closed_loop(grid) if args.closed_loop is None else args.closed_loop
+    if not closed_loop and SENSOR_COUPLED_PARAMS & set(grid):
+        print("Warning: open-loop sweep; swept thresholds do not affect simulated "
+              "temperature/light, so comfort metrics cannot reflect them.")
+    table = run_sweep(
+        grid,
+        seeds=args.seeds,
+        steps=steps_for_duration(timedelta(days=args.days)),
+        workers=args.workers,
+        max_violations=args.max_violations,
+        cache_path=args.cache,
+        closed_loop=closed_loop,
+    )
+    print(f"Mode: {'closed' if closed_loop else 'open'}-loop")
+    print(format_table(table))
+
+
+if __name__ == "__main__":
+    main()
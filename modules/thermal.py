@@ -0,0 +1,59 @@
+# ----------------------------------------------------------------------
+# Kapalı çevrim fizik modeli: aktif cihazların sensörlere etkisi
+# ----------------------------------------------------------------------
+DEFAULT_THERMAL_PARAMS = {
+    "envelope_loss": 0.1,     # adım başına dış sıcaklığa yaklaşma oranı
+    "heat_per_kw": 0.8,       # ısıtıcı (ve ışık atık ısısı): °C / kW / adım
+    "cool_per_kw": 0.8,       # klima: °C / kW / adım
+    "lumen_per_watt": 5.0,    # aydınlatma: sensörde ölçülen lümen / W
+}
+
+# Hangi cihaz türünün gücü hangi etkiye gider
+HEAT_TYPES = ("heater", "light")
+COOL_TYPES = ("ac",)
+LIGHT_TYPES = ("light",)
+
+
+class ThermalModel:
+    """
+    Basit birinci dereceden (RC) ev modeli, adım başına:
+
+        T' = T + (T_dış - T) * envelope_loss
+               + heat_per_kw * ısıtma_kW - cool_per_kw * soğutma_kW
+        L' = L_doğal + lumen_per_watt * ışık_W
+
+    Formüller hem float hem NumPy dizileriyle çalışır; SensorSimulator tek
+    ev için, BatchSensorSimulator N ev için aynı modeli kullanır.
+    Cihaz etkisi yokken (güçler 0) envelope_loss=0.1 açık çevrim
+    simülasyonuyla aynı doğal akışı verir.
+    """
+
+    def __init__(self, **params):
+        unknown = set(params) - set(DEFAULT_THERMAL_PARAMS)
+        if unknown:
+            raise ValueError(f"Unknown thermal parameters: {sorted(unknown)}")
+        self.params = {**DEFAULT_THERMAL_PARAMS, **params}
+        self.envelope_loss = self.params["envelope_loss"]
+        self.heat_per_kw = self.params["heat_per_kw"]
+        self.cool_per_kw = self.params["cool_per_kw"]
+        self.lumen_per_watt = self.params["lumen_per_watt"]
+
+    @staticmethod
+    def split_power(power_by_type: dict):
+        """{tür: W} (skaler ya da dizi) → (ısıtma_W, soğutma_W, ışık_W)"""
+        def total(types):
+            return sum(power_by_type.get(t, 0) for t in types)
+
+        return total(HEAT_TYPES), total(COOL_TYPES), total(LIGHT_TYPES)
+
+    def temperature_step(self, indoor, outdoor, heat_w=0, cool_w=0):
+        """Gürültüsüz bir adım sonraki iç sıcaklık."""
+        return (
+            indoor
+            + (outdoor - indoor) * self.envelope_loss
+            + (self.heat_per_kw * heat_w - self.cool_per_kw * cool_w) / 1000
+        )
+
+    def light_gain(self, light_w):
+        """Açık ışıkların sensöre eklediği lümen."""
+        return self.lumen_per_watt * light_w
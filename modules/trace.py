@@ -0,0 +1,188 @@
+import json
+import os
+import struct
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Dosya başlığı: MAGIC + uint32 başlık uzunluğu + JSON başlık (64 bayta hizalı)
+MAGIC = b"SHIATRC1"
+_HEADER_ALIGN = 64
+_EPOCH = datetime(1970, 1, 1)
+
+DEFAULT_LOCK_DEVICES = ("heater_main", "ac_main", "lights_living", "smart_lock")
+
+# Sabit genişlikli kayıt (27 bayt, hizasız)
+TRACE_DTYPE = np.dtype([
+    ("time", "<i8"),          # epoch'tan beri mikro saniye (naive datetime)
+    ("temperature", "<f8"),
+    ("humidity", "<i2"),
+    ("light_level", "<i4"),
+    ("occupancy", "u1"),
+    ("locks", "<u4"),         # bit i = lock_devices[i] manuel kilitli mi
+])
+
+
+def _to_micros(ts: datetime) -> int:
+    return (ts - _EPOCH) // timedelta(microseconds=1)
+
+
+class TraceRecorder:
+    """
+    Sensör akışını sabit genişlikli binary kayıtlar olarak dosyaya yazar.
+
+    Kayıtlar önceden ayrılmış bir NumPy tamponunda birikir ve tampon
+    dolunca tek bir write() ile diske gider.
+    """
+
+    def __init__(self, path: str, lock_devices=DEFAULT_LOCK_DEVICES, buffer_size: int = 4096):
+        if len(lock_devices) > 32:
+            raise ValueError("At most 32 lockable devices can be recorded.")
+        self.path = path
+        self.lock_devices = tuple(lock_devices)
+        self._lock_bits = {dev: 1 << i for i, dev in enumerate(self.lock_devices)}
+        self._buffer = np.zeros(buffer_size, dtype=TRACE_DTYPE)
+        self._used = 0
+        self.count = 0
+
+        header = json.dumps({
+            "version": 1,
+            "lock_devices": list(self.lock_devices),
+            "dtype": TRACE_DTYPE.descr,
+        }).encode("utf-8")
+        prefix = len(MAGIC) + 4
+        padded = -(-(prefix + len(header)) // _HEADER_ALIGN) * _HEADER_ALIGN
+        header = header.ljust(padded - prefix, b" ")
+
+        self._file = open(path, "wb")
+        self._file.write(MAGIC + struct.pack("<I", len(header)) + header)
+
+    # ------------------------------------------------------------------
+
+    def record(self, sensor_data: dict):
+        """
+        SensorSimulator.update() çıktısını (opsiyonel manual_locks ile) kaydeder.
+        Başlıkta olmayan bir cihazın kilidi kaydedilemez: ValueError.
+        """
+        locks = 0
+        for dev, locked in (sensor_data.get("manual_locks") or {}).items():
+            bit = self._lock_bits.get(dev)
+            if bit is None:
+                raise ValueError(
+                    f"Device '{dev}' is not in the trace's lock_devices {list(self.lock_devices)}."
+                )
+            if locked:
+                locks |= bit
+
+        self._buffer[self._used] = (
+            _to_micros(sensor_data["time"]),
+            sensor_data["temperature"],
+            sensor_data["humidity"],
+            sensor_data["light_level"],
+            sensor_data["occupancy"],
+            locks,
+        )
+        self._used += 1
+        self.count += 1
+        if self._used == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        if self._used:
+            self._file.write(self._buffer[:self._used].tobytes())
+            self._used = 0
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TraceReplay:
+    """
+    TraceRecorder dosyasını memory-map ederek ayrıştırma yapmadan okur.
+
+    - chunks(n): yapılandırılmış NumPy dilimleri (kopyasız view)
+    - __iter__: SensorSimulator.data formatında sözlükler
+    - update(): sıradaki adımı döner; SensorSimulator yerine HomeStack'e
+      verilerek kaydedilmiş bir akış agent/policy üzerinde tekrar koşturulur
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"'{path}' is not a SHIA sensor trace.")
+            (header_len,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(header_len))
+
+        self.path = path
+        self.lock_devices = tuple(header["lock_devices"])
+        offset = len(MAGIC) + 4 + header_len
+
+        dtype = np.dtype([tuple(field) for field in header["dtype"]])
+        if dtype != TRACE_DTYPE:
+            raise ValueError(f"Unsupported trace record layout in '{path}'.")
+
+        n_bytes = os.path.getsize(path) - offset
+        n_records = n_bytes // TRACE_DTYPE.itemsize
+        if n_records:
+            self.records = np.memmap(
+                path, dtype=TRACE_DTYPE, mode="r", offset=offset, shape=(n_records,)
+            )
+        else:
+            self.records = np.zeros(0, dtype=TRACE_DTYPE)
+        self._stream = None
+        self.data = None
+
+    def __len__(self):
+        return len(self.records)
+
+    # ------------------------------------------------------------------
+
+    def chunks(self, size: int = 65536):
+        """Kayıtları `size` uzunluğunda yapılandırılmış dizi dilimleri olarak verir."""
+        for start in range(0, len(self.records), size):
+            yield self.records[start:start + size]
+
+    def times(self, chunk) -> np.ndarray:
+        """Bir dilimin zaman kolonunu datetime64[us] olarak verir."""
+        return chunk["time"].astype("datetime64[us]")
+
+    def __iter__(self):
+        lock_devices = self.lock_devices
+        for chunk in self.chunks():
+            columns = zip(
+                chunk["time"].tolist(),
+                chunk["temperature"].tolist(),
+                chunk["humidity"].tolist(),
+                chunk["light_level"].tolist(),
+                chunk["occupancy"].tolist(),
+                chunk["locks"].tolist(),
+            )
+            for micros, temp, hum, light, occ, locks in columns:
+                yield {
+                    "time": _EPOCH + timedelta(microseconds=micros),
+                    "temperature": temp,
+                    "humidity": hum,
+                    "light_level": light,
+                    "occupancy": bool(occ),
+                    "manual_locks": {
+                        dev: bool(locks >> i & 1) for i, dev in enumerate(lock_devices)
+                    },
+                }
+
+    def update(self) -> dict:
+        """SensorSimulator.update() ile aynı arayüz; akış bitince EOFError."""
+        if self._stream is None:
+            self._stream = iter(self)
+        try:
+            self.data = next(self._stream)
+        except StopIteration:
+            raise EOFError("Sensor trace exhausted.") from None
+        return self.data
@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+import pytest
+
+from modules.api_server import ApiServer
+from modules.async_runtime import AsyncRuntime
+
+
+async def _request(reader, writer, method, path, body=None):
+    payload = json.dumps(body).encode() if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(payload)}\r\n\r\n".encode()
+        + payload
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) != b"\r\n":
+        name, _, value = line.decode().partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status, json.loads(await reader.readexactly(int(headers["content-length"])))
+
+
+def test_handler_error_is_a_json_500_and_close_does_not_hang():
+    async def scenario():
+        server = ApiServer(AsyncRuntime(), port=0)
+        server._routes[("GET", "/stats")] = lambda body: 1 / 0
+        await server.start()
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+
+        status, payload = await _request(reader, writer, "GET", "/stats")
+        # Bağlantı keep-alive ile açık kalır; close() onu beklememeli
+        ok_status, _ = await _request(reader, writer, "GET", "/locks")
+        await asyncio.wait_for(server.close(), timeout=2)
+        writer.close()
+        return status, payload, ok_status
+
+    status, payload, ok_status = asyncio.run(scenario())
+    assert status == 500
+    assert "ZeroDivisionError" in payload["error"]
+    assert ok_status == 200
+
+
+def _post_commands(body):
+    async def scenario():
+        runtime = AsyncRuntime()
+        server = ApiServer(runtime, port=0)
+        await server.start()
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        response = await _request(reader, writer, "POST", "/devices/commands", body)
+        await server.close()
+        writer.close()
+        return runtime, response
+
+    return asyncio.run(scenario())
+
+
+def test_atomic_commands_skip_idle_and_lock_the_commanded_device():
+    runtime, (status, payload) = _post_commands({
+        "commands": [{"device_id": "none", "action": "IDLE"},
+                     {"device_id": "heater_main", "action": "ON"}],
+        "atomic": True,
+    })
+    assert status == 200 and payload["ok"]
+    assert [(r["device_id"], r["success"]) for r in payload["results"]] == [("heater_main", True)]
+    assert runtime.manual_locks == {"heater_main": True}
+    assert runtime.devices.get_status()["heater_main"]["state"] == "ON"
+
+
+@pytest.mark.parametrize("command", [
+    {"device_id": ["a"], "action": "ON"},
+    {"device_id": "heater_main", "action": 1},
+    {"device_id": "garage", "action": "ON"},
+    {"device_id": "smart_lock", "action": "ON"},
+])
+def test_malformed_commands_are_rejected(command):
+    runtime, (status, payload) = _post_commands([command])
+    assert status == 400
+    assert "error" in payload
+    assert runtime.manual_locks == {}
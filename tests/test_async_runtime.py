@@ -0,0 +1,67 @@
+import asyncio
+
+from modules.async_runtime import AsyncDeviceAdapter, AsyncRuntime, AsyncSensorAdapter
+from modules.devices import DeviceManager
+from modules.sensors import SensorSimulator
+from modules.seeding import SEEDED_START_TIME
+
+FAST_RATES = {"occupancy": 0.002, "light_level": 0.002, "temperature": 0.002, "humidity": 0.002}
+
+
+def _runtime(device_latency=0.0):
+    return AsyncRuntime(
+        sensors=AsyncSensorAdapter(SensorSimulator(start_time=SEEDED_START_TIME, seed=1), env_period=0.01),
+        devices=AsyncDeviceAdapter(DeviceManager(), latency=device_latency),
+        sensor_rates=FAST_RATES,
+    )
+
+
+def test_one_decision_per_environment_step():
+    runtime = _runtime()
+    decided = []
+    runtime.on_event = lambda e: e["type"] == "decision" and decided.append(e["sensor_data"]["time"])
+    asyncio.run(runtime.run(0.3))
+
+    env_steps = int((runtime.sensors.simulator.data["time"] - SEEDED_START_TIME).total_seconds() // 1800)
+    assert decided
+    assert len(decided) == len(set(decided))  # aynı adımda ikinci karar yok
+    assert len(decided) <= env_steps
+
+
+def test_in_flight_commands_do_not_touch_policy_state():
+    runtime = _runtime(device_latency=10.0)  # komutlar koşu boyunca uçuşta kalır
+    recorded = []
+    validate = runtime.policy.validate_action
+
+    def spy(decision, *args, **kwargs):
+        result = validate(decision, *args, **kwargs)
+        recorded.append((decision["device_id"], result[0]))
+        return result
+
+    runtime.policy.validate_action = spy
+    asyncio.run(runtime.run(0.3))
+
+    dispatched = [dev for dev, ok in recorded if ok and dev != "none"]
+    # Her cihaz için en fazla bir komut gönderildi; sonrakiler policy'ye hiç gitmedi
+    assert len(dispatched) == len(set(dispatched))
+    assert runtime.stats["commands"] == 0
+    if dispatched:
+        assert runtime.stats["skipped"] > 0
+
+
+def test_manual_command_cancels_in_flight_ai_command():
+    runtime = _runtime(device_latency=0.05)
+
+    async def scenario():
+        runtime._in_flight["heater_main"] = asyncio.create_task(
+            runtime._command("heater_main", "ON")
+        )
+        ok, _ = runtime.apply_manual([{"device_id": "heater_main", "action": "OFF"}])
+        await asyncio.sleep(0.1)
+        return ok
+
+    assert asyncio.run(scenario())
+    assert runtime.devices.get_status()["heater_main"]["state"] == "OFF"
+    assert runtime.manual_locks == {"heater_main": True}
+    assert runtime.stats["cancelled"] == 1
+    assert runtime._in_flight == {}
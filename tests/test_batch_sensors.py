@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from modules.batch_sensors import BatchSensorSimulator
+from modules.seeding import SEEDED_START_TIME
+from modules.sensors import (
+    SensorSimulator,
+    base_outdoor_temp,
+    humidity_trend,
+    light_range,
+    occupancy_change_prob,
+)
+
+DAYS = 200
+STEPS = 48 * DAYS
+
+
+def _scalar_run(seed: int) -> dict:
+    sim = SensorSimulator(start_time=SEEDED_START_TIME, seed=seed)
+    rows = [dict(sim.update()) for _ in range(STEPS)]
+    return {
+        key: np.array([row[key] for row in rows]) if key != "time" else [row["time"] for row in rows]
+        for key in rows[0]
+    }
+
+
+def _batch_run(seed: int) -> dict:
+    batch = BatchSensorSimulator(1, start_time=SEEDED_START_TIME, seed=seed)
+    out = batch.run(STEPS)
+    return {key: value if key == "time" else value[:, 0] for key, value in out.items()}
+
+
+@pytest.fixture(scope="module")
+def runs():
+    return _scalar_run(7), _batch_run(7)
+
+
+def test_batch_curve_tables_match_scalar_curves():
+    batch = BatchSensorSimulator(1, start_time=SEEDED_START_TIME)
+    for hour in range(24):
+        assert batch._outdoor[hour] == base_outdoor_temp(hour)
+        assert batch._humidity_trend[hour] == humidity_trend(hour)
+        assert (batch._light_low[hour], batch._light_high[hour]) == light_range(hour)
+        assert batch._occupancy_prob[hour] == occupancy_change_prob(hour)
+
+
+def test_single_home_batch_matches_scalar_statistics(runs):
+    scalar, batch = runs
+    assert batch["time"] == scalar["time"]
+    hours = np.array([ts.hour for ts in scalar["time"]])
+
+    for hour in range(24):
+        at_hour = hours == hour
+        low, high = light_range(hour)
+        expected = (low + high) / 2
+        # Gece aralıklarında max(0, ...) kırpması ortalamayı biraz yukarı iter
+        for run in (scalar, batch):
+            assert abs(run["light_level"][at_hour].mean() - expected) < 25
+        assert abs(scalar["light_level"][at_hour].mean() - batch["light_level"][at_hour].mean()) < 25
+
+        assert abs(scalar["temperature"][at_hour].mean() - batch["temperature"][at_hour].mean()) < 0.5
+
+    # Flip olasılığı aynı olan saatler birlikte ölçülür
+    flip_prob = np.array([occupancy_change_prob(hour) for hour in hours[1:]])
+    for run in (scalar, batch):
+        assert abs(run["temperature"].mean() - np.mean([base_outdoor_temp(h) for h in hours])) < 0.5
+        flipped = run["occupancy"][1:] != run["occupancy"][:-1]
+        for prob in np.unique(flip_prob):
+            assert abs(flipped[flip_prob == prob].mean() - prob) < 0.03
+        assert run["humidity"].min() >= 10
+        assert run["humidity"].max() <= 90
+        assert run["light_level"].min() >= 0
@@ -0,0 +1,102 @@
+import io
+import os
+
+import pytest
+from colorama import Fore, Style
+
+import dashboard
+from dashboard import TerminalRenderer, _ANSI_ESCAPE
+
+WIDTH = 40
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(dashboard.time, "monotonic", clock)
+    # Kareler satır listesi olarak verilir: render(lines=[...])
+    monkeypatch.setattr(dashboard, "build_dashboard_lines", lambda lines: lines)
+    monkeypatch.setattr(
+        dashboard.shutil, "get_terminal_size", lambda: os.terminal_size((WIDTH, 24))
+    )
+    return clock
+
+
+def _renderer(max_fps=0.0):
+    stream = io.StringIO()
+    return TerminalRenderer(max_fps=max_fps, stream=stream), stream
+
+
+def _take(stream: io.StringIO) -> str:
+    text = stream.getvalue()
+    stream.seek(0)
+    stream.truncate()
+    return text
+
+
+def test_redraws_only_changed_lines(clock):
+    renderer, stream = _renderer()
+
+    assert renderer.render(lines=["title", "temp 21.5", "hum 40"])
+    assert _take(stream) == "\x1b[?25l\x1b[2J\x1b[H" + "title\ntemp 21.5\nhum 40"
+
+    # Aynı içerik: hiçbir şey yazılmaz
+    assert not renderer.render(lines=["title", "temp 21.5", "hum 40"])
+    assert _take(stream) == ""
+
+    # Sadece 2. satır, değişimin başladığı sütundan itibaren yazılır
+    assert renderer.render(lines=["title", "temp 22.0", "hum 40"])
+    assert _take(stream) == "\x1b[2;7H2.0\x1b[K"
+
+    # Renkli satırlar baştan yazılır; kısalan kare eski satırları temizler
+    colored = Fore.CYAN + "title" + Style.RESET_ALL
+    assert renderer.render(lines=[colored, "temp 22.0"])
+    assert _take(stream) == f"\x1b[1;1H{colored}\x1b[K" + "\x1b[3;1H\x1b[J"
+
+
+def test_frame_rate_cap_skips_and_flushes_latest(clock):
+    renderer, stream = _renderer(max_fps=2.0)  # en fazla 0.5 s'de bir kare
+
+    assert renderer.render(lines=["step 1"])
+    _take(stream)
+
+    clock.now += 0.2
+    assert not renderer.render(lines=["step 2"])
+    clock.now += 0.1
+    assert not renderer.render(lines=["step 3"])
+    assert _take(stream) == ""
+
+    # Aralık dolunca en son içerik çizilir; atlanan kareler çizilmez
+    clock.now += 0.3
+    assert renderer.render(lines=["step 4"])
+    assert _take(stream) == "\x1b[1;6H4\x1b[K"
+
+    clock.now += 0.1
+    assert not renderer.render(lines=["step 5"])
+    assert renderer.flush()
+    assert _take(stream) == "\x1b[1;6H5\x1b[K"
+    assert not renderer.flush()
+
+
+def test_fit_measures_visible_width():
+    colored = Fore.GREEN + "x" * 30 + Style.RESET_ALL
+    # Görünür 30 < 40: kodlarıyla birlikte uzun olsa da kırpılmaz
+    assert len(colored) > 30
+    assert TerminalRenderer._fit(colored, WIDTH) == colored
+
+    long_colored = Fore.GREEN + "x" * 30 + Style.RESET_ALL + "y" * 30
+    fitted = TerminalRenderer._fit(long_colored, WIDTH)
+    assert _ANSI_ESCAPE.sub("", fitted) == "x" * 30 + "y" * 9
+    assert fitted.startswith(Fore.GREEN)
+    assert fitted.endswith(Style.RESET_ALL)
+
+    assert TerminalRenderer._fit("z" * 50, WIDTH) == "z" * 39
+    assert TerminalRenderer._fit("short", WIDTH) == "short"
@@ -0,0 +1,58 @@
+import pytest
+
+from modules.devices import DeviceManager
+
+
+def test_state_write_updates_running_totals():
+    devices = DeviceManager().devices
+    devices["heater_main"]["state"] = "ON"
+    assert devices.active_power == devices["heater_main"]["power_usage"]
+    assert devices.ids(state="ON") == {"heater_main"}
+    devices.verify()
+
+
+@pytest.mark.parametrize("field", ["type", "room", "power_usage"])
+def test_indexed_fields_are_read_only(field):
+    record = DeviceManager().devices["heater_main"]
+    with pytest.raises(TypeError):
+        record[field] = "changed"
+
+
+def test_unknown_field_is_a_key_error():
+    record = DeviceManager().devices["heater_main"]
+    with pytest.raises(KeyError):
+        record["colour"] = "red"
+
+
+@pytest.mark.parametrize("field, value", [
+    ("power_usage", 5000), ("type", "ac"), ("room", "garage"), ("device_id", "other"),
+])
+def test_indexed_attributes_are_read_only(field, value):
+    devices = DeviceManager().devices
+    record = devices["heater_main"]
+    record.state = "ON"
+    with pytest.raises(TypeError):
+        setattr(record, field, value)
+    assert devices.ids(type="heater") == {"heater_main"}
+    assert devices.verify()
+
+
+def test_record_cannot_join_a_second_registry():
+    first = DeviceManager().devices
+    second = DeviceManager().devices
+    record = first["heater_main"]
+    with pytest.raises(ValueError):
+        second["heater_copy"] = record
+
+    second["heater_copy"] = record.to_dict()
+    first["heater_main"].state = "ON"
+    assert second["heater_copy"].state == "OFF"
+    assert first.verify() and second.verify()
+
+
+def test_reindex_keeps_records():
+    devices = DeviceManager().devices
+    devices["ac_main"].state = "ON"
+    devices.reindex()
+    assert devices.active_power == devices["ac_main"].power_usage
+    assert devices.verify()
@@ -0,0 +1,68 @@
+import pytest
+
+from modules.devices import DeviceManager
+
+
+def _snapshot(manager: DeviceManager) -> dict:
+    return {dev_id: record.to_dict() for dev_id, record in manager.devices.items()}
+
+
+@pytest.mark.parametrize("bad_command", [
+    {"device_id": "smart_lock", "action": "ON"},       # kilit için geçersiz
+    {"device_id": "garage_door", "action": "ON"},      # bilinmeyen cihaz
+    {"device_id": "heater_main", "action": "OFF"},     # aynı cihaza ikinci komut
+])
+def test_apply_plan_is_all_or_nothing(bad_command):
+    manager = DeviceManager(check_consistency=True)
+    before = _snapshot(manager)
+    plan = [
+        {"device_id": "heater_main", "action": "ON"},
+        {"device_id": "lights_living", "action": "ON"},
+        bad_command,
+    ]
+
+    ok, errors = manager.apply_plan(plan)
+
+    assert not ok
+    assert len(errors) == 1
+    assert _snapshot(manager) == before
+    assert manager.get_energy_usage() == 0
+    assert manager.verify_power_totals()
+
+
+def test_apply_plan_applies_every_command():
+    manager = DeviceManager(check_consistency=True)
+    ok, messages = manager.apply_plan([
+        {"device_id": "none", "action": "IDLE"},
+        {"device_id": "heater_main", "action": "ON"},
+        {"device_id": "smart_lock", "action": "UNLOCKED"},
+    ])
+
+    assert ok
+    assert len(messages) == 2
+    assert manager.devices["heater_main"]["state"] == "ON"
+    assert manager.devices["smart_lock"]["state"] == "UNLOCKED"
+    assert manager.get_energy_usage() == 1800
+
+
+def test_check_consistency_catches_desync():
+    manager = DeviceManager(check_consistency=True)
+    manager.update_device("heater_main", "ON")
+    # Koşan toplam kayıtlardan kopuyor (örn. indekslenmeyen bir yazma)
+    manager.devices.active_power += 500
+
+    with pytest.raises(RuntimeError, match="out of sync"):
+        manager.update_device("lights_living", "ON")
+
+    manager._recompute_power()
+    assert manager.get_energy_usage() == 1860
+    assert manager.update_device("lights_living", "OFF")[0]
+
+
+def test_desync_goes_unnoticed_without_check_consistency():
+    manager = DeviceManager()
+    manager.devices.power_by_room["main"] = 42
+
+    assert manager.update_device("heater_main", "ON")[0]
+    with pytest.raises(RuntimeError):
+        manager.verify_power_totals()
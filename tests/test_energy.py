@@ -0,0 +1,111 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from modules.devices import DeviceManager
+from modules.energy import EnergyMeter, FleetEnergyMeter
+from modules.fleet import run_fleet
+from modules.runner import HomeStack
+from modules.seeding import home_seed, root_entropy
+
+T0 = datetime(2025, 1, 1, 22, 0)
+
+
+def test_meter_integrates_across_state_changes():
+    manager = DeviceManager()
+    meter = EnergyMeter(manager.devices)
+
+    meter.advance(T0)
+    manager.update_device("heater_main", "ON")          # 1800 W, main
+    meter.advance(T0 + timedelta(hours=1))
+    manager.update_device("lights_living", "ON")        # 60 W, living
+    manager.update_device("ac_main", "ON")              # 2200 W, main
+    meter.advance(T0 + timedelta(hours=1, minutes=30))
+    manager.update_device("heater_main", "OFF")
+    manager.update_device("ac_main", "OFF")
+    meter.advance(T0 + timedelta(hours=2, minutes=30))  # gün sınırını geçer
+
+    heater = 1800 * 1.5
+    ac = 2200 * 0.5
+    lights = 60 * 1.5
+    assert meter.total_wh == pytest.approx(heater + ac + lights)
+    assert meter.by_device_kwh() == pytest.approx({
+        "heater_main": heater / 1000, "ac_main": ac / 1000,
+        "lights_living": lights / 1000, "smart_lock": 0.0,
+    })
+    assert meter.by_type_kwh() == pytest.approx(
+        {"heater": heater / 1000, "ac": ac / 1000, "light": lights / 1000}
+    )
+    assert meter.by_room_kwh() == pytest.approx(
+        {"main": (heater + ac) / 1000, "living": lights / 1000}
+    )
+    assert meter.hourly_kwh() == pytest.approx({
+        T0: 1.8,
+        T0 + timedelta(hours=1): (900 + 1100 + 30 + 30) / 1000,
+        T0 + timedelta(hours=2): 30 / 1000,
+    })
+    assert meter.daily_kwh() == pytest.approx({
+        T0.date(): (1800 + 900 + 1100 + 30 + 30) / 1000,
+        (T0 + timedelta(days=1)).date(): 30 / 1000,
+    })
+
+    with pytest.raises(ValueError):
+        meter.advance(T0)
+
+
+def _run_metered(stack: HomeStack, steps: int) -> list:
+    """Her adımdan sonraki aktif güç (W)."""
+    power = []
+    for _ in range(steps):
+        stack.step()
+        power.append(stack.devices.get_energy_usage())
+    return power
+
+
+def test_settle_counts_last_step():
+    stack = HomeStack(seed=6)
+    power = _run_metered(stack, 200)
+    before = stack.energy.total_wh
+    stack.settle_energy()
+
+    hours = stack.step_duration.total_seconds() / 3600
+    assert stack.energy.total_wh - before == pytest.approx(power[-1] * hours)
+    assert stack.energy.total_wh == pytest.approx(sum(power) * hours)
+    assert sum(stack.energy.by_room_kwh().values()) == pytest.approx(stack.energy.total_kwh)
+    assert sum(stack.energy.by_type_kwh().values()) == pytest.approx(stack.energy.total_kwh)
+
+
+def test_fleet_meter_equals_sum_of_home_meters():
+    stacks = [HomeStack(seed=seed) for seed in (1, 2, 3)]
+    columns = [_run_metered(stack, 150) for stack in stacks]
+    for stack in stacks:
+        stack.settle_energy()
+
+    times = [stacks[0].energy.start + stacks[0].step_duration * t for t in range(150)]
+    fleet = FleetEnergyMeter(len(stacks))
+    fleet.integrate(times, list(zip(*columns)), until=stacks[0].energy.now)
+
+    home_kwh = [stack.energy.total_kwh for stack in stacks]
+    assert list(fleet.home_kwh()) == pytest.approx(home_kwh)
+    assert fleet.total_kwh == pytest.approx(sum(home_kwh))
+
+    hourly = Counter()
+    for stack in stacks:
+        hourly.update(stack.energy.hourly_kwh())
+    assert fleet.hourly_kwh() == pytest.approx(dict(hourly))
+    for day, per_home in fleet.daily_kwh().items():
+        assert list(per_home) == pytest.approx(
+            [stack.energy.daily_kwh().get(day, 0.0) for stack in stacks]
+        )
+
+
+def test_run_fleet_energy_matches_single_home_meters():
+    fleet = run_fleet(4, 150, workers=1, seed=9)
+    entropy = root_entropy(9)
+    for home in fleet["homes"]:
+        stack = HomeStack(seed=home_seed(entropy, home["home_id"]))
+        _run_metered(stack, 150)
+        stack.settle_energy()
+        assert home["energy_wh"] == pytest.approx(stack.energy.total_wh)
+    assert sum(fleet["daily_kwh"].values()) == pytest.approx(fleet["totals"]["energy_wh"] / 1000)
@@ -0,0 +1,31 @@
+import pytest
+
+from modules.agent import SHIADecisionAgent
+from modules.explain import Reflection
+
+
+@pytest.mark.parametrize("decision, sensor_data, expected", [
+    ({"device_id": "none", "action": "IDLE"},
+     {"manual_locks": {"heater_main": True, "ac_main": False}},
+     "AI stayed idle because manual control is active for: heater_main."),
+    ({"device_id": "none", "action": "IDLE"}, {},
+     "System stayed idle; likely energy-efficient."),
+    ({"device_id": "heater_main", "action": "ON"}, {"occupancy": False},
+     "Turning devices ON while house is empty is not energy-efficient."),
+    ({"device_id": "heater_main", "action": "ON"}, {"temperature": 22.0},
+     "Turning device ON in a comfortable temperature range may waste energy."),
+    ({"device_id": "heater_main", "action": "ON"}, {"temperature": 17.0},
+     "Decision seems reasonable given the current conditions."),
+])
+def test_reflection_is_rendered_only_when_read(monkeypatch, decision, sensor_data, expected):
+    rendered = []
+    render = Reflection._render
+    monkeypatch.setattr(Reflection, "_render", lambda self: rendered.append(1) or render(self))
+
+    reflection = SHIADecisionAgent().reflect(decision, sensor_data)
+    assert isinstance(reflection, Reflection)
+    assert rendered == []
+
+    assert str(reflection) == expected
+    assert f"{reflection}" == expected
+    assert rendered == [1]  # metin bir kez üretilip önbellekte tutulur
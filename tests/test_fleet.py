@@ -0,0 +1,22 @@
+import pytest
+
+from modules.fleet import run_fleet
+
+
+def test_closed_loop_fleet_is_reproducible():
+    first = run_fleet(6, 96, workers=1, seed=5, closed_loop=True)
+    second = run_fleet(6, 96, workers=1, seed=5, closed_loop=True)
+    assert first["homes"] == second["homes"]
+    assert first["daily_kwh"] == second["daily_kwh"]
+
+
+def test_closed_loop_fleet_requires_lockstep():
+    with pytest.raises(ValueError):
+        run_fleet(2, 10, workers=1, seed=5, closed_loop=True, mode="independent")
+
+
+def test_closed_loop_fleet_does_not_depend_on_workers():
+    serial = run_fleet(8, 96, workers=1, seed=2, closed_loop=True)
+    parallel = run_fleet(8, 96, workers=4, seed=2, closed_loop=True)
+    assert serial["homes"] == parallel["homes"]
+    assert serial["daily_kwh"] == parallel["daily_kwh"]
@@ -0,0 +1,38 @@
+import csv
+
+from modules.log_sink import CsvLogSink
+
+
+def test_sink_writes_batches(tmp_path):
+    path = tmp_path / "logs.csv"
+    with CsvLogSink(str(path), fields=["a", "b"], batch_size=4) as sink:
+        for i in range(10):
+            sink.write({"a": i, "b": i * 2})
+
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [int(r["a"]) for r in rows] == list(range(10))
+
+
+def test_sink_survives_write_errors(tmp_path):
+    # Dizin olan bir yola yazılamaz: hata sayılır, thread çalışmaya devam eder
+    sink = CsvLogSink(str(tmp_path), fields=["a"], batch_size=1, flush_interval=0.01)
+    sink.write({"a": 1})
+    sink.write({"a": 2})
+    sink.close()
+    assert sink.errors >= 1
+    assert not sink._thread.is_alive()
+
+
+def test_sink_queue_is_bounded(tmp_path):
+    path = tmp_path / "logs.csv"
+    sink = CsvLogSink(str(path), fields=["a"], max_queue=1)
+    for i in range(1000):
+        sink.write({"a": i})
+    sink.close()
+
+    with open(path, newline="") as f:
+        written = len(list(csv.DictReader(f)))
+    # Kuyruk tek kayıtla sınırlı: yazılamayan her kayıt sayılır, hiçbiri kaybolmaz
+    assert sink._queue.maxsize == 1
+    assert written + sink.dropped == 1000
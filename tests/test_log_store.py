@@ -0,0 +1,63 @@
+import pytest
+
+from modules.log_store import LogStore
+
+COLUMNS = {"step": int, "action": object}
+
+
+def _filled(capacity: int, count: int) -> LogStore:
+    store = LogStore(capacity, columns=COLUMNS)
+    for i in range(count):
+        store.append({"step": i, "action": f"a{i}"})
+    return store
+
+
+@pytest.mark.parametrize("count", [0, 3, 5, 6, 13, 20])
+def test_keeps_last_capacity_records_after_wraparound(count):
+    store = _filled(5, count)
+    expected = list(range(count))[-5:][::-1]
+
+    assert len(store) == len(expected)
+    assert store.version == count
+    assert list(store.recent()["step"]) == expected
+    assert list(store.recent()["action"]) == [f"a{i}" for i in expected]
+    assert list(store.recent(2)["step"]) == expected[:2]
+    assert list(store.to_dataframe()["step"]) == expected
+
+
+def test_latest():
+    store = _filled(4, 0)
+    assert store.latest() is None
+    for i in range(9):
+        store.append({"step": i})
+        latest = store.latest()
+        assert latest["step"] == i
+        assert latest["action"] is None  # eksik kolon
+
+
+def test_page_ordering_and_bounds():
+    store = _filled(10, 23)  # bellekte 22 … 13
+    assert list(store.page(0, 4)["step"]) == [22, 21, 20, 19]
+    assert list(store.page(1, 4)["step"]) == [18, 17, 16, 15]
+    assert list(store.page(2, 4)["step"]) == [14, 13]   # son sayfa kısa
+    assert store.page(3, 4).empty                       # kapasitenin ötesi
+    pages = [store.page(p, 3)["step"].tolist() for p in range(4)]
+    assert sum(pages, []) == list(range(22, 12, -1))
+
+
+def test_dataframe_cache_is_invalidated_by_append():
+    store = _filled(5, 3)
+    frame = store.to_dataframe()
+    assert store.to_dataframe() is frame
+    assert store.to_dataframe(2) is not frame
+
+    store.append({"step": 99, "action": "new"})
+    fresh = store.to_dataframe()
+    assert fresh is not frame
+    assert fresh["step"].iloc[0] == 99
+    assert store.page(0, 2)["step"].tolist() == [99, 2]
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        LogStore(0)
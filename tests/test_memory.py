@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from modules.memory import RollingWindow
+
+
+def _naive_ewma(history, alpha):
+    ewma = history[0]
+    for x in history[1:]:
+        ewma += alpha * (x - ewma)
+    return ewma
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 24])
+def test_rolling_window_matches_naive_recompute(size):
+    rng = random.Random(size)
+    window = RollingWindow(size, ewma_alpha=0.25)
+    history = []
+
+    # size'ın birkaç katı: pencere dolar, kayar ve halka tampon defalarca sarar
+    for _ in range(size * 7 + 3):
+        x = rng.choice([rng.uniform(-50, 50), float(rng.randint(-3, 3))])  # tekrarlı değerler de
+        window.push(x)
+        history.append(x)
+        expected = history[-size:]
+        n = len(expected)
+
+        assert len(window) == n
+        assert window.values() == expected
+        assert window.first == expected[0]
+        assert window.last == expected[-1]
+        assert window.min == min(expected)
+        assert window.max == max(expected)
+
+        mean = sum(expected) / n
+        assert window.mean == pytest.approx(mean, abs=1e-9)
+        variance = sum((v - mean) ** 2 for v in expected) / n if n > 1 else 0.0
+        assert window.variance == pytest.approx(variance, rel=1e-7, abs=1e-7)
+
+        diffs = [b - a for a, b in zip(expected, expected[1:])]
+        slope = sum(diffs) / len(diffs) if diffs else 0.0
+        assert window.slope() == pytest.approx(slope, abs=1e-9)
+
+        assert window.ewma == pytest.approx(_naive_ewma(history, 0.25), abs=1e-9)
+
+
+def test_empty_window():
+    window = RollingWindow(3)
+    assert len(window) == 0
+    assert window.first is window.last is None
+    assert window.min is window.max is window.ewma is None
+    assert window.slope() == 0.0
+    assert window.variance == 0.0
+
+    with pytest.raises(ValueError):
+        RollingWindow(0)
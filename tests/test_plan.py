@@ -0,0 +1,39 @@
+from modules.runner import HomeStack, format_summary, run_headless
+
+
+def _two_device_plan(sensor_data):
+    return [
+        {"device_id": "heater_main", "action": "ON"},
+        {"device_id": "lights_living", "action": "ON"},
+    ]
+
+
+def test_failed_apply_reports_every_action_and_keeps_policy_state(monkeypatch):
+    stack = HomeStack(seed=3, plan_actions=True)
+    monkeypatch.setattr(stack.agent, "plan", _two_device_plan)
+    monkeypatch.setattr(stack.devices, "apply_plan", lambda plan: (False, ["device offline"]))
+
+    result = stack.step()
+
+    assert all(ok for ok, _ in result["verdicts"])
+    assert not result["acted"]
+    assert result["device_msg"] == "FAILED: device offline | FAILED: device offline"
+    assert stack.policy.last_actions == {}
+
+
+def test_applied_plan_is_recorded_in_policy_state(monkeypatch):
+    stack = HomeStack(seed=3, plan_actions=True)
+    monkeypatch.setattr(stack.agent, "plan", _two_device_plan)
+
+    result = stack.step()
+
+    assert result["acted"]
+    assert stack.policy.last_actions == {"heater_main": "ON", "lights_living": "ON"}
+    assert stack.devices.devices["heater_main"]["state"] == "ON"
+
+
+def test_headless_run_without_meter():
+    summary = run_headless(50, HomeStack(seed=3, meter=False))
+    assert summary["energy_wh"] is None
+    assert "Energy used" not in format_summary(summary)
+    assert "Energy used" in format_summary(run_headless(50, HomeStack(seed=3)))
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from modules.policy_engine import PolicyEngine
+
+DEVICES = {
+    "heater_main": ("heater", 2000),
+    "ac_main": ("ac", 1500),
+    "lights_living": ("light", 60),
+    "smart_lock": ("lock", 5),
+}
+ACTIONS = ["ON", "OFF", "LOCKED", "UNLOCKED", "IDLE", "BLINK"]
+
+
+def _random_plan(n, seed):
+    rng = np.random.default_rng(seed)
+    ids = rng.choice(list(DEVICES), n)
+    return {
+        "device_id": ids,
+        "action": rng.choice(ACTIONS, n),
+        "device_type": np.array([DEVICES[d][0] for d in ids], dtype=object),
+        "device_power": np.array([DEVICES[d][1] for d in ids]),
+        "active_power": rng.integers(0, 4000, n),
+        "last_action": rng.choice(np.array([None, "ON", "OFF", "LOCKED"], dtype=object), n),
+        "exists": rng.random(n) < 0.9,
+        "temperature": np.round(rng.uniform(10, 35, n), 1),
+        "light_level": rng.integers(0, 1000, n),
+        "occupancy": rng.random(n) < 0.7,
+    }
+
+
+def test_validate_batch_matches_check():
+    engine = PolicyEngine(thresholds={"ac_min_temp": 20})
+    plan = _random_plan(5000, seed=9)
+
+    batch = engine.validate_batch(power_limit=3000, **plan)
+
+    for i in range(5000):
+        device_id, action = plan["device_id"][i], plan["action"][i]
+        if action == "IDLE":
+            expected = (True, "IDLE action allowed.")
+        elif not plan["exists"][i]:
+            expected = (False, f"Device '{device_id}' does not exist.")
+        else:
+            added = plan["device_power"][i] if action == "ON" else 0
+            expected = engine.check(
+                device_id, action, plan["device_type"][i],
+                {f: plan[f][i].item() for f in ("temperature", "light_level", "occupancy")},
+                last_action=plan["last_action"][i],
+                total_power=int(plan["active_power"][i] + added),
+                power_limit=3000,
+            )
+        assert (bool(batch["ok"][i]), batch["message"][i]) == expected
+
+
+def test_validate_batch_requires_device_power_with_active_power():
+    plan = _random_plan(10, seed=1)
+    del plan["device_power"]
+    with pytest.raises(ValueError):
+        PolicyEngine().validate_batch(power_limit=3000, **plan)
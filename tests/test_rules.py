@@ -0,0 +1,61 @@
+import numpy as np
+
+from modules.rules import DECISION_RULES, RuleEngine
+
+
+def _random_inputs(n, seed):
+    rng = np.random.default_rng(seed)
+    # Eşiklere denk gelen değerler de çıksın diye 0.1 / tamsayı çözünürlükte
+    return {
+        "temperature": np.round(rng.uniform(10, 35, n), 1),
+        "temp_trend": np.round(rng.uniform(-1, 1, n), 2),
+        "light_level": rng.integers(0, 1000, n),
+        "light_trend": rng.integers(-40, 40, n).astype(float),
+        "occupancy": rng.random(n) < 0.8,
+    }
+
+
+def test_evaluate_batch_matches_scalar():
+    engine = RuleEngine()
+    columns = _random_inputs(5000, seed=5)
+    locks = {"heater_main": np.random.default_rng(6).random(5000) < 0.2}
+
+    batch = engine.evaluate_batch(locks=locks, **columns)
+
+    for i in range(5000):
+        row = {field: values[i].item() for field, values in columns.items()}
+        rule = engine.evaluate(row)
+        locked = rule["device_id"] == "heater_main" and locks["heater_main"][i]
+        assert DECISION_RULES[batch["rule"][i]] is rule
+        assert batch["locked"][i] == locked
+        assert batch["device_id"][i] == ("none" if locked else rule["device_id"])
+        assert batch["action"][i] == ("IDLE" if locked else rule["action"])
+
+
+def test_evaluate_batch_matches_scalar_with_thresholds():
+    engine = RuleEngine(thresholds={"heater_temp": 21, "light_level": 300})
+    columns = _random_inputs(2000, seed=7)
+
+    batch = engine.evaluate_batch(**columns)
+
+    for i in range(2000):
+        row = {field: values[i].item() for field, values in columns.items()}
+        assert engine.rules[batch["rule"][i]] is engine.evaluate(row)
+
+
+def test_key_fingerprints_table_content():
+    import copy
+
+    assert RuleEngine().key == RuleEngine(rules=copy.deepcopy(DECISION_RULES)).key
+    assert RuleEngine().key != RuleEngine(thresholds={"heater_temp": 18}).key
+
+
+def test_input_key_classes_select_the_same_rule():
+    engine = RuleEngine()
+    columns = _random_inputs(5000, seed=8)
+    seen = {}
+    for i in range(5000):
+        row = {field: values[i].item() for field, values in columns.items()}
+        rule = seen.setdefault(engine.input_key(row), engine.evaluate(row))
+        assert rule is engine.evaluate(row)
+    assert len(seen) < 500
@@ -0,0 +1,47 @@
+import pytest
+
+from modules.fleet import run_fleet
+from modules.runner import HomeStack
+from modules.seeding import home_seed, root_entropy
+
+
+def _trace(stack: HomeStack, steps: int) -> list:
+    """Adım başına karşılaştırılabilir kayıt (sensörler, karar, policy, sonuç)."""
+    trace = []
+    for _ in range(steps):
+        result = stack.step()
+        trace.append((
+            dict(result["sensor_data"]),
+            result["decision"]["device_id"],
+            result["decision"]["action"],
+            result["is_valid"],
+            result["policy_msg"],
+            result["acted"],
+        ))
+    return trace
+
+
+@pytest.mark.parametrize("plan_actions", [False, True])
+def test_same_seed_reproduces_home_step_sequence(plan_actions):
+    first = _trace(HomeStack(seed=11, plan_actions=plan_actions), 300)
+    second = _trace(HomeStack(seed=11, plan_actions=plan_actions), 300)
+    assert first == second
+
+    other = _trace(HomeStack(seed=12, plan_actions=plan_actions), 300)
+    assert [row[0] for row in other] != [row[0] for row in first]
+
+
+@pytest.mark.parametrize("mode", ["lockstep", "independent"])
+def test_fleet_results_do_not_depend_on_workers(mode):
+    runs = [run_fleet(7, 120, workers=workers, mode=mode, seed=4) for workers in (1, 3)]
+    for key in ("homes", "blocks", "daily_kwh", "totals"):
+        assert runs[0][key] == runs[1][key]
+
+
+def test_fleet_home_replays_as_single_home():
+    fleet = run_fleet(5, 120, workers=2, seed=4)
+    entropy = root_entropy(4)
+    for home in fleet["homes"]:
+        trace = _trace(HomeStack(seed=home_seed(entropy, home["home_id"])), 120)
+        assert home["actions"] == sum(acted for *_, acted in trace)
+        assert home["blocked"] == sum(not is_valid for *_, is_valid, _, _ in trace)
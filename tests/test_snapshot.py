@@ -0,0 +1,21 @@
+import pytest
+
+from modules import snapshot
+from modules.runner import HomeStack, run_headless
+
+
+def test_resumed_stack_continues_the_run():
+    stack = HomeStack(seed=3)
+    run_headless(200, stack)
+    blob = snapshot.dumps(stack)
+
+    expected = [stack.step()["device_msg"] for _ in range(200)]
+    resumed = snapshot.loads(blob)
+    assert [resumed.step()["device_msg"] for _ in range(200)] == expected
+
+
+@pytest.mark.parametrize("cut", [2, 4, 5, 30, -10])
+def test_truncated_snapshot_is_a_format_error(cut):
+    blob = snapshot.dumps(HomeStack(seed=3))
+    with pytest.raises(ValueError):
+        snapshot.loads(blob[:cut])
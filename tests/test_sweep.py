@@ -0,0 +1,39 @@
+from modules import sweep
+from modules.sweep import SweepCache, run_config, run_sweep
+
+
+def test_cache_key_depends_on_model_version(monkeypatch):
+    key = SweepCache.key({"heater_temp": 19}, 0, 48, None)
+    assert key == SweepCache.key({"heater_temp": 19}, 0, 48, None)
+
+    monkeypatch.setattr(sweep, "model_version", lambda: "changed-model")
+    assert SweepCache.key({"heater_temp": 19}, 0, 48, None) != key
+
+
+def test_pruned_runs_are_normalised_per_step():
+    steps = 96
+    table = run_sweep({"heater_temp": [19]}, seeds=2, steps=steps, workers=1,
+                      max_violations=3, closed_loop=False)
+    row = table[0]
+    assert row["pruned"]
+
+    runs = [run_config({"heater_temp": 19}, seed, steps, 3) for seed in range(row["runs"])]
+    assert any(r["steps_run"] < steps for r in runs)
+    expected = sum(r["energy_wh"] * steps / r["steps_run"] for r in runs) / len(runs)
+    assert row["energy_wh"] == expected
+
+
+def test_full_runs_average_unchanged():
+    steps = 48
+    table = run_sweep({"heater_temp": [19]}, seeds=2, steps=steps, workers=1)
+    runs = [run_config({"heater_temp": 19}, seed, steps, closed_loop=True) for seed in range(2)]
+    assert table[0]["energy_wh"] == sum(r["energy_wh"] for r in runs) / 2
+
+
+def test_threshold_sweeps_default_to_closed_loop():
+    table = run_sweep({"heater_temp": [15, 22]}, seeds=4, steps=48 * 3, workers=1)
+    low, high = table
+    assert low["energy_wh"] != high["energy_wh"]
+    assert low["comfort_violations"] != high["comfort_violations"]
+    assert run_sweep({"power_limit": [3000]}, seeds=1, steps=4, workers=1) == run_sweep(
+        {"power_limit": [3000]}, seeds=1, steps=4, workers=1, closed_loop=False)
@@ -0,0 +1,69 @@
+import random
+from datetime import timedelta
+
+import pytest
+
+from modules.runner import HomeStack, run_headless
+from modules.sensors import SensorSimulator
+from modules.seeding import SEEDED_START_TIME
+from modules.trace import DEFAULT_LOCK_DEVICES, TraceRecorder, TraceReplay
+
+
+def _recorded_stream(n, seed=11):
+    sim = SensorSimulator(start_time=SEEDED_START_TIME, seed=seed)
+    rng = random.Random(seed)
+    stream = []
+    for _ in range(n):
+        data = dict(sim.update())
+        data["manual_locks"] = {dev: rng.random() < 0.3 for dev in DEFAULT_LOCK_DEVICES}
+        stream.append(data)
+    return stream
+
+
+def test_record_replay_roundtrip(tmp_path):
+    path = str(tmp_path / "sensors.trc")
+    stream = _recorded_stream(5000)  # birden çok tampon dolusu
+    with TraceRecorder(path, buffer_size=1000) as recorder:
+        for data in stream:
+            recorder.record(data)
+
+    replay = TraceReplay(path)
+    assert len(replay) == len(stream)
+    assert list(replay) == stream
+
+
+def test_replayed_trace_reproduces_the_run(tmp_path):
+    path = str(tmp_path / "sensors.trc")
+    with TraceRecorder(path) as recorder:
+        original = HomeStack(seed=4)
+        results = []
+        for _ in range(300):
+            result = original.step()
+            recorder.record(result["sensor_data"])
+            results.append((result["decision"]["device_id"], result["is_valid"], result["acted"]))
+
+    replayed = HomeStack(sensors=TraceReplay(path))
+    assert [
+        (r["decision"]["device_id"], r["is_valid"], r["acted"])
+        for r in (replayed.step() for _ in range(300))
+    ] == results
+    assert replayed.energy.total_wh == original.energy.total_wh
+
+
+def test_unknown_lock_device_is_rejected(tmp_path):
+    with TraceRecorder(str(tmp_path / "sensors.trc"), lock_devices=("heater_main",)) as recorder:
+        with pytest.raises(ValueError):
+            recorder.record({**_recorded_stream(1)[0], "manual_locks": {"garage": True}})
+
+
+def test_settle_energy_uses_the_trace_step(tmp_path):
+    path = str(tmp_path / "sensors.trc")
+    with TraceRecorder(path) as recorder:
+        for i, data in enumerate(_recorded_stream(40)):
+            recorder.record({**data, "time": SEEDED_START_TIME + i * timedelta(minutes=15)})
+
+    stack = HomeStack(sensors=TraceReplay(path))
+    run_headless(20, stack)
+    run_headless(20, stack)  # 30 dakikalık settle burada saati geri sardırırdı
+    assert stack.step_duration == timedelta(minutes=15)
+    assert stack.energy.now == SEEDED_START_TIME + 40 * timedelta(minutes=15)